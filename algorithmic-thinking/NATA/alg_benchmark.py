@@ -0,0 +1,287 @@
+"""
+
+    Benchmark suite for the NATA clustering algorithms
+
+    Times slow_closest_pair, fast_closest_pair, closest_pair_strip,
+    hierarchical_clustering, kmeans_clustering and cluster_error over the
+    unifiedCancerData sizes (111, 290, 896, 3108) and larger synthetic
+    tables, and records for every case and size the best wall time of a few
+    repeats, the peak traced memory of one extra run and the fitted scaling
+    exponent.  Results are plain JSON so two runs can be diffed with
+    compare_results to catch regressions.
+
+    Usage:
+        python alg_benchmark.py [--output new.json] [--baseline old.json]
+                                [--sizes 111 290 896 3108 10000] [--data-dir DIR]
+
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+import numpy as np
+import alg_cluster
+import alg_data_loader
+import alg_project3_solution as soln
+
+DEFAULT_SIZES = (111, 290, 896, 3108, 10000)
+
+# the county tables shipped with the course; other sizes are synthetic
+DATA_FILES = {111: "unifiedCancerData_111.csv", 290: "unifiedCancerData_290.csv",
+              896: "unifiedCancerData_896.csv", 3108: "unifiedCancerData_3108.csv"}
+
+##############################################
+#    Input tables
+#
+def synthetic_data_table(num_counties, seed = 0):
+    """
+    Build a data table shaped like the cancer data: centers over the
+    1000 x 634 map image, log-uniform populations and small risks
+
+    Args:
+        num_counties (int): number of rows
+        seed (int): random seed
+    Returns:
+        (list): [fips, horiz, vert, pop, risk] rows with unique FIPS codes
+    """
+    rand = random.Random(seed)
+    return [["S" + str(idx), rand.uniform(0.0, 1000.0), rand.uniform(0.0, 634.0),
+             int(math.exp(rand.uniform(math.log(1000), math.log(10000000)))), rand.uniform(1e-6, 2e-4)]
+            for idx in range(num_counties)]
+
+def benchmark_data_table(num_counties, data_dir = None, seed = 0):
+    """
+    Get the table for one size: the course CSV when data_dir holds it,
+    else a synthetic table
+
+    Returns:
+        (source, data_table): 'csv' or 'synthetic' and the rows
+    """
+    if data_dir is not None and num_counties in DATA_FILES:
+        file_name = os.path.join(data_dir, DATA_FILES[num_counties])
+        if os.path.exists(file_name):
+            return ('csv', alg_data_loader.load_data_table(file_name))
+    return ('synthetic', synthetic_data_table(num_counties, seed))
+
+def singleton_clusters(data_table):
+    """
+    One Cluster per row of a data table
+    """
+    return [alg_cluster.Cluster(set([line[0]]), line[1], line[2], line[3], line[4])
+            for line in data_table]
+
+##############################################
+#    Benchmark cases
+#
+#  Each setup builds the arguments for one call outside the timed region and
+#  returns them as a tuple; max_size keeps the quadratic and worse cases
+#  from running for hours.
+#
+def _setup_unsorted(data_table):
+    """
+    Helper function to build the singleton clusters in data table order
+    """
+    return (singleton_clusters(data_table),)
+
+def _setup_sorted(data_table):
+    """
+    Helper function to build the singleton clusters sorted by horizontal center
+    """
+    cluster_list = singleton_clusters(data_table)
+    cluster_list.sort(key = lambda cluster: cluster.horiz_center())
+    return (cluster_list,)
+
+def _setup_strip(data_table):
+    """
+    Helper function to build the arguments of closest_pair_strip for the middle strip
+    """
+    # the strip a top level fast_closest_pair call would scan
+    cluster_list = _setup_sorted(data_table)[0]
+    half = len(cluster_list) // 2
+    mid_point = (cluster_list[half - 1].horiz_center() + cluster_list[half].horiz_center()) / 2.0
+    half_width = min(soln.fast_closest_pair(cluster_list[:half])[0],
+                     soln.fast_closest_pair(cluster_list[half:])[0])
+    return (cluster_list, mid_point, half_width)
+
+def _setup_hierarchical(data_table):
+    """
+    Helper function to build the arguments of a hierarchical clustering run
+    """
+    return (singleton_clusters(data_table), 9)
+
+def _setup_kmeans(data_table):
+    """
+    Helper function to build the arguments of a k-means clustering run
+    """
+    return (singleton_clusters(data_table), 9, 5)
+
+def _setup_error(data_table):
+    """
+    Helper function to build a k-means clustering to take the distortion of
+    """
+    cluster_list = soln.kmeans_clustering(singleton_clusters(data_table), 9, 5)
+    return (cluster_list, data_table)
+
+def _total_cluster_error(cluster_list, data_table):
+    """
+    Helper function to sum the cluster_error of a list of clusters
+    """
+    fips_to_line = alg_cluster.fips_index(data_table)
+    return sum([cluster.cluster_error(data_table, fips_to_line) for cluster in cluster_list])
+
+# name -> (function, setup, max_size)
+BENCHMARK_CASES = {
+    'slow_closest_pair': (soln.slow_closest_pair, _setup_unsorted, 3108),
+    'fast_closest_pair': (soln.fast_closest_pair, _setup_sorted, None),
+    'closest_pair_strip': (soln.closest_pair_strip, _setup_strip, None),
+    'hierarchical_clustering': (soln.hierarchical_clustering, _setup_hierarchical, 896),
+    'kmeans_clustering': (soln.kmeans_clustering, _setup_kmeans, None),
+    'cluster_error': (_total_cluster_error, _setup_error, None),
+}
+
+##############################################
+#    Measurement
+#
+def measure(func, setup, data_table, repeat = 3):
+    """
+    Time func on fresh arguments from setup and trace its peak memory
+
+    Args:
+        func (function): the function to benchmark
+        setup (function): data_table -> argument tuple
+        data_table (list): input rows
+        repeat (int): timed runs; the best one is reported
+    Returns:
+        (dict): wall_time (s, best of repeat) and peak_memory (bytes
+            allocated above the starting point during one traced run)
+    """
+    times = []
+    for _ in range(repeat):
+        args = setup(data_table)
+        start_time = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start_time)
+    # tracing slows Python down, so memory gets its own run
+    args = setup(data_table)
+    tracemalloc.start()
+    func(*args)
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    #
+    return {'wall_time': min(times), 'peak_memory': peak_memory}
+
+def scaling_exponent(sizes, times):
+    """
+    Least squares slope of log(time) against log(size), i.e. b in time ~ size**b
+
+    Returns:
+        (float): the exponent, or None with fewer than two usable points
+    """
+    points = [(math.log(size), math.log(wall)) for (size, wall) in zip(sizes, times) if wall > 0]
+    if len(points) < 2:
+        return None
+    log_sizes = np.array([point[0] for point in points])
+    log_times = np.array([point[1] for point in points])
+    return float(np.polyfit(log_sizes, log_times, 1)[0])
+
+def run_benchmarks(sizes = DEFAULT_SIZES, case_names = None, repeat = 3, data_dir = None, seed = 0):
+    """
+    Run every benchmark case over every size it allows
+
+    Returns:
+        (dict): JSON-ready report with a 'meta' section and, per case, the
+            measurements keyed by size (as a string) and the scaling exponent
+    """
+    if case_names is None:
+        case_names = sorted(BENCHMARK_CASES)
+    tables = {}
+    for size in sizes:
+        tables[size] = benchmark_data_table(size, data_dir, seed)
+    #
+    report = {'meta': {'python': platform.python_version(), 'numpy': np.__version__,
+                       'machine': platform.machine(), 'repeat': repeat, 'seed': seed,
+                       'sources': dict((str(size), tables[size][0]) for size in sizes)},
+              'cases': {}}
+    for name in case_names:
+        (func, setup, max_size) = BENCHMARK_CASES[name]
+        results = {}
+        for size in sizes:
+            if max_size is not None and size > max_size:
+                continue
+            results[str(size)] = measure(func, setup, tables[size][1], repeat)
+        measured = sorted([int(size) for size in results])
+        report['cases'][name] = {'sizes': results,
+                                 'scaling_exponent': scaling_exponent(measured,
+                                                                      [results[str(size)]['wall_time']
+                                                                       for size in measured])}
+    return report
+
+def compare_results(baseline, current, tolerance = 1.25):
+    """
+    List the measurements of current that are worse than baseline by more
+    than a factor of tolerance
+
+    Returns:
+        (list): one message per regression
+    """
+    regressions = []
+    for name in sorted(current['cases']):
+        if name not in baseline['cases']:
+            continue
+        old_sizes = baseline['cases'][name]['sizes']
+        new_sizes = current['cases'][name]['sizes']
+        for size in sorted(new_sizes, key = int):
+            if size not in old_sizes:
+                continue
+            for metric in ('wall_time', 'peak_memory'):
+                old_value = old_sizes[size][metric]
+                new_value = new_sizes[size][metric]
+                if old_value > 0 and new_value > tolerance * old_value:
+                    regressions.append(name + " n=" + size + " " + metric + ": " + str(old_value) +
+                                       " -> " + str(new_value) + " (x" + str(round(new_value / old_value, 2)) + ")")
+    return regressions
+
+######################################################################
+#   Command line
+#
+def main(argv = None):
+    """
+    Run the suite, print a summary, write JSON and compare against a baseline
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the NATA clustering algorithms")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--cases', nargs='+', choices=sorted(BENCHMARK_CASES))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--data-dir', help="directory holding the unifiedCancerData CSV files")
+    parser.add_argument('--output', help="write the JSON report here")
+    parser.add_argument('--baseline', help="earlier JSON report to check for regressions")
+    parser.add_argument('--tolerance', type=float, default=1.25)
+    args = parser.parse_args(argv)
+    #
+    report = run_benchmarks(args.sizes, args.cases, args.repeat, args.data_dir, args.seed)
+    for name in sorted(report['cases']):
+        case = report['cases'][name]
+        print(name, "exponent", case['scaling_exponent'])
+        for size in sorted(case['sizes'], key = int):
+            print("   n =", size, " time", round(case['sizes'][size]['wall_time'], 6), "s  peak",
+                  case['sizes'][size]['peak_memory'], "bytes")
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(report, output_file, indent=2, sort_keys=True)
+    #
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            regressions = compare_results(json.load(baseline_file), report, args.tolerance)
+        for line in regressions:
+            print("REGRESSION", line)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
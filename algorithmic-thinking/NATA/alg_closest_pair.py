@@ -0,0 +1,391 @@
+"""
+
+    Spatial grid engine for closest pair and nearest cluster queries
+
+    fast_closest_pair in alg_project3_solution slices and re-sorts Python
+    lists at every level of its recursion.  ClusterGrid instead buckets the
+    cluster centers into a uniform grid of square cells held in a dict, so
+    centers can be inserted, moved and removed in O(1) as clusters merge and
+    a nearest-center query only looks at the rings of cells around the query
+    point until no unseen cell can hold anything closer.
+
+"""
+import math
+import alg_project3_solution as soln
+
+# a cell holding more centers than this is split by shrinking the cells
+MAX_CELL_POINTS = 32
+# centers of a crowded cell whose nearest neighbours bound the new cell size
+NEIGHBOR_SAMPLES = 16
+# cell shrinking rounds before falling back to fast_closest_pair
+MAX_REFINEMENTS = 6
+
+##############################################
+#    Helper functions
+#
+def suggest_cell_size(horiz_list, vert_list):
+    """
+    Helper function to pick a cell size giving about one center per cell
+    over the bounding box of the centers
+
+    Args:
+        horiz_list (list): horizontal centers
+        vert_list (list): vertical centers
+    Returns:
+        (float): cell side length
+    """
+    num_points = len(horiz_list)
+    if num_points == 0:
+        return 1.0
+    width = max(horiz_list) - min(horiz_list)
+    height = max(vert_list) - min(vert_list)
+    # degenerate boxes (all points on a line) still need a positive size
+    area = max(width, height, 1e-12) * max(min(width, height), max(width, height) / num_points, 1e-12)
+    return math.sqrt(area / num_points)
+
+# half of the eight neighbouring cells, so each pair of cells is visited once
+_FORWARD_CELLS = ((1, -1), (1, 0), (1, 1), (0, 1))
+
+def _ring_cells(cell_x, cell_y, radius):
+    """
+    Generator for the cells at Chebyshev distance radius from a cell
+    """
+    if radius == 0:
+        yield (cell_x, cell_y)
+        return
+    for offset in range(-radius, radius + 1):
+        yield (cell_x + offset, cell_y - radius)
+        yield (cell_x + offset, cell_y + radius)
+    for offset in range(-radius + 1, radius):
+        yield (cell_x - radius, cell_y + offset)
+        yield (cell_x + radius, cell_y + offset)
+
+
+def _adjacent_closest_pair(cell_points):
+    """
+    Find the closest pair among points lying in the same or in adjacent cells
+
+    Args:
+        cell_points (dict): cell -> list of (key, horiz, vert)
+    Returns:
+        (dist, key1, key2): closest such pair with key1 < key2, or
+            (inf, None, None) if no cell has a point near another
+    """
+    # squared distances are compared and the root is taken once at the end
+    best = (float('inf'), None, None)
+    for (cell_x, cell_y) in cell_points:
+        points = cell_points[(cell_x, cell_y)]
+        neighbors = []
+        for (offset_x, offset_y) in _FORWARD_CELLS:
+            other = cell_points.get((cell_x + offset_x, cell_y + offset_y))
+            if other is not None:
+                neighbors.extend(other)
+        if len(points) == 1 and len(neighbors) == 0:
+            continue
+        # pairs inside the cell, then against the forward half of its neighbours
+        for idx in range(len(points)):
+            (key, horiz, vert) = points[idx]
+            for (other_key, other_horiz, other_vert) in points[idx + 1:] + neighbors:
+                dist_sqrd = (vert - other_vert) ** 2 + (horiz - other_horiz) ** 2
+                if dist_sqrd <= best[0]:
+                    candidate = (dist_sqrd, min(key, other_key), max(key, other_key))
+                    if candidate < best:
+                        best = candidate
+    #
+    if best[1] is None:
+        return best
+    return (math.sqrt(best[0]), best[1], best[2])
+
+def _bucket_points(points, cell_size):
+    """
+    Helper function to group (key, horiz, vert) points by grid cell
+    """
+    cell_points = {}
+    for point in points:
+        cell = (int(math.floor(point[1] / cell_size)), int(math.floor(point[2] / cell_size)))
+        if cell in cell_points:
+            cell_points[cell].append(point)
+        else:
+            cell_points[cell] = [point]
+    return cell_points
+
+def _sampled_neighbor_pair(points):
+    """
+    Helper function to find, for evenly spaced samples of a list of points,
+    the nearest other point in the list, and return the closest of those
+    pairs; its distance bounds the closest pair distance from above
+
+    Returns:
+        (dist, key1, key2): a pair with key1 < key2
+    """
+    best = (float('inf'), None, None)
+    step = max(1, len(points) // NEIGHBOR_SAMPLES)
+    for idx in range(0, len(points), step):
+        (key, horiz, vert) = points[idx]
+        for (other_key, other_horiz, other_vert) in points:
+            if other_key == key:
+                continue
+            dist_sqrd = (vert - other_vert) ** 2 + (horiz - other_horiz) ** 2
+            if dist_sqrd <= best[0]:
+                candidate = (dist_sqrd, min(key, other_key), max(key, other_key))
+                if candidate < best:
+                    best = candidate
+    return (math.sqrt(best[0]), best[1], best[2])
+
+
+class ClusterGrid:
+    """
+    Class for a dynamic uniform grid over cluster centers
+    """
+
+    def __init__(self, cell_size):
+        """
+        Create an empty grid whose square cells have side cell_size
+        """
+        self._cell_size = float(cell_size)
+        self._cells = {}
+        self._points = {}
+        # cell index bounds of everything ever inserted, used to end ring searches
+        self._bounds = None
+
+    def __repr__(self):
+        """
+        String representation of the grid
+        """
+        return "ClusterGrid(" + str(len(self._points)) + " centers, cell size " + str(self._cell_size) + ")"
+
+    def __len__(self):
+        """
+        Number of centers in the grid
+        """
+        return len(self._points)
+
+    def _cell(self, horiz, vert):
+        """
+        Grid cell holding a position
+        """
+        return (int(math.floor(horiz / self._cell_size)), int(math.floor(vert / self._cell_size)))
+
+    def position(self, key):
+        """
+        Get the (horiz, vert) center stored for key
+        """
+        return self._points[key]
+
+    def insert(self, key, horiz, vert):
+        """
+        Add a center to the grid under key (any hashable, orderable id)
+        """
+        if key in self._points:
+            self.remove(key)
+        cell = self._cell(horiz, vert)
+        self._points[key] = (horiz, vert)
+        if cell not in self._cells:
+            self._cells[cell] = set([])
+        self._cells[cell].add(key)
+        #
+        if self._bounds is None:
+            self._bounds = [cell[0], cell[0], cell[1], cell[1]]
+        else:
+            self._bounds[0] = min(self._bounds[0], cell[0])
+            self._bounds[1] = max(self._bounds[1], cell[0])
+            self._bounds[2] = min(self._bounds[2], cell[1])
+            self._bounds[3] = max(self._bounds[3], cell[1])
+
+    def remove(self, key):
+        """
+        Remove the center stored under key
+        """
+        (horiz, vert) = self._points.pop(key)
+        cell = self._cell(horiz, vert)
+        self._cells[cell].discard(key)
+        if len(self._cells[cell]) == 0:
+            del self._cells[cell]
+
+    def move(self, key, horiz, vert):
+        """
+        Move the center stored under key, e.g. after its cluster absorbed another
+        """
+        self.remove(key)
+        self.insert(key, horiz, vert)
+
+    def nearest(self, horiz, vert, exclude = None):
+        """
+        Find the stored center nearest to a position
+
+        Args:
+            horiz (float): horizontal position of the query
+            vert (float): vertical position of the query
+            exclude: optional key to skip (typically the query's own key)
+        Returns:
+            (dist, key): distance to and key of the nearest center, or
+                (inf, None) when the grid holds nothing else
+        """
+        closest = (float('inf'), None)
+        if self._bounds is None:
+            return closest
+        #
+        (cell_x, cell_y) = self._cell(horiz, vert)
+        max_radius = max(cell_x - self._bounds[0], self._bounds[1] - cell_x,
+                         cell_y - self._bounds[2], self._bounds[3] - cell_y, 0)
+        #
+        radius = 0
+        while radius <= max_radius:
+            # once a ring has more cells than are occupied, checking every center is cheaper
+            if 8 * radius > len(self._cells):
+                return self._scan_nearest(horiz, vert, exclude, closest)
+            for cell in _ring_cells(cell_x, cell_y, radius):
+                if cell not in self._cells:
+                    continue
+                for key in self._cells[cell]:
+                    if key == exclude:
+                        continue
+                    (other_horiz, other_vert) = self._points[key]
+                    vert_dist = vert - other_vert
+                    horiz_dist = horiz - other_horiz
+                    distance = math.sqrt(vert_dist ** 2 + horiz_dist ** 2)
+                    if distance < closest[0] or (distance == closest[0] and key < closest[1]):
+                        closest = (distance, key)
+            # anything in the next ring is at least radius cells away
+            if closest[0] <= radius * self._cell_size:
+                break
+            radius += 1
+        #
+        return closest
+
+    def _scan_nearest(self, horiz, vert, exclude, closest):
+        """
+        Check every stored center against the best (dist, key) found so far
+        """
+        for key in self._points:
+            if key == exclude:
+                continue
+            (other_horiz, other_vert) = self._points[key]
+            vert_dist = vert - other_vert
+            horiz_dist = horiz - other_horiz
+            distance = math.sqrt(vert_dist ** 2 + horiz_dist ** 2)
+            if distance < closest[0] or (distance == closest[0] and key < closest[1]):
+                closest = (distance, key)
+        return closest
+
+    def nearest_to_key(self, key):
+        """
+        Find the stored center nearest to the center stored under key
+
+        Returns:
+            (dist, key): distance to and key of the nearest other center
+        """
+        (horiz, vert) = self._points[key]
+        return self.nearest(horiz, vert, key)
+
+    def closest_pair(self):
+        """
+        Find the closest pair of stored centers
+
+        Every pair closer than one cell side lies in the same or in adjacent
+        cells, so one pass over each occupied cell and four of its neighbours
+        settles it; only when nothing is that close does it fall back to a
+        nearest-center query per center.
+
+        Returns:
+            (dist, key1, key2): distance and keys (key1 < key2) of the closest
+                pair, or (inf, None, None) with fewer than two centers
+        """
+        cell_points = {}
+        for cell in self._cells:
+            cell_points[cell] = [(key,) + self._points[key] for key in self._cells[cell]]
+        closest_pair = _adjacent_closest_pair(cell_points)
+        if closest_pair[1] is not None and closest_pair[0] < self._cell_size:
+            return closest_pair
+        #
+        closest_pair = (float('inf'), None, None)
+        for key in self._points:
+            (distance, other) = self.nearest_to_key(key)
+            if other is None or distance > closest_pair[0]:
+                continue
+            candidate = (distance, min(key, other), max(key, other))
+            if candidate < closest_pair:
+                closest_pair = candidate
+        return closest_pair
+
+############################
+#    Closest pair functions
+#
+def cluster_grid(cluster_list, cell_size = None):
+    """
+    Build a ClusterGrid over the centers of a list of clusters, keyed by list index
+
+    Args:
+        cluster_list (list): A list of Cluster objects
+        cell_size (float): optional cell side; defaults to suggest_cell_size
+    Returns:
+        (ClusterGrid): grid holding every cluster center
+    """
+    horiz_list = [cluster.horiz_center() for cluster in cluster_list]
+    vert_list = [cluster.vert_center() for cluster in cluster_list]
+    if cell_size is None:
+        cell_size = suggest_cell_size(horiz_list, vert_list)
+    #
+    grid = ClusterGrid(cell_size)
+    for idx in range(len(cluster_list)):
+        grid.insert(idx, horiz_list[idx], vert_list[idx])
+    return grid
+
+def grid_closest_pair(cluster_list):
+    """
+    Find the closest pair of clusters among a list of clusters with a
+    spatial grid; the list does not need to be sorted
+
+    A first pass buckets the centers into cells a quarter of the
+    one-center-per-cell size, so most neighbouring cells are empty; only if
+    no pair is that close does it build a full ClusterGrid.  The first cell
+    size only suits centers spread over their bounding box: while a cell
+    holds more than MAX_CELL_POINTS centers (a tight clump next to far
+    outliers), the cells shrink to the distance of a sampled
+    nearest-neighbour pair in that cell, which is no less than the closest
+    pair distance.  If that does not thin the cells out, fast_closest_pair
+    takes over.
+
+    Args:
+        cluster_list (list): A list of Cluster objects
+    Returns:
+        closestpair (tuple): a tuple consisting of (dist, idx1, idx2), where idx1 < idx2 are
+            the indices of the two closest clusters, or (inf, -1, -1)
+    """
+    points = [(idx, cluster_list[idx].horiz_center(), cluster_list[idx].vert_center())
+              for idx in range(len(cluster_list))]
+    cell_size = suggest_cell_size([point[1] for point in points], [point[2] for point in points]) / 4.0
+    cell_points = _bucket_points(points, cell_size)
+    refined = False
+    #
+    for refinement in range(MAX_REFINEMENTS + 1):
+        crowded = max(cell_points.values(), key=len) if len(cell_points) > 0 else []
+        if len(crowded) <= MAX_CELL_POINTS:
+            break
+        if refinement == MAX_REFINEMENTS:
+            return _sorted_closest_pair(cluster_list)
+        bound = _sampled_neighbor_pair(crowded)
+        if bound[0] == 0.0:
+            # nothing is closer than a repeated center
+            return bound
+        # a little slack keeps a pair at exactly the bound in adjacent cells
+        cell_size = min(cell_size, bound[0]) * (1.0 + 1e-9)
+        cell_points = _bucket_points(points, cell_size)
+        refined = True
+    #
+    closest_pair = _adjacent_closest_pair(cell_points)
+    #
+    if not refined and (closest_pair[1] is None or closest_pair[0] >= cell_size):
+        closest_pair = cluster_grid(cluster_list, cell_size * 4.0).closest_pair()
+    if closest_pair[1] is None:
+        return (float('inf'), -1, -1)
+    return closest_pair
+
+def _sorted_closest_pair(cluster_list):
+    """
+    Helper function to run fast_closest_pair on the clusters sorted by
+    horizontal center and map its indices back to cluster_list
+    """
+    order = sorted(range(len(cluster_list)), key = lambda idx: cluster_list[idx].horiz_center())
+    (dist, idx_u, idx_v) = soln.fast_closest_pair([cluster_list[idx] for idx in order])
+    return (dist, min(order[idx_u], order[idx_v]), max(order[idx_u], order[idx_v]))
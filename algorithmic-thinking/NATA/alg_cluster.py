@@ -5,6 +5,17 @@ Cluster class for Module 3
 import math
 
 
+def fips_index(data_table):
+    """
+    Build a hash table from FIPS code to row index of a table of cancer data
+    """
+    fips_to_line = {}
+    for line_idx in range(len(data_table)):
+        line = data_table[line_idx]
+        fips_to_line[line[0]] = line_idx
+    return fips_to_line
+
+
 class Cluster:
     """
     Class for creating and merging clusters of counties
@@ -108,18 +119,19 @@ class Cluster:
             self._averaged_risk = self_weight * self._averaged_risk + other_weight * other_cluster.averaged_risk()
             return self
 
-    def cluster_error(self, data_table):
+    def cluster_error(self, data_table, fips_to_line = None):
         """
         Input: data_table is the original table of cancer data used in creating the cluster.
+        fips_to_line is an optional FIPS code to row index dict for data_table (see
+        fips_index); pass it when computing the error of many clusters so the
+        hash table is built only once.
         
         Output: The error as the sum of the square of the distance from each county
         in the cluster to the cluster center (weighted by its population)
         """
         # Build hash table to accelerate error computation
-        fips_to_line = {}
-        for line_idx in range(len(data_table)):
-            line = data_table[line_idx]
-            fips_to_line[line[0]] = line_idx
+        if fips_to_line is None:
+            fips_to_line = fips_index(data_table)
         
         # compute error as weighted squared distance from counties to cluster center
         total_error = 0
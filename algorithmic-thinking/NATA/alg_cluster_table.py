@@ -0,0 +1,397 @@
+"""
+
+    Columnar cluster table for Module 3
+
+    A ClusterTable stores a whole clustering as parallel NumPy arrays instead
+    of a list of Cluster objects: one slot per cluster for the centers,
+    populations and risks, and a union-find over the slots for the county
+    memberships instead of a Python set per cluster.  Copying a table copies
+    a handful of flat arrays, so the clustering functions below never need
+    deepcopy.
+
+"""
+import heapq
+import math
+import numpy as np
+import alg_cluster
+import alg_kmeans
+
+
+class ClusterTable:
+    """
+    Class for holding and merging clusters of counties in columnar form
+    """
+
+    def __init__(self, fips_codes, home_slots, horiz, vert, population, risk):
+        """
+        Create a table from per-county labels and per-cluster data
+
+        Args:
+            fips_codes (sequence): FIPS code of every county
+            home_slots (sequence): slot (cluster) index of every county
+            horiz, vert (sequence): per slot centers
+            population (sequence): per slot total population
+            risk (sequence): per slot averaged risk
+        """
+        # county labels never change, so copies of the table share the tuple
+        self._fips = tuple(fips_codes)
+        self._home = np.array(home_slots, dtype=np.int32)
+        #
+        self._horiz = np.array(horiz, dtype=np.float64)
+        self._vert = np.array(vert, dtype=np.float64)
+        self._population = np.array(population, dtype=np.int64)
+        self._risk = np.array(risk, dtype=np.float64)
+        #
+        num_slots = len(self._horiz)
+        self._parent = np.arange(num_slots, dtype=np.int32)
+        self._size = np.bincount(self._home, minlength=num_slots).astype(np.int32)
+        self._alive = np.ones(num_slots, dtype=bool)
+        self._num_alive = num_slots
+
+    def __repr__(self):
+        """
+        String representation listing the live clusters
+        """
+        return "ClusterTable(" + str(self.to_cluster_list()) + ")"
+
+    def num_clusters(self):
+        """
+        Get the number of live clusters
+        """
+        return self._num_alive
+
+    def cluster_ids(self):
+        """
+        Get the slot indices of the live clusters in increasing order
+        """
+        return np.flatnonzero(self._alive)
+
+    def horiz_center(self, idx):
+        """
+        Get the averaged horizontal center of a cluster
+        """
+        return float(self._horiz[idx])
+
+    def vert_center(self, idx):
+        """
+        Get the averaged vertical center of a cluster
+        """
+        return float(self._vert[idx])
+
+    def total_population(self, idx):
+        """
+        Get the total population of a cluster
+        """
+        return int(self._population[idx])
+
+    def averaged_risk(self, idx):
+        """
+        Get the averaged risk of a cluster
+        """
+        return float(self._risk[idx])
+
+    def cluster_size(self, idx):
+        """
+        Get the number of counties in a cluster
+        """
+        return int(self._size[idx])
+
+    def arrays(self):
+        """
+        Get the live slot ids with their centers, populations and risks
+
+        Returns:
+            (ids, horiz, vert, pop, risk): arrays restricted to the live slots
+        """
+        ids = self.cluster_ids()
+        return (ids, self._horiz[ids], self._vert[ids],
+                self._population[ids].astype(np.float64), self._risk[ids])
+
+    def find(self, idx):
+        """
+        Find the live slot that slot idx has been merged into (with path halving)
+        """
+        parent = self._parent
+        while parent[idx] != idx:
+            parent[idx] = parent[parent[idx]]
+            idx = parent[idx]
+        return int(idx)
+
+    def memberships(self):
+        """
+        Get the live slot of every county
+
+        Returns:
+            (array): slot index per county, in the order of the FIPS codes
+        """
+        roots = self._parent
+        while True:
+            next_roots = roots[roots]
+            if np.array_equal(next_roots, roots):
+                break
+            roots = next_roots
+        self._parent = roots
+        return roots[self._home]
+
+    def fips_codes(self, idx):
+        """
+        Get the set of FIPS codes of a cluster; use fips_codes_by_cluster
+        for more than a few clusters
+        """
+        owners = self.memberships()
+        return set(self._fips[county] for county in np.flatnonzero(owners == idx))
+
+    def fips_codes_by_cluster(self):
+        """
+        Get the FIPS code sets of every live cluster from one pass over the
+        memberships: the counties sorted by slot split into one run per cluster
+
+        Returns:
+            (dict): live slot index -> set of FIPS codes, in slot order
+        """
+        owners = self.memberships()
+        order = np.argsort(owners, kind='stable')
+        ids = self.cluster_ids()
+        ends = np.cumsum(np.bincount(owners, minlength=len(self._alive))[ids])
+        fips_sets = {}
+        start = 0
+        for (idx, end) in zip(ids.tolist(), ends.tolist()):
+            fips_sets[idx] = set([self._fips[county] for county in order[start:end].tolist()])
+            start = end
+        return fips_sets
+
+    def distance(self, idx_u, idx_v):
+        """
+        Compute the Euclidean distance between two clusters, exactly as
+        Cluster.distance does
+        """
+        vert_dist = float(self._vert[idx_u]) - float(self._vert[idx_v])
+        horiz_dist = float(self._horiz[idx_u]) - float(self._horiz[idx_v])
+        return math.sqrt(vert_dist ** 2 + horiz_dist ** 2)
+
+    def distances_from(self, idx):
+        """
+        Compute the distance from cluster idx to every slot in one vector
+        operation; dead slots and idx itself get infinity
+
+        Returns:
+            (array): float64 distance per slot
+        """
+        dist = np.sqrt((self._vert[idx] - self._vert) ** 2 + (self._horiz[idx] - self._horiz) ** 2)
+        dist[~self._alive] = np.inf
+        dist[idx] = np.inf
+        return dist
+
+    def merge_clusters(self, idx_u, idx_v):
+        """
+        Merge cluster idx_v into cluster idx_u using the same population
+        weighting as Cluster.merge_clusters
+
+        Note that this method mutates the table; idx_v is no longer live
+        """
+        if self._size[idx_v] == 0:
+            return idx_u
+        #
+        self_pop = int(self._population[idx_u])
+        other_pop = int(self._population[idx_v])
+        total_pop = self_pop + other_pop
+        # compute weights for averaging
+        self_weight = float(self_pop) / total_pop
+        other_weight = float(other_pop) / total_pop
+        # update center and risk using weights
+        self._vert[idx_u] = self_weight * float(self._vert[idx_u]) + other_weight * float(self._vert[idx_v])
+        self._horiz[idx_u] = self_weight * float(self._horiz[idx_u]) + other_weight * float(self._horiz[idx_v])
+        self._risk[idx_u] = self_weight * float(self._risk[idx_u]) + other_weight * float(self._risk[idx_v])
+        self._population[idx_u] = total_pop
+        #
+        self._size[idx_u] += self._size[idx_v]
+        self._parent[idx_v] = idx_u
+        self._alive[idx_v] = False
+        self._num_alive -= 1
+        return idx_u
+
+    def copy(self):
+        """
+        Return a copy of the table (a few flat array copies)
+        """
+        new_table = ClusterTable.__new__(ClusterTable)
+        new_table._fips = self._fips
+        new_table._home = self._home
+        new_table._horiz = self._horiz.copy()
+        new_table._vert = self._vert.copy()
+        new_table._population = self._population.copy()
+        new_table._risk = self._risk.copy()
+        new_table._parent = self._parent.copy()
+        new_table._size = self._size.copy()
+        new_table._alive = self._alive.copy()
+        new_table._num_alive = self._num_alive
+        return new_table
+
+    def to_cluster_list(self):
+        """
+        Convert the live clusters to a list of Cluster objects
+        """
+        fips_sets = self.fips_codes_by_cluster()
+        return [alg_cluster.Cluster(fips_sets[idx], self.horiz_center(idx), self.vert_center(idx),
+                                    self.total_population(idx), self.averaged_risk(idx))
+                for idx in fips_sets]
+
+##############################################
+#    Helper functions
+#
+def table_from_data_table(data_table):
+    """
+    Build a table with one singleton cluster per row of a cancer data table
+
+    Args:
+        data_table (list): rows of [fips, horiz, vert, population, risk]
+    Returns:
+        (ClusterTable): table of singleton clusters
+    """
+    return ClusterTable([line[0] for line in data_table],
+                        range(len(data_table)),
+                        [line[1] for line in data_table],
+                        [line[2] for line in data_table],
+                        [line[3] for line in data_table],
+                        [line[4] for line in data_table])
+
+def table_from_cluster_list(cluster_list):
+    """
+    Build a table with one slot per Cluster object
+
+    Args:
+        cluster_list (list): A list of Cluster objects
+    Returns:
+        (ClusterTable): table holding the same clusters
+    """
+    fips_codes = []
+    home_slots = []
+    for idx in range(len(cluster_list)):
+        for fips in sorted(cluster_list[idx].fips_codes()):
+            fips_codes.append(fips)
+            home_slots.append(idx)
+    #
+    return ClusterTable(fips_codes, home_slots,
+                        [cluster.horiz_center() for cluster in cluster_list],
+                        [cluster.vert_center() for cluster in cluster_list],
+                        [cluster.total_population() for cluster in cluster_list],
+                        [cluster.averaged_risk() for cluster in cluster_list])
+
+############################
+#    Closest pair functions
+#
+def table_closest_pair(table):
+    """
+    Find the closest pair of live clusters in a table, one vectorized row
+    of distances at a time
+
+    Args:
+        table (ClusterTable): table of clusters
+    Returns:
+        (dist, idx1, idx2): distance and slot indices (idx1 < idx2) of the
+            closest pair, or (inf, -1, -1) with fewer than two clusters
+    """
+    closest_pair = (float('inf'), -1, -1)
+    #
+    for idx_u in table.cluster_ids():
+        dist = table.distances_from(idx_u)
+        dist[:idx_u] = np.inf
+        idx_v = int(np.argmin(dist))
+        if dist[idx_v] < closest_pair[0]:
+            closest_pair = (float(dist[idx_v]), int(idx_u), idx_v)
+    #
+    return closest_pair
+
+######################################################################
+#   Code for hierarchical clustering
+#
+def table_hierarchical_clustering(table, num_clusters):
+    """
+    Compute a hierarchical clustering over a table, merging the closest pair
+    until num_clusters remain.  Uses the nearest-neighbour heap of
+    alg_hierarchical with the distance updates done as vector operations.
+    Note: the function does not mutate table
+
+    Args:
+        table (ClusterTable): table of clusters
+        num_clusters (int): number of clusters wanted
+    Returns:
+        (ClusterTable): new table with num_clusters live clusters
+    """
+    work_table = table.copy()
+    num_slots = len(work_table._alive)
+    #
+    nn_idx = np.full(num_slots, -1, dtype=np.int64)
+    nn_dist = np.full(num_slots, np.inf)
+    heap = []
+    for idx in work_table.cluster_ids():
+        dist = work_table.distances_from(idx)
+        nn_idx[idx] = np.argmin(dist)
+        nn_dist[idx] = dist[nn_idx[idx]]
+        if nn_dist[idx] < np.inf:
+            heap.append((float(nn_dist[idx]), int(idx), int(nn_idx[idx])))
+    heapq.heapify(heap)
+    #
+    alive = work_table._alive
+    while work_table.num_clusters() > num_clusters and len(heap) > 0:
+        (distance, idx_u, idx_v) = heapq.heappop(heap)
+        # skip entries that are out of date
+        if not alive[idx_u] or not alive[idx_v]:
+            continue
+        if nn_idx[idx_u] != idx_v or nn_dist[idx_u] != distance:
+            continue
+        # keep the lower slot as the merged cluster
+        if idx_v < idx_u:
+            (idx_u, idx_v) = (idx_v, idx_u)
+        work_table.merge_clusters(idx_u, idx_v)
+        # refresh only the neighbour information that touches the merged cluster
+        dist = work_table.distances_from(idx_u)
+        closer = dist < nn_dist
+        stale = alive & ~closer & ((nn_idx == idx_u) | (nn_idx == idx_v))
+        stale[idx_u] = False
+        #
+        nn_idx[closer] = idx_u
+        nn_dist[closer] = dist[closer]
+        for idx_k in np.flatnonzero(closer):
+            heapq.heappush(heap, (float(dist[idx_k]), int(idx_k), idx_u))
+        for idx_k in np.flatnonzero(stale):
+            k_dist = work_table.distances_from(idx_k)
+            nn_idx[idx_k] = np.argmin(k_dist)
+            nn_dist[idx_k] = k_dist[nn_idx[idx_k]]
+            heapq.heappush(heap, (float(nn_dist[idx_k]), int(idx_k), int(nn_idx[idx_k])))
+        #
+        nn_idx[idx_u] = np.argmin(dist)
+        nn_dist[idx_u] = dist[nn_idx[idx_u]]
+        if nn_dist[idx_u] < np.inf:
+            heapq.heappush(heap, (float(nn_dist[idx_u]), idx_u, int(nn_idx[idx_u])))
+    #
+    return work_table
+
+######################################################################
+#   Code for k-means clustering
+#
+def table_kmeans_clustering(table, num_clusters, num_iterations):
+    """
+    Compute the k-means clustering of the live clusters in a table, with
+    the same initial centers as kmeans_clustering (the first num_clusters
+    live clusters)
+    Note: the function does not mutate table
+
+    Args:
+        table (ClusterTable): table of clusters
+        num_clusters (int): number of clusters
+        num_iterations (int): number of iterations
+    Returns:
+        (ClusterTable): new table with one slot per k-means cluster
+    """
+    (ids, horiz, vert, pop, risk) = table.arrays()
+    (assignment, center_horiz, center_vert, total_pop, avg_risk) = alg_kmeans.kmeans_arrays(horiz, vert, pop, risk,
+                                                                                            num_clusters,
+                                                                                            num_iterations)
+    # map every county through its current slot to the k-means cluster
+    slot_to_cluster = np.full(len(table._alive), -1, dtype=np.int64)
+    slot_to_cluster[ids] = assignment
+    home_slots = slot_to_cluster[table.memberships()]
+    #
+    return ClusterTable(table._fips, home_slots, center_horiz, center_vert,
+                        np.rint(total_pop).astype(np.int64), avg_risk)
@@ -9,6 +9,7 @@ Import your solution code below as "student"
 
 import random
 import urllib.request as url
+import alg_data_loader
 
 # Use CodeSkulptor or download these Python files for use on the desktop
 #import poc_simpletest      # http://www.codeskulptor.org/#poc_simpletest.py
@@ -37,13 +38,9 @@ def load_data_table(data_url):
     from a csv format file
     """
     #data_file = url.urlopen(data_url)
-    data_file = open(data_url)
-    data = data_file.read()
-    data_lines = data.split('\n')
-    print("Loaded", len(data_lines), "data points")
-    data_tokens = [line.split(',') for line in data_lines]
-    return [[tokens[0], float(tokens[1]), float(tokens[2]), int(tokens[3]), float(tokens[4])] 
-            for tokens in data_tokens]
+    data_table = alg_data_loader.load_data_table(data_url)
+    print("Loaded", len(data_table), "data points")
+    return data_table
 
 
 #########################################################################
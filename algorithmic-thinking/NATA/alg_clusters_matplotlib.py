@@ -5,6 +5,7 @@ Some provided code for plotting the clusters using matplotlib
 import math
 import urllib.request as url
 import matplotlib.pyplot as plt
+import alg_data_loader
 
 
 # URLS for various important datasets
@@ -152,16 +153,11 @@ def load_cancer_data(file_name):
     """
     cancer_cluster_list = []
     #
-    data_file = open(file_name)
-    data = data_file.read()
-    data_lines = data.split('\n')
-    print("Loaded", len(data_lines), "data points")
+    data_table = alg_data_loader.load_data_table(file_name)
+    print("Loaded", len(data_table), "data points")
     #
-    for line in data_lines:
-        if len(line) > 0:
-            tokens = line.split(',')
-            cancer_cluster_list.append(Cluster(set([tokens[0]]), float(tokens[1]), float(tokens[2]),
-                                               int(tokens[3]), float(tokens[4])))
+    for line in data_table:
+        cancer_cluster_list.append(Cluster(set([line[0]]), line[1], line[2], line[3], line[4]))
     #
     return cancer_cluster_list
  
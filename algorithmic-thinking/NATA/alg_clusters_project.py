@@ -7,6 +7,7 @@
 import alg_cluster
 import math
 import random
+import alg_data_loader
 #import urllib2
 
 ###################################################
@@ -46,19 +47,11 @@ def load_data_table(file_name):
     """
     cancer_cluster_list = []
     #
-    data_file = open(file_name)
-    data = data_file.read()
-    data_lines = data.split('\n')
-    print("Loaded", len(data_lines), "data points")
+    data_table = alg_data_loader.load_data_table(file_name)
+    print("Loaded", len(data_table), "data points")
     #
-    for line in data_lines:
-        if len(line) > 0:
-            tokens = line.split(',')
-            cancer_cluster_list.append(alg_cluster.Cluster(set([tokens[0]]),
-                                                           float(tokens[1]),
-                                                           float(tokens[2]),
-                                                           int(tokens[3]),
-                                                           float(tokens[4])))
+    for line in data_table:
+        cancer_cluster_list.append(alg_cluster.Cluster(set([line[0]]), line[1], line[2], line[3], line[4]))
     #
     return cancer_cluster_list
 ############################
@@ -0,0 +1,148 @@
+"""
+
+    Shared loader for the unifiedCancerData CSV files
+
+    The scripts used to re-read and re-parse the CSV on every run.  The
+    first load here parses it once and saves the columns as a structured
+    .npy file next to the CSV; later loads memory-map that file.  The cache
+    file is stamped with the modification time of the CSV it was built
+    from, so an edited CSV is parsed again.
+
+"""
+import os
+import numpy as np
+import alg_cluster
+
+# one record per county: FIPS code, horizontal and vertical center, population, risk
+CANCER_FIELDS = ('fips', 'horiz', 'vert', 'pop', 'risk')
+
+##############################################
+#    Helper functions
+#
+def cache_file_name(file_name):
+    """
+    Name of the binary cache kept next to a CSV file
+    """
+    return file_name + '.cache.npy'
+
+def iter_cancer_rows(file_name):
+    """
+    Generator reading a unifiedCancerData CSV file one line at a time
+
+    Args:
+        file_name (str): path of the CSV file
+    Yields:
+        [fips, horiz, vert, pop, risk] for every non-empty line
+    """
+    with open(file_name) as data_file:
+        for line in data_file:
+            line = line.strip()
+            if len(line) == 0:
+                continue
+            tokens = line.split(',')
+            yield [tokens[0], float(tokens[1]), float(tokens[2]), int(tokens[3]), float(tokens[4])]
+
+def parse_cancer_csv(file_name):
+    """
+    Parse a unifiedCancerData CSV file into a structured array
+
+    Args:
+        file_name (str): path of the CSV file
+    Returns:
+        (array): structured array with the CANCER_FIELDS columns
+    """
+    fips = []
+    horiz = []
+    vert = []
+    pop = []
+    risk = []
+    for line in iter_cancer_rows(file_name):
+        fips.append(line[0])
+        horiz.append(line[1])
+        vert.append(line[2])
+        pop.append(line[3])
+        risk.append(line[4])
+    #
+    fips_len = max([len(code) for code in fips] + [1])
+    records = np.empty(len(fips), dtype=[('fips', 'U' + str(fips_len)), ('horiz', np.float64),
+                                         ('vert', np.float64), ('pop', np.int64), ('risk', np.float64)])
+    records['fips'] = fips
+    records['horiz'] = horiz
+    records['vert'] = vert
+    records['pop'] = pop
+    records['risk'] = risk
+    return records
+
+def write_cache(records, file_name):
+    """
+    Save parsed records as the cache of a CSV file, stamped with its mtime
+    """
+    source_mtime = os.stat(file_name).st_mtime_ns
+    cache_name = cache_file_name(file_name)
+    # write aside and rename so a reader never maps a half written file
+    temp_name = cache_name + '.' + str(os.getpid()) + '.tmp'
+    with open(temp_name, 'wb') as cache_file:
+        np.save(cache_file, records)
+    os.utime(temp_name, ns=(source_mtime, source_mtime))
+    os.replace(temp_name, cache_name)
+
+######################################################################
+#   Loading functions
+#
+def load_cancer_records(file_name, use_cache = True):
+    """
+    Load a unifiedCancerData CSV file as a structured array, through the
+    binary cache when it is up to date
+
+    Args:
+        file_name (str): path of the CSV file
+        use_cache (bool): read and write the .npy cache; a cache that
+            cannot be written (read-only directory) is skipped silently
+    Returns:
+        (array): structured array with the CANCER_FIELDS columns, read-only
+            and memory-mapped when it comes from the cache
+    """
+    if not use_cache:
+        return parse_cancer_csv(file_name)
+    #
+    cache_name = cache_file_name(file_name)
+    source_mtime = os.stat(file_name).st_mtime_ns
+    if os.path.exists(cache_name) and os.stat(cache_name).st_mtime_ns == source_mtime:
+        return np.load(cache_name, mmap_mode='r')
+    #
+    records = parse_cancer_csv(file_name)
+    try:
+        write_cache(records, file_name)
+    except OSError:
+        pass
+    return records
+
+def load_data_table(file_name, use_cache = True):
+    """
+    Import a table of county-based cancer risk data as the list of
+    [fips, horiz, vert, pop, risk] rows the clustering scripts use
+
+    Args:
+        file_name (str): path of the CSV file
+        use_cache (bool): go through the binary cache
+    Returns:
+        (list): one list per county
+    """
+    records = load_cancer_records(file_name, use_cache)
+    return [list(row) for row in zip(records['fips'].tolist(), records['horiz'].tolist(),
+                                     records['vert'].tolist(), records['pop'].tolist(),
+                                     records['risk'].tolist())]
+
+def load_cancer_clusters(file_name, use_cache = True):
+    """
+    Load data from a unifiedCancerData CSV file and return a list of
+    singleton alg_cluster.Cluster objects
+
+    Args:
+        file_name (str): path of the CSV file
+        use_cache (bool): go through the binary cache
+    Returns:
+        (list): one Cluster per county
+    """
+    return [alg_cluster.Cluster(set([line[0]]), line[1], line[2], line[3], line[4])
+            for line in load_data_table(file_name, use_cache)]
@@ -0,0 +1,376 @@
+"""
+
+    Heap-driven hierarchical clustering
+
+    hierarchical_clustering in alg_project3_solution rescans every pair of
+    clusters for each merge, which is O(n^3) over the run.  The engine here
+    keeps the nearest neighbour of every live cluster in a priority queue and,
+    after each merge, only revisits the distances that touch the merged
+    cluster, so a full run is O(n^2 log n).  The same pass also tracks the
+    distortion, so the distortion for every cluster count comes out of one run.
+
+"""
+import heapq
+import math
+import alg_cluster
+
+##############################################
+#    Helper functions
+#
+def _center_distance(horiz, vert, idx_u, idx_v):
+    """
+    Euclidean distance between two cluster centers, computed exactly as
+    Cluster.distance does so merge decisions are bit-for-bit identical
+
+    Args:
+        horiz (list): horizontal centers indexed by cluster id
+        vert (list): vertical centers indexed by cluster id
+        idx_u (int): first cluster id
+        idx_v (int): second cluster id
+    Returns:
+        (float): distance between the two centers
+    """
+    vert_dist = vert[idx_u] - vert[idx_v]
+    horiz_dist = horiz[idx_u] - horiz[idx_v]
+    return math.sqrt(vert_dist ** 2 + horiz_dist ** 2)
+
+def _initial_neighbors(horiz, vert):
+    """
+    Find the nearest neighbour of every cluster with a sweep over the clusters
+    sorted by horizontal center; each side of the sweep stops as soon as the
+    horizontal gap alone is no closer than the best distance found so far
+
+    Args:
+        horiz (list): horizontal centers indexed by cluster id
+        vert (list): vertical centers indexed by cluster id
+    Returns:
+        (nn_idx, nn_dist): lists with the neighbour id and distance per cluster
+    """
+    num_clusters = len(horiz)
+    nn_idx = [-1] * num_clusters
+    nn_dist = [float('inf')] * num_clusters
+    #
+    order = sorted(range(num_clusters), key = lambda idx: horiz[idx])
+    #
+    for pos in range(num_clusters):
+        idx_u = order[pos]
+        # walk right, then left, until the horizontal gap rules out a closer pair
+        for step in (1, -1):
+            other_pos = pos + step
+            while 0 <= other_pos < num_clusters:
+                idx_v = order[other_pos]
+                if math.fabs(horiz[idx_v] - horiz[idx_u]) >= nn_dist[idx_u]:
+                    break
+                distance = _center_distance(horiz, vert, idx_u, idx_v)
+                if distance < nn_dist[idx_u] or (distance == nn_dist[idx_u] and idx_v < nn_idx[idx_u]):
+                    nn_dist[idx_u] = distance
+                    nn_idx[idx_u] = idx_v
+                other_pos += step
+    #
+    return (nn_idx, nn_dist)
+
+def _scan_neighbor(horiz, vert, active, idx_u):
+    """
+    Find the nearest live neighbour of idx_u by scanning every live cluster
+
+    Args:
+        horiz (list): horizontal centers indexed by cluster id
+        vert (list): vertical centers indexed by cluster id
+        active (list): ids of the live clusters
+        idx_u (int): cluster id whose neighbour is wanted
+    Returns:
+        (dist, idx): distance to and id of the nearest live cluster
+    """
+    closest = (float('inf'), -1)
+    #
+    for idx_v in active:
+        if idx_v == idx_u:
+            continue
+        distance = _center_distance(horiz, vert, idx_u, idx_v)
+        if distance < closest[0]:
+            closest = (distance, idx_v)
+    #
+    return closest
+
+######################################################################
+#   Code for heap-driven hierarchical clustering
+#
+def _merge_steps(work_list, active, num_clusters):
+    """
+    Generator driving the nearest-neighbour heap: merges the closest pair of
+    live clusters in work_list (mutating it) until num_clusters remain
+
+    After each merge it yields (idx_u, idx_v, distance, error_increase) where
+    idx_v was merged into idx_u and error_increase is the growth of the total
+    distortion, p_u * p_v / (p_u + p_v) * distance ** 2 for population
+    weighted centers.
+
+    Args:
+        work_list (list): Cluster objects, indexed by cluster id
+        active (list): ids of the live clusters, updated in place with
+            merged clusters moved to the end
+        num_clusters (int): number of clusters wanted
+    """
+    horiz = [cluster.horiz_center() for cluster in work_list]
+    vert = [cluster.vert_center() for cluster in work_list]
+    alive = [False] * len(work_list)
+    for idx in active:
+        alive[idx] = True
+    #
+    (nn_idx, nn_dist) = _initial_neighbors(horiz, vert)
+    #
+    heap = [(nn_dist[idx], idx, nn_idx[idx]) for idx in active]
+    heapq.heapify(heap)
+    #
+    while len(active) > num_clusters and len(heap) > 0:
+        (distance, idx_u, idx_v) = heapq.heappop(heap)
+        # skip entries that are out of date
+        if not alive[idx_u] or not alive[idx_v]:
+            continue
+        if nn_idx[idx_u] != idx_v or nn_dist[idx_u] != distance:
+            continue
+        # keep the lower id (the one slow_closest_pair reports first) as the merged cluster
+        if idx_v < idx_u:
+            (idx_u, idx_v) = (idx_v, idx_u)
+        pop_u = work_list[idx_u].total_population()
+        pop_v = work_list[idx_v].total_population()
+        if pop_u + pop_v > 0:
+            error_increase = (float(pop_u) * pop_v / (pop_u + pop_v)) * distance ** 2
+        else:
+            error_increase = 0.0
+        #
+        work_list[idx_u].merge_clusters(work_list[idx_v])
+        horiz[idx_u] = work_list[idx_u].horiz_center()
+        vert[idx_u] = work_list[idx_u].vert_center()
+        #
+        alive[idx_v] = False
+        active.remove(idx_u)
+        active.remove(idx_v)
+        active.append(idx_u)
+        # refresh only the neighbour information that touches the merged cluster
+        merged_nn = (float('inf'), -1)
+        for idx_k in active:
+            if idx_k == idx_u:
+                continue
+            distance_k = _center_distance(horiz, vert, idx_k, idx_u)
+            if distance_k < merged_nn[0]:
+                merged_nn = (distance_k, idx_k)
+            #
+            if distance_k < nn_dist[idx_k]:
+                nn_dist[idx_k] = distance_k
+                nn_idx[idx_k] = idx_u
+                heapq.heappush(heap, (distance_k, idx_k, idx_u))
+            elif nn_idx[idx_k] == idx_u or nn_idx[idx_k] == idx_v:
+                # old neighbour moved away or vanished, so rescan for this cluster
+                (nn_dist[idx_k], nn_idx[idx_k]) = _scan_neighbor(horiz, vert, active, idx_k)
+                if nn_idx[idx_k] >= 0:
+                    heapq.heappush(heap, (nn_dist[idx_k], idx_k, nn_idx[idx_k]))
+        #
+        (nn_dist[idx_u], nn_idx[idx_u]) = merged_nn
+        if nn_idx[idx_u] >= 0:
+            heapq.heappush(heap, (nn_dist[idx_u], idx_u, nn_idx[idx_u]))
+        #
+        yield (idx_u, idx_v, distance, error_increase)
+
+def heap_hierarchical_clustering(cluster_list, num_clusters):
+    """
+    Compute a hierarchical clustering of a set of clusters, merging the
+    closest pair of clusters until num_clusters remain
+
+    The result matches hierarchical_clustering driven by slow_closest_pair
+    (the exact closest pair at every step); only pairs at exactly equal
+    distance may be merged in a different order.
+    Note: the function does not mutate cluster_list
+
+    Args:
+        cluster_list (list): A list of Cluster objects
+        num_clusters (int): number of clusters wanted
+    Returns:
+        (list): list of Cluster objects whose length is num_clusters
+    """
+    work_list = [cluster.copy() for cluster in cluster_list]
+    # active keeps list order the same as the list-based version: merged clusters go last
+    active = list(range(len(work_list)))
+    #
+    for _ in _merge_steps(work_list, active, num_clusters):
+        pass
+    #
+    return [work_list[idx] for idx in active]
+
+##############################################
+#   Distortion
+#
+def hierarchical_distortion_curve(cluster_list, cluster_counts, data_table = None):
+    """
+    Compute the distortion of the hierarchical clustering at several cluster
+    counts in a single clustering pass
+
+    Every merge adds p_u * p_v / (p_u + p_v) * dist(u, v) ** 2 to the total
+    distortion, so the running sum gives the distortion at each count without
+    rerunning the clustering or calling cluster_error.
+    Note: the function does not mutate cluster_list
+
+    Args:
+        cluster_list (list): A list of Cluster objects
+        cluster_counts (iterable): cluster counts whose distortion is wanted
+        data_table (list): original cancer data table; only needed when
+            cluster_list does not start out as singleton clusters
+    Returns:
+        (dict): distortion keyed by cluster count
+    """
+    work_list = [cluster.copy() for cluster in cluster_list]
+    active = list(range(len(work_list)))
+    wanted = set(cluster_counts)
+    # starting distortion: zero for singletons, otherwise from the indexed cluster_error
+    total_error = 0.0
+    if data_table is not None:
+        fips_to_line = alg_cluster.fips_index(data_table)
+        for cluster in work_list:
+            total_error += cluster.cluster_error(data_table, fips_to_line)
+    #
+    distortions = {}
+    if len(active) in wanted:
+        distortions[len(active)] = total_error
+    #
+    for (_, _, _, error_increase) in _merge_steps(work_list, active, min(wanted)):
+        total_error += error_increase
+        if len(active) in wanted:
+            distortions[len(active)] = total_error
+    #
+    return distortions
+
+######################################################################
+#   Dendrogram (full merge history)
+#
+class Dendrogram:
+    """
+    Class recording the full merge history of a hierarchical clustering
+
+    One heap-driven run merges the clusters all the way down to a single
+    cluster and records every merge together with the merged cluster's
+    center, population and risk.  Cutting the history at any cluster count
+    afterwards is O(n), so the cluster lists, distortions and plots for a
+    whole range of counts need only that one run.
+    """
+
+    def __init__(self, cluster_list, data_table = None):
+        """
+        Run the clustering and record the merges
+
+        Args:
+            cluster_list (list): A list of Cluster objects (not mutated)
+            data_table (list): original cancer data table; only needed when
+                cluster_list does not start out as singleton clusters
+        """
+        self._leaves = [cluster.copy() for cluster in cluster_list]
+        #
+        self._base_error = 0.0
+        if data_table is not None:
+            fips_to_line = alg_cluster.fips_index(data_table)
+            for cluster in self._leaves:
+                self._base_error += cluster.cluster_error(data_table, fips_to_line)
+        # each merge: (idx_u, idx_v, distance, error_increase, horiz, vert, population, risk)
+        self._merges = []
+        work_list = [cluster.copy() for cluster in cluster_list]
+        active = list(range(len(work_list)))
+        for (idx_u, idx_v, distance, error_increase) in _merge_steps(work_list, active, 1):
+            merged = work_list[idx_u]
+            self._merges.append((idx_u, idx_v, distance, error_increase,
+                                 merged.horiz_center(), merged.vert_center(),
+                                 merged.total_population(), merged.averaged_risk()))
+        # running distortion after each merge, for O(1) distortion lookups
+        self._errors = [self._base_error]
+        for merge in self._merges:
+            self._errors.append(self._errors[-1] + merge[3])
+
+    def __repr__(self):
+        """
+        String representation of the dendrogram
+        """
+        return "Dendrogram(" + str(len(self._leaves)) + " leaves, " + str(len(self._merges)) + " merges)"
+
+    def num_leaves(self):
+        """
+        Get the number of clusters the clustering started from
+        """
+        return len(self._leaves)
+
+    def merges(self):
+        """
+        Get the merge history as a list of (idx_u, idx_v, distance, size) tuples,
+        where idx_v was merged into idx_u (indices into the original cluster list)
+        and size is the number of counties in the merged cluster
+        """
+        sizes = [len(cluster.fips_codes()) for cluster in self._leaves]
+        linkage = []
+        for merge in self._merges:
+            sizes[merge[0]] += sizes[merge[1]]
+            linkage.append((merge[0], merge[1], merge[2], sizes[merge[0]]))
+        return linkage
+
+    def distortion(self, num_clusters):
+        """
+        Get the distortion of the clustering cut at num_clusters clusters
+        """
+        num_merges = self._num_merges(num_clusters)
+        return self._errors[num_merges]
+
+    def cut(self, num_clusters):
+        """
+        Cut the dendrogram to get the clustering with num_clusters clusters
+
+        The list is the one heap_hierarchical_clustering returns for the same
+        count, in the same order.
+
+        Args:
+            num_clusters (int): number of clusters wanted
+        Returns:
+            (list): list of Cluster objects whose length is num_clusters
+        """
+        num_merges = self._num_merges(num_clusters)
+        num_leaves = len(self._leaves)
+        # replay the first merges into a union-find, remembering the latest state of each root
+        parent = list(range(num_leaves))
+        last_merge = [-1] * num_leaves
+        for step in range(num_merges):
+            (idx_u, idx_v) = self._merges[step][:2]
+            parent[idx_v] = idx_u
+            last_merge[idx_u] = step
+        #
+        root_of = [0] * num_leaves
+        for idx in range(num_leaves):
+            root = idx
+            while parent[root] != root:
+                root = parent[root]
+            # path compression
+            node = idx
+            while parent[node] != root:
+                (parent[node], node) = (root, parent[node])
+            root_of[idx] = root
+        #
+        fips_sets = {}
+        for idx in range(num_leaves):
+            root = root_of[idx]
+            if root not in fips_sets:
+                fips_sets[root] = set([])
+            fips_sets[root].update(self._leaves[idx].fips_codes())
+        # untouched clusters keep their original order and merged ones follow in merge order
+        roots = sorted(fips_sets.keys(), key = lambda root: (last_merge[root], root))
+        cluster_list = []
+        for root in roots:
+            if last_merge[root] < 0:
+                leaf = self._leaves[root]
+                cluster_list.append(alg_cluster.Cluster(fips_sets[root], leaf.horiz_center(), leaf.vert_center(),
+                                                        leaf.total_population(), leaf.averaged_risk()))
+            else:
+                merge = self._merges[last_merge[root]]
+                cluster_list.append(alg_cluster.Cluster(fips_sets[root], merge[4], merge[5], merge[6], merge[7]))
+        #
+        return cluster_list
+
+    def _num_merges(self, num_clusters):
+        """
+        Number of recorded merges that produce num_clusters clusters
+        """
+        num_clusters = max(num_clusters, 1)
+        return max(0, min(len(self._merges), len(self._leaves) - num_clusters))
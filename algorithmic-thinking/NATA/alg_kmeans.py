@@ -0,0 +1,171 @@
+"""
+
+    Array-backed k-means clustering
+
+    kmeans_clustering in alg_project3_solution walks every county against
+    every center in pure Python.  The functions here load the cluster
+    coordinates and populations into NumPy arrays once, assign every county
+    with a single broadcast distance computation per iteration and compute
+    the population weighted centers with np.bincount.
+
+"""
+import numpy as np
+import alg_cluster
+
+##############################################
+#    Helper functions
+#
+def cluster_arrays(cluster_list):
+    """
+    Helper function to load a list of clusters into parallel arrays
+
+    Args:
+        cluster_list (list): A list of Cluster objects
+    Returns:
+        (fips, horiz, vert, pop, risk): list of FIPS code sets and float64
+            arrays of horizontal centers, vertical centers, populations and risks
+    """
+    fips = [cluster.fips_codes() for cluster in cluster_list]
+    horiz = np.array([cluster.horiz_center() for cluster in cluster_list], dtype=np.float64)
+    vert = np.array([cluster.vert_center() for cluster in cluster_list], dtype=np.float64)
+    pop = np.array([cluster.total_population() for cluster in cluster_list], dtype=np.float64)
+    risk = np.array([cluster.averaged_risk() for cluster in cluster_list], dtype=np.float64)
+    #
+    return (fips, horiz, vert, pop, risk)
+
+def assign_to_centers(horiz, vert, center_horiz, center_vert):
+    """
+    Assign every point to its closest center with one broadcast computation
+
+    Distances are computed with the same expression as kmeans_clustering so
+    ties resolve to the lowest center index in both paths.
+
+    Args:
+        horiz (array): horizontal positions of the points
+        vert (array): vertical positions of the points
+        center_horiz (array): horizontal positions of the centers
+        center_vert (array): vertical positions of the centers
+    Returns:
+        (array): index of the closest center for every point
+    """
+    dist = np.sqrt(((center_horiz[np.newaxis, :] - horiz[:, np.newaxis]) ** 2) +
+                   ((center_vert[np.newaxis, :] - vert[:, np.newaxis]) ** 2))
+    return np.argmin(dist, axis=1)
+
+def weighted_centers(assignment, num_clusters, horiz, vert, pop, risk):
+    """
+    Compute the population weighted center and risk of each cluster
+
+    Empty clusters get a (0.0, 0.0) center and zero risk, which is where
+    kmeans_clustering leaves an empty Cluster.
+
+    Args:
+        assignment (array): cluster index of every point
+        num_clusters (int): number of clusters
+        horiz, vert, pop, risk (array): per point data
+    Returns:
+        (center_horiz, center_vert, total_pop, avg_risk): per cluster arrays
+    """
+    total_pop = np.bincount(assignment, weights=pop, minlength=num_clusters)
+    sum_horiz = np.bincount(assignment, weights=pop * horiz, minlength=num_clusters)
+    sum_vert = np.bincount(assignment, weights=pop * vert, minlength=num_clusters)
+    sum_risk = np.bincount(assignment, weights=pop * risk, minlength=num_clusters)
+    # avoid dividing by zero for the empty clusters
+    safe_pop = np.where(total_pop > 0, total_pop, 1.0)
+    #
+    return (sum_horiz / safe_pop, sum_vert / safe_pop, total_pop, sum_risk / safe_pop)
+
+def kmeans_distortion(assignment, center_horiz, center_vert, horiz, vert, pop):
+    """
+    Compute the distortion of a clustering held in arrays: the population
+    weighted sum of squared distances from every point to its cluster center
+    (the points being single counties, as in the cancer data table)
+
+    Args:
+        assignment (array): cluster index of every point
+        center_horiz, center_vert (array): per cluster centers
+        horiz, vert, pop (array): per point data
+    Returns:
+        (float): total distortion
+    """
+    horiz_dist = horiz - center_horiz[assignment]
+    vert_dist = vert - center_vert[assignment]
+    return float(np.sum(pop * (vert_dist ** 2 + horiz_dist ** 2)))
+
+def arrays_to_clusters(fips, assignment, center_horiz, center_vert, total_pop, avg_risk):
+    """
+    Helper function to turn per cluster arrays back into Cluster objects
+
+    Args:
+        fips (list): FIPS code set of every point
+        assignment (array): cluster index of every point
+        center_horiz, center_vert, total_pop, avg_risk (array): per cluster data
+    Returns:
+        (list): list of Cluster objects, one per cluster index
+    """
+    # gather the FIPS codes of each cluster
+    fips_sets = [set([]) for _ in range(len(center_horiz))]
+    for idx in range(len(fips)):
+        fips_sets[assignment[idx]].update(fips[idx])
+    #
+    return [alg_cluster.Cluster(fips_sets[idx], float(center_horiz[idx]), float(center_vert[idx]),
+                                int(total_pop[idx]), float(avg_risk[idx]))
+            for idx in range(len(center_horiz))]
+
+######################################################################
+#   Code for array-backed k-means clustering
+#
+def kmeans_arrays(horiz, vert, pop, risk, num_clusters, num_iterations, init_centers=None):
+    """
+    Compute a k-means clustering over points held in arrays
+
+    Args:
+        horiz, vert, pop, risk (array): per point data
+        num_clusters (int): number of clusters
+        num_iterations (int): number of assignment/update passes
+        init_centers (tuple): optional (center_horiz, center_vert) arrays;
+            defaults to the first num_clusters points, as kmeans_clustering does
+    Returns:
+        (assignment, center_horiz, center_vert, total_pop, avg_risk): the cluster
+            index of every point and the per cluster arrays
+    """
+    if init_centers is None:
+        center_horiz = np.array(horiz[:num_clusters], dtype=np.float64)
+        center_vert = np.array(vert[:num_clusters], dtype=np.float64)
+    else:
+        center_horiz = np.array(init_centers[0], dtype=np.float64)
+        center_vert = np.array(init_centers[1], dtype=np.float64)
+    #
+    assignment = np.zeros(len(horiz), dtype=np.intp)
+    total_pop = np.zeros(num_clusters)
+    avg_risk = np.zeros(num_clusters)
+    #
+    for _ in range(num_iterations):
+        assignment = assign_to_centers(horiz, vert, center_horiz, center_vert)
+        (center_horiz, center_vert, total_pop, avg_risk) = weighted_centers(assignment, num_clusters,
+                                                                            horiz, vert, pop, risk)
+    #
+    return (assignment, center_horiz, center_vert, total_pop, avg_risk)
+
+def numpy_kmeans_clustering(cluster_list, num_clusters, num_iterations):
+    """
+    Compute the k-means clustering of a set of clusters using NumPy arrays
+    Note: the function does not mutate cluster_list
+
+    Same inputs and initial centers as kmeans_clustering; the county
+    memberships match the object-based path, while centers can differ from
+    it in the last few bits since the weighted sums are not accumulated
+    merge by merge.
+
+    Args:
+        cluster_list (list): A list of Cluster objects
+        num_clusters (int): number of clusters
+        num_iterations (int): number of iterations
+    Returns:
+        (list): list of Cluster objects whose length is num_clusters
+    """
+    (fips, horiz, vert, pop, risk) = cluster_arrays(cluster_list)
+    #
+    (assignment, center_horiz, center_vert, total_pop, avg_risk) = kmeans_arrays(horiz, vert, pop, risk,
+                                                                                 num_clusters, num_iterations)
+    return arrays_to_clusters(fips, assignment, center_horiz, center_vert, total_pop, avg_risk)
@@ -0,0 +1,154 @@
+"""
+
+    Parallel k-means restarts and k sweeps
+
+    Fans array-backed k-means runs (different cluster counts, different
+    seeded initializations) out over a concurrent.futures process pool and
+    keeps the lowest distortion clustering per cluster count.  The county
+    arrays are handed to each worker once through the pool initializer, so
+    tasks only carry (k, iterations, init method, seed).
+
+    Note: on platforms that spawn worker processes (macOS, Windows) call
+    parallel_kmeans_sweep from under an  if __name__ == '__main__':  guard.
+
+"""
+import concurrent.futures
+import numpy as np
+import alg_kmeans
+
+# per worker copy of the read-only county arrays, set by _init_worker
+_SHARED = {}
+
+##############################################
+#    Initial centers
+#
+def kmeans_plus_plus_centers(horiz, vert, pop, num_clusters, rng):
+    """
+    Pick initial centers with population weighted k-means++ seeding: the
+    first center with probability proportional to population, each next one
+    proportional to population times squared distance to the closest center
+    picked so far
+
+    Args:
+        horiz, vert, pop (array): per point data
+        num_clusters (int): number of centers
+        rng (numpy.random.Generator): random stream
+    Returns:
+        (center_horiz, center_vert): arrays of initial centers
+    """
+    num_points = len(horiz)
+    weights = pop / np.sum(pop)
+    picks = [int(rng.choice(num_points, p=weights))]
+    closest_sqrd = (horiz - horiz[picks[0]]) ** 2 + (vert - vert[picks[0]]) ** 2
+    #
+    for _ in range(1, num_clusters):
+        scores = pop * closest_sqrd
+        total = np.sum(scores)
+        if total > 0:
+            pick = int(rng.choice(num_points, p=scores / total))
+        else:
+            # every point already sits on a center
+            pick = int(rng.integers(num_points))
+        picks.append(pick)
+        closest_sqrd = np.minimum(closest_sqrd, (horiz - horiz[pick]) ** 2 + (vert - vert[pick]) ** 2)
+    #
+    return (horiz[picks].copy(), vert[picks].copy())
+
+def initial_centers(horiz, vert, pop, num_clusters, init_method, rng):
+    """
+    Pick initial centers by name
+
+    Args:
+        horiz, vert, pop (array): per point data
+        num_clusters (int): number of centers
+        init_method (str): 'first' (the first num_clusters points, as
+            kmeans_clustering does), 'random' (distinct random points) or
+            'kmeans++'
+        rng (numpy.random.Generator): random stream
+    Returns:
+        (center_horiz, center_vert): arrays of initial centers
+    """
+    if init_method == 'first':
+        return (horiz[:num_clusters].copy(), vert[:num_clusters].copy())
+    if init_method == 'random':
+        picks = rng.choice(len(horiz), size=num_clusters, replace=False)
+        return (horiz[picks].copy(), vert[picks].copy())
+    if init_method == 'kmeans++':
+        return kmeans_plus_plus_centers(horiz, vert, pop, num_clusters, rng)
+    raise ValueError("unknown init_method " + repr(init_method))
+
+##############################################
+#    Worker side
+#
+def _init_worker(horiz, vert, pop, risk):
+    """
+    Pool initializer: keep the county arrays for every task this worker runs
+    """
+    _SHARED['arrays'] = (horiz, vert, pop, risk)
+
+def _kmeans_task(task):
+    """
+    Run one seeded k-means and return its distortion and result arrays
+    """
+    (num_clusters, num_iterations, init_method, seed_seq) = task
+    (horiz, vert, pop, risk) = _SHARED['arrays']
+    rng = np.random.default_rng(seed_seq)
+    #
+    centers = initial_centers(horiz, vert, pop, num_clusters, init_method, rng)
+    result = alg_kmeans.kmeans_arrays(horiz, vert, pop, risk, num_clusters, num_iterations, centers)
+    distortion = alg_kmeans.kmeans_distortion(result[0], result[1], result[2], horiz, vert, pop)
+    return (num_clusters, distortion, result)
+
+######################################################################
+#   Code for the parallel sweep
+#
+def parallel_kmeans_sweep(cluster_list, cluster_counts, num_iterations, num_restarts = 1,
+                          init_method = 'kmeans++', seed = 0, max_workers = None):
+    """
+    Run k-means for every cluster count with several seeded restarts across
+    a process pool and keep the lowest distortion clustering per count
+
+    Task seeds come from numpy SeedSequence(seed).spawn in task order, so the
+    result for a given seed does not depend on max_workers.
+
+    Args:
+        cluster_list (list): A list of singleton Cluster objects
+        cluster_counts (iterable): cluster counts to try
+        num_iterations (int): iterations per k-means run
+        num_restarts (int): runs per cluster count ('first' init always runs once)
+        init_method (str): 'first', 'random' or 'kmeans++'
+        seed (int): master seed
+        max_workers (int): pool size; None for one per core, 1 to run in-process
+    Returns:
+        (dict): cluster count -> (distortion, list of Cluster objects)
+    """
+    (fips, horiz, vert, pop, risk) = alg_kmeans.cluster_arrays(cluster_list)
+    #
+    if init_method == 'first':
+        num_restarts = 1
+    cluster_counts = list(cluster_counts)
+    seed_seqs = np.random.SeedSequence(seed).spawn(len(cluster_counts) * num_restarts)
+    tasks = []
+    for count_idx in range(len(cluster_counts)):
+        for restart in range(num_restarts):
+            tasks.append((cluster_counts[count_idx], num_iterations, init_method,
+                          seed_seqs[count_idx * num_restarts + restart]))
+    #
+    if max_workers == 1:
+        _init_worker(horiz, vert, pop, risk)
+        results = [_kmeans_task(task) for task in tasks]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                                    initargs=(horiz, vert, pop, risk)) as executor:
+            results = list(executor.map(_kmeans_task, tasks))
+    # keep the first lowest distortion run for every count
+    best = {}
+    for (num_clusters, distortion, result) in results:
+        if num_clusters not in best or distortion < best[num_clusters][0]:
+            best[num_clusters] = (distortion, result)
+    #
+    sweep = {}
+    for num_clusters in best:
+        (distortion, result) = best[num_clusters]
+        sweep[num_clusters] = (distortion, alg_kmeans.arrays_to_clusters(fips, *result))
+    return sweep
@@ -0,0 +1,235 @@
+"""
+
+    Streaming and mini-batch k-means
+
+    kmeans_clustering and the array versions in alg_kmeans need every point
+    in memory.  StreamingKMeans only keeps the centers and a few per cluster
+    accumulators, and takes its points as batches of arrays from a
+    generator, e.g. a chunked read of a CSV file, so memory stays bounded by
+    the number of clusters plus the batch size.  It supports two kinds of
+    update with the usual population weighted centers:
+
+        partial_fit   mini-batch update: each center moves towards the batch
+                      points assigned to it, with a step of the batch weight
+                      over all the weight the center has seen so far
+        full passes   start_pass / add_to_pass / end_pass accumulate one
+                      exact k-means iteration over a whole stream
+
+"""
+import numpy as np
+import alg_data_loader
+import alg_kmeans
+
+##############################################
+#    Batch generators
+#
+def iter_batches(rows, batch_size):
+    """
+    Generator grouping [fips, horiz, vert, pop, risk] rows into array batches
+
+    Args:
+        rows (iterable): rows as in a data table, from a list or a generator
+        batch_size (int): maximum number of points per batch
+    Yields:
+        (horiz, vert, pop, risk): float64 arrays of at most batch_size points
+    """
+    batch = []
+    for line in rows:
+        batch.append(line[1:5])
+        if len(batch) == batch_size:
+            yield _batch_arrays(batch)
+            batch = []
+    if len(batch) > 0:
+        yield _batch_arrays(batch)
+
+def _batch_arrays(batch):
+    """
+    Helper function to turn a list of (horiz, vert, pop, risk) into arrays
+    """
+    columns = np.array(batch, dtype=np.float64)
+    return (columns[:, 0], columns[:, 1], columns[:, 2], columns[:, 3])
+
+def iter_file_batches(file_name, batch_size):
+    """
+    Generator reading a unifiedCancerData CSV file in array batches,
+    without loading the whole file
+    """
+    return iter_batches(alg_data_loader.iter_cancer_rows(file_name), batch_size)
+
+
+class StreamingKMeans:
+    """
+    Class for k-means over a stream of point batches
+    """
+
+    def __init__(self, num_clusters, init_centers = None):
+        """
+        Create a model with num_clusters centers
+
+        Args:
+            num_clusters (int): number of clusters
+            init_centers (tuple): optional (center_horiz, center_vert) arrays;
+                defaults to the first num_clusters points streamed in, as
+                kmeans_clustering does
+        """
+        self._num_clusters = num_clusters
+        self._center_horiz = np.zeros(num_clusters)
+        self._center_vert = np.zeros(num_clusters)
+        self._num_seeded = 0
+        if init_centers is not None:
+            self._center_horiz[:] = init_centers[0]
+            self._center_vert[:] = init_centers[1]
+            self._num_seeded = num_clusters
+        # population each center has absorbed through partial_fit
+        self._seen_pop = np.zeros(num_clusters)
+        self._pass_sums = None
+
+    def __repr__(self):
+        """
+        String representation of the model
+        """
+        return ("StreamingKMeans(" + str(self._num_clusters) + " clusters, " +
+                str(self._num_seeded) + " seeded)")
+
+    def num_clusters(self):
+        """
+        Get the number of clusters
+        """
+        return self._num_clusters
+
+    def is_seeded(self):
+        """
+        Check whether every center has been given a position
+        """
+        return self._num_seeded == self._num_clusters
+
+    def centers(self):
+        """
+        Get copies of the (center_horiz, center_vert) arrays
+        """
+        return (self._center_horiz.copy(), self._center_vert.copy())
+
+    def _seed(self, horiz, vert):
+        """
+        Use the leading points of a batch as centers until every center has
+        one; returns how many points of the batch were used
+        """
+        num_used = min(self._num_clusters - self._num_seeded, len(horiz))
+        self._center_horiz[self._num_seeded:self._num_seeded + num_used] = horiz[:num_used]
+        self._center_vert[self._num_seeded:self._num_seeded + num_used] = vert[:num_used]
+        self._num_seeded += num_used
+        return num_used
+
+    def partial_fit(self, horiz, vert, pop, risk = None):
+        """
+        Mini-batch update with one batch of points
+
+        A center that has absorbed population W so far and gets batch
+        population w with weighted mean m moves to
+        (W * center + w * m) / (W + w), i.e. it stays the population weighted
+        mean of every point ever assigned to it.
+
+        Args:
+            horiz, vert, pop (array): per point data of the batch
+            risk (array): unused, accepted so batches can be passed as *batch
+        """
+        if not self.is_seeded():
+            self._seed(horiz, vert)
+        #
+        assignment = alg_kmeans.assign_to_centers(horiz, vert, self._center_horiz, self._center_vert)
+        batch_pop = np.bincount(assignment, weights=pop, minlength=self._num_clusters)
+        sum_horiz = np.bincount(assignment, weights=pop * horiz, minlength=self._num_clusters)
+        sum_vert = np.bincount(assignment, weights=pop * vert, minlength=self._num_clusters)
+        #
+        self._seen_pop += batch_pop
+        moved = batch_pop > 0
+        self._center_horiz[moved] += ((sum_horiz[moved] - batch_pop[moved] * self._center_horiz[moved]) /
+                                      self._seen_pop[moved])
+        self._center_vert[moved] += ((sum_vert[moved] - batch_pop[moved] * self._center_vert[moved]) /
+                                     self._seen_pop[moved])
+
+    def start_pass(self):
+        """
+        Start accumulating one exact k-means iteration against the current centers
+        """
+        # total population, pop * horiz, pop * vert, pop * risk, pop * squared distance
+        self._pass_sums = np.zeros((5, self._num_clusters))
+
+    def add_to_pass(self, horiz, vert, pop, risk):
+        """
+        Assign one batch to the current centers and add it to the pass sums
+        """
+        if not self.is_seeded():
+            self._seed(horiz, vert)
+        assignment = alg_kmeans.assign_to_centers(horiz, vert, self._center_horiz, self._center_vert)
+        dist_sqrd = ((horiz - self._center_horiz[assignment]) ** 2 +
+                     (vert - self._center_vert[assignment]) ** 2)
+        for (row, weights) in enumerate((pop, pop * horiz, pop * vert, pop * risk, pop * dist_sqrd)):
+            self._pass_sums[row] += np.bincount(assignment, weights=weights, minlength=self._num_clusters)
+
+    def end_pass(self):
+        """
+        Move every center to the population weighted mean of the points the
+        pass assigned to it; as in kmeans_clustering an empty cluster ends
+        up at (0.0, 0.0)
+
+        Returns:
+            (total_pop, avg_risk, distortion): per cluster totals and risks of
+                the pass and the distortion of its assignment against the
+                new centers, as alg_kmeans.kmeans_distortion computes it
+        """
+        (total_pop, sum_horiz, sum_vert, sum_risk, sum_dist) = self._pass_sums
+        self._pass_sums = None
+        # avoid dividing by zero for the empty clusters
+        safe_pop = np.where(total_pop > 0, total_pop, 1.0)
+        center_horiz = sum_horiz / safe_pop
+        center_vert = sum_vert / safe_pop
+        # each new center is the weighted mean of its points, so moving there
+        # lowers their squared distances by total_pop * (shift ** 2)
+        shift_sqrd = (center_horiz - self._center_horiz) ** 2 + (center_vert - self._center_vert) ** 2
+        distortion = float(np.sum(sum_dist) - np.sum(total_pop * shift_sqrd))
+        #
+        self._center_horiz = center_horiz
+        self._center_vert = center_vert
+        self._seen_pop = total_pop.copy()
+        return (total_pop, sum_risk / safe_pop, distortion)
+
+######################################################################
+#   Code for streaming k-means clustering
+#
+def streaming_kmeans(batch_source, num_clusters, num_iterations, num_minibatch_passes = 0):
+    """
+    Compute a k-means clustering of a stream of points too large for memory
+
+    Optional mini-batch passes move the centers cheaply first; each of the
+    num_iterations exact passes is then one iteration of kmeans_clustering,
+    so with no mini-batch passes the centers are those of kmeans_clustering
+    up to floating point summation order.
+
+    Args:
+        batch_source (function): called with no arguments once per pass, it
+            returns a fresh iterable of (horiz, vert, pop, risk) batches,
+            e.g. lambda: iter_file_batches(file_name, 65536)
+        num_clusters (int): number of clusters
+        num_iterations (int): number of exact passes, at least 1
+        num_minibatch_passes (int): number of partial_fit passes before them
+    Returns:
+        (center_horiz, center_vert, total_pop, avg_risk, distortion): the per
+            cluster arrays after the last exact pass and the distortion of
+            its assignment
+    """
+    if num_iterations < 1:
+        raise ValueError("num_iterations must be at least 1, got " + str(num_iterations))
+    model = StreamingKMeans(num_clusters)
+    for _ in range(num_minibatch_passes):
+        for batch in batch_source():
+            model.partial_fit(*batch)
+    #
+    for _ in range(num_iterations):
+        model.start_pass()
+        for batch in batch_source():
+            model.add_to_pass(*batch)
+        (total_pop, avg_risk, distortion) = model.end_pass()
+    #
+    (center_horiz, center_vert) = model.centers()
+    return (center_horiz, center_vert, total_pop, avg_risk, distortion)
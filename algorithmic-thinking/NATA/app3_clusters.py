@@ -9,6 +9,7 @@ import math
 import random
 import time
 import matplotlib.pyplot as plt
+import alg_data_loader
 
 #import urllib2
 
@@ -58,18 +59,10 @@ def load_data_table(file_name):
     """
     cancer_cluster_list = []
     #
-    data_file = open(file_name)
-    data = data_file.read()
-    data_lines = data.split('\n')
+    data_table = alg_data_loader.load_data_table(file_name)
     #
-    for line in data_lines:
-        if len(line) > 0:
-            tokens = line.split(',')
-            cancer_cluster_list.append(alg_cluster.Cluster(set([tokens[0]]),
-                                                           float(tokens[1]),
-                                                           float(tokens[2]),
-                                                           int(tokens[3]),
-                                                           float(tokens[4])))
+    for line in data_table:
+        cancer_cluster_list.append(alg_cluster.Cluster(set([line[0]]), line[1], line[2], line[3], line[4]))
     #
     print("Loaded", len(cancer_cluster_list), "data points")
     #
@@ -8,6 +8,7 @@ import alg_project3_solution as soln
 from urllib.request import urlopen
 import matplotlib.pyplot as plt
 import time
+import alg_data_loader
 
 # URLS for various important datasets
 #DIR_IMAGE = "http://commondatastorage.googleapis.com/codeskulptor-assets/"
@@ -28,13 +29,9 @@ def load_data_table(data_url):
     Import a table of county-based cancer risk data
     from a csv format file
     """
-    data_file = open(data_url)
-    data = data_file.read()
-    data_lines = data.split('\n')
-    print("Loaded", len(data_lines), "data points")
-    data_tokens = [line.split(',') for line in data_lines]
-    return [[tokens[0], float(tokens[1]), float(tokens[2]), int(tokens[3]), float(tokens[4])] 
-            for tokens in data_tokens]
+    data_table = alg_data_loader.load_data_table(data_url)
+    print("Loaded", len(data_table), "data points")
+    return data_table
     
 def deepcopy(obj):
     """
@@ -128,10 +125,12 @@ def compute_distortion(cluster_list, data_table):
         data_table   (list): original set of data from which the clusters are generated
     """
     total_error = 0.0
+    # build the FIPS index once rather than once per cluster
+    fips_to_line = alg_cluster.fips_index(data_table)
     #
     for cluster in cluster_list:
         #
-        total_error += cluster.cluster_error(data_table)
+        total_error += cluster.cluster_error(data_table, fips_to_line)
         #
     return total_error
         
@@ -8,6 +8,7 @@ import math
 import copy
 import matplotlib.pyplot as plt
 import numpy as np
+import alg_data_loader
 
 # constants
 DIRECTORY = "/Users/fpj/Development/python/fundamentals-computing/algorithmic-thinking/data/"
@@ -149,16 +150,11 @@ def load_cancer_data(file_name):
     """
     cancer_cluster_list = []
     #
-    data_file = open(file_name)
-    data = data_file.read()
-    data_lines = data.split('\n')
-    print("Loaded", len(data_lines), "data points")
+    data_table = alg_data_loader.load_data_table(file_name)
+    print("Loaded", len(data_table), "data points")
     #
-    for line in data_lines:
-        if len(line) > 0:
-            tokens = line.split(',')
-            cancer_cluster_list.append(Cluster(set([tokens[0]]), float(tokens[1]), float(tokens[2]),
-                                               int(tokens[3]), float(tokens[4])))
+    for line in data_table:
+        cancer_cluster_list.append(Cluster(set([line[0]]), line[1], line[2], line[3], line[4]))
     #
     return cancer_cluster_list
     
@@ -6,6 +6,7 @@ import math
 import alg_cluster
 from urllib.request import urlopen
 import matplotlib.pyplot as plt
+import alg_data_loader
 
 
 # URLS for various important datasets
@@ -25,13 +26,9 @@ def load_data_table(data_url):
     Import a table of county-based cancer risk data
     from a csv format file
     """
-    data_file = open(data_url)
-    data = data_file.read()
-    data_lines = data.split('\n')
-    print("Loaded", len(data_lines), "data points")
-    data_tokens = [line.split(',') for line in data_lines]
-    return [[tokens[0], float(tokens[1]), float(tokens[2]), int(tokens[3]), float(tokens[4])] 
-            for tokens in data_tokens]
+    data_table = alg_data_loader.load_data_table(data_url)
+    print("Loaded", len(data_table), "data points")
+    return data_table
     
 def circle_area(pop):
     """
@@ -0,0 +1,294 @@
+"""
+Compressed sparse row (CSR) undirected graphs
+
+The module 2 code keeps graphs as a dict from node to a set of neighbors,
+over 200 bytes per edge, and copy_graph rebuilds every set.  CSRGraph
+keeps the neighbors of node i at neighbors[offsets[i]:offsets[i + 1]] in
+one int32 array, 8 bytes per edge counting both directions, and marks
+deleted nodes in a mask instead of touching the arrays, so a copy only
+duplicates the per-node mask and degrees.  A 10M-edge graph takes about
+80MB of neighbors.
+
+Nodes are the integers 0 .. n - 1, as in load_graph, make_upa_graph and
+random_undirected_graph.
+"""
+import heapq
+from array import array
+import numpy as np
+
+######################################################################
+#   Helper functions
+#
+def _gather_neighbors(offsets, neighbors, nodes):
+    """
+    Helper function to concatenate the neighbor slices of an array of nodes
+    """
+    starts = offsets[nodes]
+    lengths = offsets[nodes + 1] - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=neighbors.dtype)
+    # position of every gathered entry: its slice start plus its rank within the slice
+    slice_begin = np.cumsum(lengths) - lengths
+    index = np.arange(total, dtype=np.int64) - np.repeat(slice_begin - starts, lengths)
+    return neighbors[index]
+
+
+class CSRGraph:
+    """
+    Class for an undirected graph in compressed sparse row form with node deletion
+    """
+
+    def __init__(self, offsets, neighbors):
+        """
+        Create a graph from its CSR arrays, every edge listed from both ends
+
+        Args:
+            offsets (array): n + 1 int64 positions into neighbors
+            neighbors (array): int32 neighbor lists, concatenated by node
+        """
+        self._offsets = np.asarray(offsets, dtype=np.int64)
+        self._neighbors = np.asarray(neighbors, dtype=np.int32)
+        self._deleted = np.zeros(len(self._offsets) - 1, dtype=np.bool_)
+        self._degrees = np.diff(self._offsets)
+
+    @classmethod
+    def from_arcs(cls, num_nodes, tails, heads):
+        """
+        Build a graph from arcs tail -> head, each edge given in both directions
+
+        Args:
+            num_nodes (int): number of nodes
+            tails, heads (array): arc ends, any integer sequence
+        """
+        tails = np.asarray(tails)
+        heads = np.asarray(heads, dtype=np.int32)
+        offsets = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(tails, minlength=num_nodes), out=offsets[1:])
+        # arcs read from a file or made node by node are already grouped
+        if len(tails) > 1 and np.any(tails[1:] < tails[:-1]):
+            heads = heads[np.argsort(tails, kind='stable')]
+        return cls(offsets, heads)
+
+    @classmethod
+    def from_edges(cls, num_nodes, edges_a, edges_b):
+        """
+        Build a graph from undirected edges, each given once
+        """
+        ends = (np.asarray(edges_a, dtype=np.int32), np.asarray(edges_b, dtype=np.int32))
+        return cls.from_arcs(num_nodes, np.concatenate(ends), np.concatenate(ends[::-1]))
+
+    @classmethod
+    def from_dict(cls, ugraph):
+        """
+        Build a graph from the dict of sets form
+
+        Args:
+            ugraph (dict): Undirected graph with nodes 0 .. n - 1
+        """
+        num_nodes = len(ugraph)
+        offsets = np.zeros(num_nodes + 1, dtype=np.int64)
+        neighbors = array('i')
+        for node in range(num_nodes):
+            if node not in ugraph:
+                raise ValueError("graph nodes are not 0 .. " + str(num_nodes - 1) + ": no node " + str(node))
+            neighbors.extend(sorted(ugraph[node]))
+            offsets[node + 1] = len(neighbors)
+        return cls(offsets, np.frombuffer(neighbors, dtype=np.int32))
+
+    @classmethod
+    def load(cls, file_name):
+        """
+        Load a graph from the text format load_graph reads: one line per
+        node, the node followed by its neighbors, space separated
+        """
+        tails = array('i')
+        heads = array('i')
+        num_nodes = 0
+        with open(file_name) as graph_file:
+            for line in graph_file:
+                tokens = line.split()
+                if len(tokens) == 0:
+                    continue
+                node = int(tokens[0])
+                num_nodes = max(num_nodes, node + 1)
+                for token in tokens[1:]:
+                    tails.append(node)
+                    heads.append(int(token))
+        print("Loaded graph with", num_nodes, "nodes")
+        return cls.from_arcs(num_nodes, np.frombuffer(tails, dtype=np.int32), np.frombuffer(heads, dtype=np.int32))
+
+    def __repr__(self):
+        """
+        String representation of the graph
+        """
+        return "CSRGraph(" + str(self.num_nodes()) + " nodes, " + str(self.num_edges()) + " edges)"
+
+    def __len__(self):
+        """
+        Number of nodes not deleted
+        """
+        return self.num_nodes()
+
+    def __contains__(self, node):
+        """
+        Check whether a node is in the graph and not deleted
+        """
+        return 0 <= node < len(self._deleted) and not self._deleted[node]
+
+    def num_nodes(self):
+        """
+        Get the number of nodes not deleted
+        """
+        return len(self._deleted) - int(np.count_nonzero(self._deleted))
+
+    def num_edges(self):
+        """
+        Get the number of edges between nodes not deleted
+        """
+        return int(self._degrees.sum()) // 2
+
+    def nodes(self):
+        """
+        Get the array of nodes not deleted
+        """
+        return np.flatnonzero(~self._deleted)
+
+    def neighbors(self, node):
+        """
+        Get the array of neighbors of a node that are not deleted
+        """
+        adjacent = self._neighbors[self._offsets[node]:self._offsets[node + 1]]
+        return adjacent[~self._deleted[adjacent]]
+
+    def degree(self, node):
+        """
+        Get the number of neighbors of a node that are not deleted
+        """
+        return int(self._degrees[node])
+
+    def degrees(self):
+        """
+        Get a copy of the degree of every node (its in-degree, the graph being
+        undirected); deleted nodes have degree 0
+        """
+        return self._degrees.copy()
+
+    def in_degree_distribution(self):
+        """
+        Get the number of nodes with each degree, as in_degree_distribution does
+        """
+        counts = np.bincount(self._degrees[~self._deleted])
+        return dict([(degree, int(counts[degree])) for degree in np.flatnonzero(counts).tolist()])
+
+    def copy(self):
+        """
+        Make a copy of the graph; the CSR arrays are shared, only the deletion
+        mask and the degrees are copied
+        """
+        new_graph = CSRGraph.__new__(CSRGraph)
+        new_graph._offsets = self._offsets
+        new_graph._neighbors = self._neighbors
+        new_graph._deleted = self._deleted.copy()
+        new_graph._degrees = self._degrees.copy()
+        return new_graph
+
+    def delete_node(self, node):
+        """
+        Delete a node and its edges
+        """
+        if self._deleted[node]:
+            raise KeyError(node)
+        np.subtract.at(self._degrees, self.neighbors(node), 1)
+        self._deleted[node] = True
+        self._degrees[node] = 0
+
+    def bfs_visited(self, start_node):
+        """
+        Compute the set of nodes reached by a breadth-first search from
+        start_node, one vectorized step per level
+
+        Returns:
+            visited (set): nodes in the component of start_node
+        """
+        visited = self._deleted.copy()
+        visited[start_node] = True
+        found = [np.array([start_node])]
+        frontier = found[0]
+        while len(frontier) > 0:
+            reached = _gather_neighbors(self._offsets, self._neighbors, frontier)
+            frontier = np.unique(reached[~visited[reached]])
+            visited[frontier] = True
+            found.append(frontier)
+        return set(np.concatenate(found).tolist())
+
+    def component_labels(self):
+        """
+        Label every node with the smallest node of its connected component,
+        -1 for deleted nodes, by repeated vectorized searches
+
+        Returns:
+            (array): int64 label per node
+        """
+        labels = np.full(len(self._deleted), -1, dtype=np.int64)
+        unlabeled = ~self._deleted
+        isolated = unlabeled & (self._degrees == 0)
+        labels[isolated] = np.flatnonzero(isolated)
+        unlabeled &= ~isolated
+        for start_node in np.flatnonzero(unlabeled).tolist():
+            if not unlabeled[start_node]:
+                continue
+            frontier = np.array([start_node])
+            unlabeled[start_node] = False
+            labels[start_node] = start_node
+            while len(frontier) > 0:
+                reached = _gather_neighbors(self._offsets, self._neighbors, frontier)
+                frontier = np.unique(reached[unlabeled[reached]])
+                unlabeled[frontier] = False
+                labels[frontier] = start_node
+        return labels
+
+    def largest_cc_size(self):
+        """
+        Get the number of nodes in the largest connected component
+        """
+        labels = self.component_labels()
+        labels = labels[labels >= 0]
+        return int(np.bincount(labels).max()) if len(labels) > 0 else 0
+
+    def targeted_order(self):
+        """
+        Compute a targeted attack order, repeatedly removing a node of
+        maximal degree; ties go to the smallest node, which is the node
+        targeted_order picks on a graph whose dict keys are in node order
+
+        Returns:
+            (list): the nodes not deleted, in attack order
+        """
+        degrees = self._degrees.copy()
+        deleted = self._deleted.copy()
+        heap = [(-int(degrees[node]), node) for node in np.flatnonzero(~deleted).tolist()]
+        heapq.heapify(heap)
+        #
+        order = []
+        while len(heap) > 0:
+            (neg_degree, node) = heapq.heappop(heap)
+            # skip entries for deleted nodes or degrees that have since dropped
+            if deleted[node] or -neg_degree != degrees[node]:
+                continue
+            deleted[node] = True
+            order.append(node)
+            adjacent = self._neighbors[self._offsets[node]:self._offsets[node + 1]]
+            for neighbor in adjacent[~deleted[adjacent]].tolist():
+                degrees[neighbor] -= 1
+                heapq.heappush(heap, (-int(degrees[neighbor]), neighbor))
+        return order
+
+    def to_dict(self):
+        """
+        Convert to the dict of sets form, leaving out deleted nodes
+        """
+        ugraph = {}
+        for node in self.nodes().tolist():
+            ugraph[node] = set(self.neighbors(node).tolist())
+        return ugraph
@@ -0,0 +1,158 @@
+"""
+Cache for alignment results
+
+Re-running the genome-sequence-alignment.py questions recomputes the same
+alignment matrices every time.  AlignmentCache keeps the results of an
+alignment function keyed by a hash of its name and inputs, in an
+in-memory LRU and optionally in a directory of small JSON files that
+survives between runs.  Only the result is stored, e.g. (score, align_x,
+align_y), which is len(X) + len(Y) characters against the
+(len(X)+1) x (len(Y)+1) entries of the alignment matrix.
+
+"""
+import collections
+import hashlib
+import json
+import os
+
+##################################################################
+#   Helper functions
+#
+def alignment_key(func_name, seq_x, seq_y, scoring_matrix, extra_args):
+    """
+    Helper function to hash the inputs of an alignment call
+
+    Args:
+        func_name (str): name of the alignment function
+        seq_x (str): X sequence
+        seq_y (str): Y sequence
+        scoring_matrix (dict of dicts): scoring matrix
+        extra_args (tuple): further JSON-serialisable arguments
+    Returns:
+        (str): hex SHA-256 of the inputs
+    """
+    payload = json.dumps([func_name, seq_x, seq_y, scoring_matrix, list(extra_args)], sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+#
+def _as_tuples(value):
+    """
+    Helper function to turn the lists JSON gives back into tuples
+    """
+    if isinstance(value, list):
+        return tuple([_as_tuples(item) for item in value])
+    return value
+
+
+class AlignmentCache:
+    """
+    Class for an in-memory LRU of alignment results backed by an optional
+    directory of JSON files
+    """
+
+    def __init__(self, cache_dir = None, max_entries = 128):
+        """
+        Create a cache
+
+        Args:
+            cache_dir (str): directory for the on-disk copies (created when
+                needed); None keeps results in memory only
+            max_entries (int): number of results kept in memory
+        """
+        self._cache_dir = cache_dir
+        self._max_entries = max_entries
+        self._entries = collections.OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def __repr__(self):
+        """
+        String representation of the cache
+        """
+        return ("AlignmentCache(" + repr(self._cache_dir) + ", " + str(len(self._entries)) + " in memory, " +
+                str(self._hits) + " hits, " + str(self._misses) + " misses)")
+
+    def __len__(self):
+        """
+        Number of results held in memory
+        """
+        return len(self._entries)
+
+    def _file_name(self, key):
+        """
+        On-disk location of a key
+        """
+        return os.path.join(self._cache_dir, key + '.json')
+
+    def get(self, key):
+        """
+        Look a key up in memory, then on disk
+
+        Returns:
+            the stored result, or None
+        """
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        if self._cache_dir is None or not os.path.exists(self._file_name(key)):
+            return None
+        with open(self._file_name(key)) as cache_file:
+            value = _as_tuples(json.load(cache_file))
+        self._remember(key, value)
+        return value
+
+    def put(self, key, value):
+        """
+        Store a JSON-serialisable result in memory and on disk
+        """
+        self._remember(key, value)
+        if self._cache_dir is None:
+            return
+        os.makedirs(self._cache_dir, exist_ok=True)
+        # write aside and rename so a reader never sees a half written file
+        temp_name = self._file_name(key) + '.' + str(os.getpid()) + '.tmp'
+        with open(temp_name, 'w') as cache_file:
+            json.dump(value, cache_file)
+        os.replace(temp_name, self._file_name(key))
+
+    def _remember(self, key, value):
+        """
+        Add a result to the in-memory LRU, dropping the least recently used
+        """
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def cached(self, func, seq_x, seq_y, scoring_matrix, *extra_args):
+        """
+        Call func(seq_x, seq_y, scoring_matrix, *extra_args) unless the cache
+        already holds its result
+
+        The key uses func.__name__, so func should be a named function whose
+        result only depends on its arguments; clear the cache after
+        changing what it computes.
+
+        Returns:
+            the result of func, as tuples where it returned lists or tuples
+        """
+        key = alignment_key(func.__name__, seq_x, seq_y, scoring_matrix, extra_args)
+        value = self.get(key)
+        if value is not None:
+            self._hits += 1
+            return value
+        #
+        self._misses += 1
+        value = _as_tuples(func(seq_x, seq_y, scoring_matrix, *extra_args))
+        self.put(key, value)
+        return value
+
+    def clear(self):
+        """
+        Drop every result, in memory and on disk
+        """
+        self._entries.clear()
+        if self._cache_dir is None or not os.path.isdir(self._cache_dir):
+            return
+        for file_name in os.listdir(self._cache_dir):
+            if file_name.endswith('.json'):
+                os.remove(os.path.join(self._cache_dir, file_name))
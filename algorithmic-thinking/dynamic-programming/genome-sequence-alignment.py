@@ -8,11 +8,17 @@ import random
 import matplotlib.pyplot as plt
 import numpy as np
 #
+import alignment_cache
+import sequence_alignment
+import sequence_io
+#
 FILE_DIR = "/Users/fpj/Development/python/fundamentals-computing/algorithmic-thinking/dynamic-programming/data/"
 PAM50_FILE = "alg_PAM50.txt"
 HUMAN_FILE = "alg_HumanEyelessProtein.txt"
 FRUIT_FILE = "alg_FruitflyEyelessProtein.txt"
 PAX_DOMAIN = "alg_ConsensusPAXDomain.txt"
+# results of earlier runs, keyed by a hash of the sequences and scoring matrix
+ALIGNMENT_CACHE = alignment_cache.AlignmentCache(FILE_DIR + "alignment_cache")
 
 ##################################################################
 #   Helper functions
@@ -59,18 +65,17 @@ def load_scoring_matrix(file_name):
 #
 def load_genome_file(file_name):
     """
-    Helper to load the genome sequence from a file
+    Helper to load the genome sequence from a file: the first record of a
+    FASTA file or the first line of a plain one, read lazily
 
     Args:
         file_name (file name): location of the file to be opened
     Returns:
         genome (str) : genome sequence as a string
     """
-    data_file = open(file_name)
-    #
-    genome = data_file.read().splitlines()
-    #
-    return genome[0]
+    for (_, genome) in sequence_io.iter_fasta_records(file_name):
+        return genome
+    return ''
 #
 def calc_match_percentage(seq_x, seq_y):
     """
@@ -375,9 +380,23 @@ def compute_local_alignment(sequence_x, sequence_y, scoring_matrix, align_matrix
     #
     return (score, align_x, align_y)
 #
+def align_sequences(seq_x, seq_y, scoring_matrix, global_flag):
+    """
+    Function to compute a global or local alignment, for use through
+    ALIGNMENT_CACHE; same result as compute_global_alignment or
+    compute_local_alignment on compute_alignment_matrix, with a direction
+    byte per cell instead of the int table and a linear traceback
+
+    Returns:
+       (score, align_x, align_y): pairwise alignment of sequences X and Y
+    """
+    return sequence_alignment.compute_compact_alignment(seq_x, seq_y, scoring_matrix, global_flag)
+#
 def generate_null_distribution(seq_x, seq_y, scoring_matrix, num_trials):
     """
-    
+    Build the distribution of local alignment scores of seq_x against
+    random shuffles of seq_y; only the scores are needed, so no alignment
+    matrix or traceback is built
 
     Args:
         seq_x (str): genome sequence
@@ -388,13 +407,15 @@ def generate_null_distribution(seq_x, seq_y, scoring_matrix, num_trials):
         score_dist (dict): scoring distribution
     """
     score_dist = {}
+    # encode once; shuffling the codes permutes like shuffling the characters
+    (char_index, score_table) = sequence_alignment.dense_scoring_matrix(scoring_matrix)
+    codes_x = sequence_alignment.encode_sequence(seq_x, char_index)
+    codes_y = sequence_alignment.encode_sequence(seq_y, char_index).tolist()
     #
     for _ in range(num_trials):
-        list_seq_y = list(seq_y)
+        list_seq_y = list(codes_y)
         random.shuffle(list_seq_y)
-        rand_y = "".join(list_seq_y)
-        gnd_align_mtrx = compute_alignment_matrix(seq_x, rand_y, scoring_matrix, False)
-        (score, align_x, align_y) = compute_local_alignment(seq_x, rand_y, scoring_matrix, gnd_align_mtrx)
+        score = sequence_alignment.encoded_alignment_score(codes_x, np.array(list_seq_y), score_table, False)
         #
         if score in score_dist:
             score_dist[score] += 1
@@ -569,9 +590,7 @@ humn_seq = load_genome_file(human_file)
 #print("Fruit-Fly : ", type(ffly_seq), ffly_seq)
 #print("Human Eye : ", type(humn_seq), humn_seq)
 #
-dpt_eyeless = compute_alignment_matrix(ffly_seq, humn_seq, scm_50, False)
-#
-(scr_eyeless, ffly_align, humn_align) = compute_local_alignment(ffly_seq, humn_seq, scm_50, dpt_eyeless)
+(scr_eyeless, ffly_align, humn_align) = ALIGNMENT_CACHE.cached(align_sequences, ffly_seq, humn_seq, scm_50, False)
 #
 # Q1 answers
 print("\nQ1 answers\n")
@@ -593,11 +612,11 @@ humn_strip = humn_align.replace('-', '')
 #print("X-prime (stripped) : ", ffly_strip)
 #print("Y-prime (stripped) : ", humn_strip)
 #
-dpt_fly_cpd = compute_alignment_matrix(ffly_strip, conpaxdom, scm_50, True)
-(scr_fstr, ffly_strp, cpd_align0) = compute_global_alignment(ffly_strip, conpaxdom, scm_50, dpt_fly_cpd)
+# the stripped alignments are close to the consensus, so a band of diagonals also does:
+#(scr_fstr, ffly_strp, cpd_align0) = sequence_alignment.compute_banded_alignment(ffly_strip, conpaxdom, scm_50)
+(scr_fstr, ffly_strp, cpd_align0) = ALIGNMENT_CACHE.cached(align_sequences, ffly_strip, conpaxdom, scm_50, True)
 #
-dpt_hum_cpd = compute_alignment_matrix(humn_strip, conpaxdom, scm_50, True)
-(scr_hstr, humn_strp, cpd_align1) = compute_global_alignment(humn_strip, conpaxdom, scm_50, dpt_hum_cpd)
+(scr_hstr, humn_strp, cpd_align1) = ALIGNMENT_CACHE.cached(align_sequences, humn_strip, conpaxdom, scm_50, True)
 #
 print("\nQ2 answers\n")
 #
@@ -616,6 +635,8 @@ print("Match % : ", 100.0 * calc_match_percentage(humn_strp, cpd_align1))
 #num_trials = 1000
 #
 #scr_dist = generate_null_distribution(humn_seq, ffly_seq, scm_50, num_trials)
+# or across all cores, reproducible for a given seed (needs a __main__ guard on macOS/Windows)
+#scr_dist = sequence_alignment.parallel_null_distribution(humn_seq, ffly_seq, scm_50, num_trials, seed=1)
 #
 #print("Result : \n\n", scr_dist)
 #scr_keys = list(scr_dist.keys())
@@ -654,9 +675,9 @@ scm_7 = build_scoring_matrix(alfabet_50, diag_score_7, off_diag_score_7, dash_sc
 #for row in scm_7:
 #    print(row, " : ", scm_7[row])
 #
-dpt_7 = compute_alignment_matrix(ffly_seq, humn_seq, scm_7, True)
-#
-(scr_7, ffly_align_7, humn_align_7) = compute_global_alignment(ffly_seq, humn_seq, scm_7, dpt_7)
+# same result as compute_global_alignment on the full matrix, in linear memory
+(scr_7, ffly_align_7, humn_align_7) = ALIGNMENT_CACHE.cached(sequence_alignment.compute_global_alignment_linear,
+                                                            ffly_seq, humn_seq, scm_7)
 #
 # Q1 answers
 print("\nQ7 answers\n")
@@ -673,9 +694,7 @@ seq_2 = 'fumble'
 #
 scm_8 = build_scoring_matrix(alfabet_8, diag_score_7, off_diag_score_7, dash_score_7)
 #
-dpt_8 = compute_alignment_matrix(seq_1, seq_2, scm_8, True)
-#
-(scr_8, hum_align_8, fly_align_8) = compute_global_alignment(seq_1, seq_2, scm_8, dpt_8)
+(scr_8, hum_align_8, fly_align_8) = ALIGNMENT_CACHE.cached(align_sequences, seq_1, seq_2, scm_8, True)
 #
 print("\nQ7 answers\n")
 #
@@ -0,0 +1,1128 @@
+"""
+Alignment engines for long sequences
+
+compute_alignment_matrix in genome-sequence-alignment.py keeps the whole
+(len(x)+1) x (len(y)+1) table so the traceback can walk it.  The functions
+here give the same results while only ever holding a few rows of it, and
+the *_numpy versions compute each row with a handful of NumPy operations
+on integer-encoded sequences instead of a Python loop over its cells.
+
+"""
+import concurrent.futures
+import heapq
+import itertools
+import os
+import numpy as np
+
+# largest sub-problem the linear-memory alignment fills in as one block
+BLOCK_CELLS = 1 << 16
+
+# trials per seeded block of the parallel null distribution
+NULL_BLOCK_TRIALS = 50
+
+# per worker copy of the encoded sequences, set by _init_null_worker
+_NULL_SHARED = {}
+
+# per worker QueryProfile, set by _init_batch_worker
+_BATCH_SHARED = {}
+
+# traceback moves stored per cell by compute_alignment_directions
+DIR_DIAG = 0
+DIR_UP = 1
+DIR_LEFT = 2
+DIR_STOP = 3
+
+# states of the affine gap traceback bytes
+AFFINE_MATCH = 0
+AFFINE_X_GAP = 1
+AFFINE_Y_GAP = 2
+AFFINE_STOP = 3
+
+# stands in for -inf in the affine engines, far enough from the int64
+# limits to add scores to
+AFFINE_NEG_INF = -(1 << 50)
+
+##################################################################
+#   Helper functions
+#
+def global_first_row(sequence_y, scoring_matrix):
+    """
+    Helper function to compute row 0 of the global alignment matrix
+
+    Args:
+        sequence_y (str): Y sequence
+        scoring_matrix (dict of dicts): scoring matrix
+    Returns:
+        (list): len(sequence_y) + 1 scores
+    """
+    row = [0]
+    for idx_j in range(1, len(sequence_y) + 1):
+        row.append(row[idx_j - 1] + scoring_matrix['-'][sequence_y[idx_j - 1]])
+    return row
+#
+def score_profile(sequence_y, scoring_matrix, row_char):
+    """
+    Helper function to list the scores of one X character against every
+    character of sequence_y, so the row loops avoid dict lookups
+    """
+    scores = scoring_matrix[row_char]
+    return [scores[col_char] for col_char in sequence_y]
+#
+def advance_global_rows(sequence_x, sequence_y, scoring_matrix, row, row_start, row_end):
+    """
+    Helper function to step a row of the global alignment matrix down
+
+    Args:
+        sequence_x (str): X sequence
+        sequence_y (str): Y sequence
+        scoring_matrix (dict of dicts): scoring matrix
+        row (list): row row_start of the matrix over columns 0..len(row)-1
+        row_start (int): index of the given row
+        row_end (int): index of the row wanted
+    Returns:
+        (list): row row_end over the same columns
+    """
+    sequence_y = sequence_y[:len(row) - 1]
+    gap_y = score_profile(sequence_y, scoring_matrix, '-')
+    profiles = {}
+    #
+    for idx_i in range(row_start + 1, row_end + 1):
+        row_char = sequence_x[idx_i - 1]
+        if row_char not in profiles:
+            profiles[row_char] = score_profile(sequence_y, scoring_matrix, row_char)
+        gap_x = scoring_matrix[row_char]['-']
+        # diag, up and left moves into each cell, as in compute_alignment_matrix
+        diag = row[0]
+        left = diag + gap_x
+        new_row = [left]
+        for (up, match, gap) in zip(row[1:], profiles[row_char], gap_y):
+            score = diag + match
+            if up + gap_x > score:
+                score = up + gap_x
+            if left + gap > score:
+                score = left + gap
+            new_row.append(score)
+            diag = up
+            left = score
+        row = new_row
+    #
+    return row
+#
+def _walk_block(sequence_x, sequence_y, scoring_matrix, row_top, row_start, row_end, col_end, pairs):
+    """
+    Fill in rows row_start..row_end of the matrix and walk the traceback of
+    compute_global_alignment from (row_end, col_end) until it reaches row
+    row_start, appending the aligned (x, y) character pairs in reverse
+
+    Returns:
+        (int): column where the walk reached row row_start
+    """
+    block = [row_top[:col_end + 1]]
+    for idx_i in range(row_start + 1, row_end + 1):
+        block.append(advance_global_rows(sequence_x, sequence_y, scoring_matrix, block[-1], idx_i - 1, idx_i))
+    #
+    idx_i = row_end
+    idx_j = col_end
+    while idx_i > row_start:
+        row_char = sequence_x[idx_i - 1]
+        here = block[idx_i - row_start][idx_j]
+        above = block[idx_i - row_start - 1]
+        if idx_j == 0:
+            # the remainder of X goes against dashes
+            pairs.append((row_char, '-'))
+            idx_i -= 1
+            continue
+        col_char = sequence_y[idx_j - 1]
+        # same order of checks as compute_global_alignment
+        if here == above[idx_j - 1] + scoring_matrix[row_char][col_char]:
+            pairs.append((row_char, col_char))
+            idx_i -= 1
+            idx_j -= 1
+        elif here == above[idx_j] + scoring_matrix[row_char]['-']:
+            pairs.append((row_char, '-'))
+            idx_i -= 1
+        else:
+            pairs.append(('-', col_char))
+            idx_j -= 1
+    #
+    return idx_j
+#
+def _crossing_column(sequence_x, sequence_y, scoring_matrix, row_mid):
+    """
+    Helper function to find the column where the traceback of
+    compute_global_alignment first reaches row row_mid
+
+    The rows below row_mid are filled in as usual, and every cell also
+    carries the column where the traceback from that cell reaches row_mid,
+    copied from the cell its traceback move leads to.  The move only needs
+    the cell's three neighbours, so no rows are kept.
+
+    Returns:
+        (int): column carried by the bottom right cell
+    """
+    row = advance_global_rows(sequence_x, sequence_y, scoring_matrix,
+                              global_first_row(sequence_y, scoring_matrix), 0, row_mid)
+    cols = list(range(len(row)))
+    gap_y = score_profile(sequence_y, scoring_matrix, '-')
+    profiles = {}
+    #
+    for idx_i in range(row_mid + 1, len(sequence_x) + 1):
+        row_char = sequence_x[idx_i - 1]
+        if row_char not in profiles:
+            profiles[row_char] = score_profile(sequence_y, scoring_matrix, row_char)
+        gap_x = scoring_matrix[row_char]['-']
+        diag = row[0]
+        diag_col = cols[0]
+        left = diag + gap_x
+        left_col = diag_col
+        new_row = [left]
+        new_cols = [left_col]
+        for (up, up_col, match, gap) in zip(row[1:], cols[1:], profiles[row_char], gap_y):
+            # ties go diag, then up, then left, as in compute_global_alignment
+            score = diag + match
+            col = diag_col
+            if up + gap_x > score:
+                score = up + gap_x
+                col = up_col
+            if left + gap > score:
+                score = left + gap
+                col = left_col
+            new_row.append(score)
+            new_cols.append(col)
+            diag = up
+            diag_col = up_col
+            left = score
+            left_col = col
+        row = new_row
+        cols = new_cols
+    #
+    return cols[-1]
+#
+def _hirschberg(sequence_x, sequence_y, scoring_matrix, pairs):
+    """
+    Split the alignment at the middle row of X where the traceback crosses
+    it, align the bottom half and then the top half, appending the aligned
+    (x, y) character pairs in reverse
+    """
+    if len(sequence_x) * (len(sequence_y) + 1) <= BLOCK_CELLS or len(sequence_x) <= 1:
+        col = _walk_block(sequence_x, sequence_y, scoring_matrix, global_first_row(sequence_y, scoring_matrix),
+                          0, len(sequence_x), len(sequence_y), pairs)
+        # copy the remainder of Y
+        while col > 0:
+            pairs.append(('-', sequence_y[col - 1]))
+            col -= 1
+        return
+    #
+    row_mid = len(sequence_x) // 2
+    col_mid = _crossing_column(sequence_x, sequence_y, scoring_matrix, row_mid)
+    _hirschberg(sequence_x[row_mid:], sequence_y[col_mid:], scoring_matrix, pairs)
+    _hirschberg(sequence_x[:row_mid], sequence_y[:col_mid], scoring_matrix, pairs)
+
+##################################################################
+#   Alignment functions
+#
+def compute_global_alignment_linear(sequence_x, sequence_y, scoring_matrix):
+    """
+    Function to compute a global pairwise alignment without the full
+    alignment matrix
+
+    Hirschberg's divide and conquer: one pass over the matrix finds the
+    column where the traceback of compute_global_alignment crosses the
+    middle row of X, which splits the problem into two independent
+    alignments of the halves.  The split follows that traceback, so every
+    cell makes the same choice and the alignment is the same, while the
+    passes hold two rows of len(Y) + 1 scores and columns, plus blocks of
+    at most BLOCK_CELLS cells once a sub-problem is small.  The halves
+    shrink the work geometrically, so it takes about twice the time of
+    filling the full matrix.
+
+    Args:
+        sequence_x (string): X sequence
+        sequence_y (string): Y sequence
+        scoring_matrix (dict of dicts): scoring matrix for alignment evaluation
+    Returns:
+        (score, align_x, align_y): global pairwise alignment of sequences X and Y
+    """
+    pairs = []
+    _hirschberg(sequence_x, sequence_y, scoring_matrix, pairs)
+    pairs.reverse()
+    #
+    align_x = ''.join([pair[0] for pair in pairs])
+    align_y = ''.join([pair[1] for pair in pairs])
+    score = 0
+    for pair in pairs:
+        score += scoring_matrix[pair[0]][pair[1]]
+    #
+    return (score, align_x, align_y)
+#
+def compute_alignment_score(sequence_x, sequence_y, scoring_matrix, global_flag):
+    """
+    Function to compute only the score of a global or local alignment,
+    keeping two rows of the alignment matrix and the running maximum
+
+    The global score is the bottom right entry of compute_alignment_matrix.
+    The local score is its largest entry, which is the score
+    compute_local_alignment returns whenever the dash scores are not
+    positive (as in PAM50), since its traceback then ends on a 0 entry.
+
+    Args:
+        sequence_x (string): X sequence
+        sequence_y (string): Y sequence
+        scoring_matrix (dict of dicts): scoring matrix for alignment evaluation
+        global_flag (bool): True: global score False: local score
+    Returns:
+        (int): alignment score
+    """
+    if global_flag:
+        row = global_first_row(sequence_y, scoring_matrix)
+        return advance_global_rows(sequence_x, sequence_y, scoring_matrix, row, 0, len(sequence_x))[-1]
+    #
+    gap_y = score_profile(sequence_y, scoring_matrix, '-')
+    row = [0]
+    for gap in gap_y:
+        row.append(max(row[-1] + gap, 0))
+    best = max(row)
+    profiles = {}
+    #
+    for row_char in sequence_x:
+        if row_char not in profiles:
+            profiles[row_char] = score_profile(sequence_y, scoring_matrix, row_char)
+        gap_x = scoring_matrix[row_char]['-']
+        diag = row[0]
+        left = max(diag + gap_x, 0)
+        best = max(best, left)
+        new_row = [left]
+        for (up, match, gap) in zip(row[1:], profiles[row_char], gap_y):
+            score = diag + match
+            if up + gap_x > score:
+                score = up + gap_x
+            if left + gap > score:
+                score = left + gap
+            if score < 0:
+                score = 0
+            elif score > best:
+                best = score
+            new_row.append(score)
+            diag = up
+            left = score
+        row = new_row
+    #
+    return best
+
+##################################################################
+#   Integer-encoded alignment
+#
+def dense_scoring_matrix(scoring_matrix, include_dash = True):
+    """
+    Function to turn a dict of dicts scoring matrix into a dense table
+
+    Args:
+        scoring_matrix (dict of dicts): scoring matrix, including '-' when
+            include_dash is set
+        include_dash (bool): give '-' a code; False for the affine engine,
+            which only scores residue pairs
+    Returns:
+        (char_index, score_table): dict from character to code and an int64
+            table indexed by codes; '-', when included, gets the last code
+    """
+    chars = sorted([char for char in scoring_matrix if char != '-'])
+    if include_dash:
+        chars.append('-')
+    char_index = {}
+    for code in range(len(chars)):
+        char_index[chars[code]] = code
+    #
+    score_table = np.zeros((len(chars), len(chars)), dtype=np.int64)
+    for row_char in chars:
+        for col_char in chars:
+            score_table[char_index[row_char], char_index[col_char]] = scoring_matrix[row_char][col_char]
+    #
+    return (char_index, score_table)
+#
+def encode_sequence(sequence, char_index):
+    """
+    Function to encode a sequence as an array of character codes
+    """
+    return np.array([char_index[char] for char in sequence], dtype=np.intp)
+#
+def iter_encoded_rows(codes_x, codes_y, score_table, global_flag):
+    """
+    Generator for the rows of the global or local alignment matrix of two
+    encoded sequences, each equal to the matching row of
+    compute_alignment_matrix
+
+    A row takes the diagonal and up moves for all its cells at once; the
+    left moves chain along the row, which is a running maximum: with G the
+    prefix sums of the left move scores, cell j is
+    G[j] + max over k <= j of (best diagonal/up score at k - G[k]).
+
+    Args:
+        codes_x, codes_y (array): encoded sequences
+        score_table (array): dense table from dense_scoring_matrix
+        global_flag (bool): True: global False: local
+    Yields:
+        (array): int64 rows 0..len(codes_x), each len(codes_y) + 1 long
+    """
+    gap_prefix = np.zeros(len(codes_y) + 1, dtype=np.int64)
+    np.cumsum(score_table[-1, codes_y], out=gap_prefix[1:])
+    # score of every X code against every Y position
+    profiles = score_table[:, codes_y]
+    return iter_profile_rows(codes_x, profiles, gap_prefix, score_table[:, -1], global_flag)
+#
+def iter_profile_rows(codes_x, profiles, gap_prefix, gap_x_scores, global_flag):
+    """
+    Generator for the rows of iter_encoded_rows from a precomputed Y profile
+
+    Args:
+        codes_x (array): encoded X sequence
+        profiles (array): score of every code against every Y position
+        gap_prefix (array): 0 followed by the prefix sums of the Y left move scores
+        gap_x_scores (array): up move score of every code
+        global_flag (bool): True: global False: local
+    Yields:
+        (array): int64 rows 0..len(codes_x)
+    """
+    num_cols = len(gap_prefix)
+    best = np.zeros(num_cols, dtype=np.int64)
+    if not global_flag:
+        np.maximum.accumulate(best - gap_prefix, out=best)
+    row = best + gap_prefix
+    yield row
+    #
+    for code in codes_x:
+        gap_x = gap_x_scores[code]
+        best = np.empty(num_cols, dtype=np.int64)
+        best[0] = row[0] + gap_x
+        np.maximum(row[:-1] + profiles[code], row[1:] + gap_x, out=best[1:])
+        if not global_flag:
+            np.maximum(best, 0, out=best)
+        best -= gap_prefix
+        np.maximum.accumulate(best, out=best)
+        row = best + gap_prefix
+        yield row
+#
+def encoded_alignment_score(codes_x, codes_y, score_table, global_flag):
+    """
+    Function to compute a global or local alignment score of two encoded
+    sequences, as compute_alignment_score does, one vectorized row at a time
+    """
+    return rows_alignment_score(iter_encoded_rows(codes_x, codes_y, score_table, global_flag), global_flag)
+#
+def rows_alignment_score(rows, global_flag):
+    """
+    Helper function to read the alignment score off a generator of rows:
+    the last entry for global alignments, the largest entry for local ones
+    """
+    if global_flag:
+        for row in rows:
+            pass
+        return int(row[-1])
+    #
+    best = 0
+    for row in rows:
+        best = max(best, int(row.max()))
+    return best
+#
+def compute_alignment_matrix_numpy(seq_x, seq_y, scoring_matrix, global_flag):
+    """
+    Function to compute either a local or global alignment matrix for 2
+    given sequences with vectorized rows; same arguments and result (a list
+    of lists of ints) as compute_alignment_matrix, so it can be handed to
+    compute_global_alignment and compute_local_alignment
+
+    Args:
+        seq_x (string): sequence X
+        seq_y (string): sequence Y
+        scoring_matrix (dict of dicts): scoring matrix for alignment evaluation
+        global_flag (bool): True: compute global False: compute local
+    Return:
+        dp_table (matrix): global/local alignment matrix
+    """
+    (char_index, score_table) = dense_scoring_matrix(scoring_matrix)
+    rows = iter_encoded_rows(encode_sequence(seq_x, char_index), encode_sequence(seq_y, char_index),
+                             score_table, global_flag)
+    return np.vstack(list(rows)).tolist()
+#
+def compute_alignment_score_numpy(seq_x, seq_y, scoring_matrix, global_flag):
+    """
+    Function to compute only the score of a global or local alignment with
+    vectorized rows; same result as compute_alignment_score
+    """
+    (char_index, score_table) = dense_scoring_matrix(scoring_matrix)
+    return encoded_alignment_score(encode_sequence(seq_x, char_index), encode_sequence(seq_y, char_index),
+                                   score_table, global_flag)
+
+##################################################################
+#   Direction byte traceback
+#
+#   compute_global_alignment and compute_local_alignment re-derive every
+#   step from the int table and prepend to strings, which is quadratic in
+#   the alignment length.  Here the DP keeps one uint8 move per cell, a
+#   quarter of the memory of even an int32 table, and the traceback only
+#   reads moves and appends to lists reversed at the end.
+#
+def compute_alignment_directions(seq_x, seq_y, scoring_matrix, global_flag):
+    """
+    Function to compute the traceback move of every cell of the global or
+    local alignment matrix, with the tie-breaks of compute_global_alignment
+    and compute_local_alignment: diagonal, then up, then left
+
+    Args:
+        seq_x (string): sequence X
+        seq_y (string): sequence Y
+        scoring_matrix (dict of dicts): scoring matrix for alignment evaluation
+        global_flag (bool): True: compute global False: compute local
+    Returns:
+        (directions, score, row, col): uint8 array whose entry [i - 1, j - 1]
+            is the DIR_* move out of cell (i, j), DIR_STOP for the zero cells
+            of a local matrix; the alignment score and the cell the
+            traceback starts from
+    """
+    (char_index, score_table) = dense_scoring_matrix(scoring_matrix)
+    codes_x = encode_sequence(seq_x, char_index)
+    codes_y = encode_sequence(seq_y, char_index)
+    profiles = score_table[:, codes_y]
+    directions = np.empty((len(codes_x), len(codes_y)), dtype=np.uint8)
+    #
+    rows = iter_encoded_rows(codes_x, codes_y, score_table, global_flag)
+    prev = next(rows)
+    # the local traceback starts at the first largest entry in row order
+    (score, end_row, end_col) = (0, 0, 0)
+    for (idx, row) in enumerate(rows):
+        code = codes_x[idx]
+        cells = row[1:]
+        moves = directions[idx]
+        moves[:] = DIR_LEFT
+        moves[cells == prev[1:] + score_table[code, -1]] = DIR_UP
+        moves[cells == prev[:-1] + profiles[code]] = DIR_DIAG
+        if not global_flag:
+            moves[cells == 0] = DIR_STOP
+            if row.max() > score:
+                (score, end_row, end_col) = (int(row.max()), idx + 1, int(np.argmax(row)))
+        prev = row
+    #
+    if global_flag:
+        (score, end_row, end_col) = (int(prev[-1]), len(codes_x), len(codes_y))
+    return (directions, score, end_row, end_col)
+#
+def traceback_directions(seq_x, seq_y, directions, row, col, global_flag):
+    """
+    Function to follow the moves of compute_alignment_directions from
+    (row, col) back to the edge of the matrix (or a zero cell for local
+    alignments), in time linear in the alignment length
+
+    Returns:
+        (align_x, align_y): the aligned sequences
+    """
+    moves = memoryview(directions) if directions.size > 0 else None
+    align_x = []
+    align_y = []
+    while row > 0 and col > 0:
+        move = moves[row - 1, col - 1]
+        if move == DIR_STOP:
+            break
+        if move == DIR_DIAG:
+            align_x.append(seq_x[row - 1])
+            align_y.append(seq_y[col - 1])
+            row -= 1
+            col -= 1
+        elif move == DIR_UP:
+            align_x.append(seq_x[row - 1])
+            align_y.append('-')
+            row -= 1
+        else:
+            align_x.append('-')
+            align_y.append(seq_y[col - 1])
+            col -= 1
+    # a global alignment also takes the rest of the longer sequence
+    if global_flag:
+        align_x.extend(reversed(seq_x[:row]))
+        align_y.extend('-' * row)
+        align_x.extend('-' * col)
+        align_y.extend(reversed(seq_y[:col]))
+    #
+    align_x.reverse()
+    align_y.reverse()
+    return (''.join(align_x), ''.join(align_y))
+#
+def compute_compact_alignment(seq_x, seq_y, scoring_matrix, global_flag):
+    """
+    Function to compute a global or local alignment through direction bytes;
+    same result as compute_global_alignment / compute_local_alignment on
+    compute_alignment_matrix, with len(x) * len(y) bytes of table
+
+    Returns:
+        (score, align_x, align_y): pairwise alignment of sequences X and Y
+    """
+    (directions, score, row, col) = compute_alignment_directions(seq_x, seq_y, scoring_matrix, global_flag)
+    (align_x, align_y) = traceback_directions(seq_x, seq_y, directions, row, col, global_flag)
+    return (score, align_x, align_y)
+
+##################################################################
+#   Parallel null distribution
+#
+def _init_null_worker(codes_x, codes_y, score_table):
+    """
+    Pool initializer: keep the encoded sequences for every block this worker runs
+    """
+    _NULL_SHARED['encoded'] = (codes_x, codes_y, score_table)
+#
+def _null_block(task):
+    """
+    Score one block of shuffles of Y against X with the block's own random stream
+    """
+    (num_trials, seed_seq) = task
+    (codes_x, codes_y, score_table) = _NULL_SHARED['encoded']
+    rng = np.random.default_rng(seed_seq)
+    #
+    score_dist = {}
+    for _ in range(num_trials):
+        score = encoded_alignment_score(codes_x, rng.permutation(codes_y), score_table, False)
+        score_dist[score] = score_dist.get(score, 0) + 1
+    return score_dist
+#
+def parallel_null_distribution(seq_x, seq_y, scoring_matrix, num_trials, seed = 0, max_workers = None):
+    """
+    Function to build the null distribution of generate_null_distribution
+    (local scores of X against random shuffles of Y) across a process pool
+
+    The trials are cut into blocks of NULL_BLOCK_TRIALS, each with its own
+    child of numpy SeedSequence(seed), so a given seed gives the same
+    distribution whatever max_workers is.  The shuffles come from numpy
+    rather than the random module, so they differ from those of
+    generate_null_distribution for the same seed.
+
+    Note: on platforms that spawn worker processes (macOS, Windows) call it
+    from under an  if __name__ == '__main__':  guard.
+
+    Args:
+        seq_x (str): genome sequence
+        seq_y (str): genome sequence, shuffled for every trial
+        scoring_matrix (dict of dicts): scoring matrix
+        num_trials (int): number of trials to run
+        seed (int): master seed
+        max_workers (int): pool size; None for one per core, 1 to run in-process
+    Return:
+        score_dist (dict): scoring distribution
+    """
+    (char_index, score_table) = dense_scoring_matrix(scoring_matrix)
+    codes_x = encode_sequence(seq_x, char_index)
+    codes_y = encode_sequence(seq_y, char_index)
+    #
+    block_trials = [NULL_BLOCK_TRIALS] * (num_trials // NULL_BLOCK_TRIALS)
+    if num_trials % NULL_BLOCK_TRIALS > 0:
+        block_trials.append(num_trials % NULL_BLOCK_TRIALS)
+    tasks = list(zip(block_trials, np.random.SeedSequence(seed).spawn(len(block_trials))))
+    #
+    if max_workers == 1:
+        _init_null_worker(codes_x, codes_y, score_table)
+        block_dists = [_null_block(task) for task in tasks]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers, initializer=_init_null_worker,
+                                                    initargs=(codes_x, codes_y, score_table)) as executor:
+            block_dists = list(executor.map(_null_block, tasks))
+    # merge the block histograms
+    score_dist = {}
+    for block_dist in block_dists:
+        for score in block_dist:
+            score_dist[score] = score_dist.get(score, 0) + block_dist[score]
+    #
+    return score_dist
+
+##################################################################
+#   Affine gap alignment (Gotoh)
+#
+#   A gap of length L scores gap_open + (L - 1) * gap_extend (both usually
+#   negative); pairs of residues score as in scoring_matrix, whose '-'
+#   entries are not used.  Three tables track the best score of a prefix
+#   alignment ending in a residue pair (match), in X against a dash
+#   (x_gap, an up move) or in a dash against Y (y_gap, a left move).
+#   Only the current row of each is kept; the traceback reads one byte of
+#   AFFINE_* states per cell, as the direction byte traceback does.
+#
+def compute_affine_alignment_directions(seq_x, seq_y, scoring_matrix, gap_open, gap_extend, global_flag):
+    """
+    Function to run the Gotoh recurrences for 2 given sequences, keeping
+    one row of each of the three matrices and one traceback byte per cell
+
+    The byte of cell (i, j) holds the state each state's traceback goes to
+    from there: bits 0-1 for the match state (AFFINE_STOP where a local
+    alignment starts), bits 2-3 for x_gap and bits 4-5 for y_gap.  Ties go
+    to the match state, then to staying in the same gap, then to the
+    other gap.
+
+    Args:
+        seq_x (string): sequence X
+        seq_y (string): sequence Y
+        scoring_matrix (dict of dicts): residue scoring matrix
+        gap_open (int): score of the first position of a gap
+        gap_extend (int): score of every further position of a gap
+        global_flag (bool): True: compute global False: compute local
+    Return:
+        (codes, score, row, col, state): uint8 array of
+            (len(X) + 1) x (len(Y) + 1) traceback bytes, the alignment
+            score and the cell and state the traceback starts from
+    """
+    num_cols = len(seq_y) + 1
+    start = AFFINE_NEG_INF if global_flag else 0
+    codes = bytearray((len(seq_x) + 1) * num_cols)
+    #
+    match_row = [start] * num_cols
+    match_row[0] = 0
+    x_gap_row = [AFFINE_NEG_INF] * num_cols
+    y_gap_row = [AFFINE_NEG_INF] * num_cols
+    for idx_j in range(1, num_cols):
+        (y_gap_row[idx_j], y_state) = _affine_gap(match_row[idx_j - 1], y_gap_row[idx_j - 1], x_gap_row[idx_j - 1],
+                                                  gap_open, gap_extend, AFFINE_Y_GAP, AFFINE_X_GAP)
+        codes[idx_j] = y_state << 4
+    # the local traceback starts at the first highest match entry in row order
+    (score, end_row, end_col) = (0, 0, 0)
+    #
+    for idx_i in range(1, len(seq_x) + 1):
+        scores = scoring_matrix[seq_x[idx_i - 1]]
+        offset = idx_i * num_cols
+        new_match = [start] * num_cols
+        new_x_gap = [AFFINE_NEG_INF] * num_cols
+        new_y_gap = [AFFINE_NEG_INF] * num_cols
+        (new_x_gap[0], x_state) = _affine_gap(match_row[0], x_gap_row[0], y_gap_row[0],
+                                              gap_open, gap_extend, AFFINE_X_GAP, AFFINE_Y_GAP)
+        codes[offset] = AFFINE_STOP | x_state << 2
+        for idx_j in range(1, num_cols):
+            # match: best state of the diagonal cell, same order of preference
+            best = match_row[idx_j - 1]
+            code = AFFINE_MATCH
+            if x_gap_row[idx_j - 1] > best:
+                best = x_gap_row[idx_j - 1]
+                code = AFFINE_X_GAP
+            if y_gap_row[idx_j - 1] > best:
+                best = y_gap_row[idx_j - 1]
+                code = AFFINE_Y_GAP
+            if not global_flag and best <= 0:
+                best = 0
+                code = AFFINE_STOP
+            value = best + scores[seq_y[idx_j - 1]]
+            new_match[idx_j] = value
+            if not global_flag and value > score:
+                (score, end_row, end_col) = (value, idx_i, idx_j)
+            (new_x_gap[idx_j], x_state) = _affine_gap(match_row[idx_j], x_gap_row[idx_j], y_gap_row[idx_j],
+                                                      gap_open, gap_extend, AFFINE_X_GAP, AFFINE_Y_GAP)
+            (new_y_gap[idx_j], y_state) = _affine_gap(new_match[idx_j - 1], new_y_gap[idx_j - 1], new_x_gap[idx_j - 1],
+                                                      gap_open, gap_extend, AFFINE_Y_GAP, AFFINE_X_GAP)
+            codes[offset + idx_j] = code | x_state << 2 | y_state << 4
+        (match_row, x_gap_row, y_gap_row) = (new_match, new_x_gap, new_y_gap)
+    #
+    if global_flag:
+        finals = [match_row[-1], x_gap_row[-1], y_gap_row[-1]]
+        (score, end_row, end_col) = (max(finals), len(seq_x), len(seq_y))
+        end_state = finals.index(score)
+    else:
+        end_state = AFFINE_MATCH
+    codes = np.frombuffer(codes, dtype=np.uint8).reshape(len(seq_x) + 1, num_cols)
+    return (codes, score, end_row, end_col, end_state)
+#
+def _affine_gap(match, same_gap, other_gap, gap_open, gap_extend, same_state, other_state):
+    """
+    Helper function to score a gap state from the previous cell's states
+
+    Returns:
+        (score, state): best of opening the gap after a match, extending it
+            and switching from the other gap, and the state it came from
+    """
+    score = match + gap_open
+    state = AFFINE_MATCH
+    if same_gap + gap_extend > score:
+        score = same_gap + gap_extend
+        state = same_state
+    if other_gap + gap_open > score:
+        score = other_gap + gap_open
+        state = other_state
+    return (score, state)
+#
+def _affine_traceback(seq_x, seq_y, codes, row, col, state):
+    """
+    Helper function to follow the traceback bytes of
+    compute_affine_alignment_directions from (row, col) in a given state
+    back to the start of the alignment
+
+    Returns:
+        (align_x, align_y): the aligned strings
+    """
+    moves = memoryview(codes)
+    align_x = []
+    align_y = []
+    #
+    while row > 0 or col > 0:
+        code = moves[row, col]
+        if state == AFFINE_MATCH:
+            align_x.append(seq_x[row - 1])
+            align_y.append(seq_y[col - 1])
+            state = code & 3
+            row -= 1
+            col -= 1
+            if state == AFFINE_STOP:
+                break
+        elif state == AFFINE_X_GAP:
+            align_x.append(seq_x[row - 1])
+            align_y.append('-')
+            state = (code >> 2) & 3
+            row -= 1
+        else:
+            align_x.append('-')
+            align_y.append(seq_y[col - 1])
+            state = (code >> 4) & 3
+            col -= 1
+        if state == AFFINE_MATCH and row == 0 and col == 0:
+            break
+    #
+    align_x.reverse()
+    align_y.reverse()
+    return (''.join(align_x), ''.join(align_y))
+#
+def compute_affine_global_alignment(seq_x, seq_y, directions):
+    """
+    Function to compute and return a global pairwise alignment with affine gaps
+
+    Args:
+        seq_x (string): X sequence
+        seq_y (string): Y sequence
+        directions (tuple): global result of compute_affine_alignment_directions
+    Returns:
+        (score, align_x, align_y): global pairwise alignment of sequences X and Y
+    """
+    (codes, score, row, col, state) = directions
+    (align_x, align_y) = _affine_traceback(seq_x, seq_y, codes, row, col, state)
+    return (score, align_x, align_y)
+#
+def compute_affine_local_alignment(seq_x, seq_y, directions):
+    """
+    Function to compute and return a local pairwise alignment with affine gaps
+
+    The alignment ends at the first highest entry of the match matrix (row
+    by row) and is walked back until its score before a residue pair is 0.
+
+    Args:
+        seq_x (string): X sequence
+        seq_y (string): Y sequence
+        directions (tuple): local result of compute_affine_alignment_directions
+    Returns:
+        (score, align_x, align_y): local pairwise alignment of sequences X and Y
+    """
+    (codes, score, row, col, state) = directions
+    if score == 0:
+        return (0, '', '')
+    (align_x, align_y) = _affine_traceback(seq_x, seq_y, codes, row, col, state)
+    return (score, align_x, align_y)
+#
+def affine_alignment_score(align_x, align_y, scoring_matrix, gap_open, gap_extend):
+    """
+    Function to score a given pairwise alignment with affine gaps
+
+    Args:
+        align_x, align_y (string): aligned sequences of equal length
+    Returns:
+        (int): sum of the residue pair scores and gap scores
+    """
+    score = 0
+    for idx in range(len(align_x)):
+        if align_x[idx] == '-':
+            score += gap_extend if idx > 0 and align_x[idx - 1] == '-' else gap_open
+        elif align_y[idx] == '-':
+            score += gap_extend if idx > 0 and align_y[idx - 1] == '-' else gap_open
+        else:
+            score += scoring_matrix[align_x[idx]][align_y[idx]]
+    return score
+#
+def compute_affine_alignment_score(seq_x, seq_y, scoring_matrix, gap_open, gap_extend, global_flag):
+    """
+    Function to compute only the score of a global or local affine gap
+    alignment, with three vectorized rows in O(len(Y)) memory
+
+    The y_gap row chains along the row like the left moves in
+    iter_encoded_rows: with A[k] = max(match[k], x_gap[k]) + gap_open,
+    y_gap[j] = (j - 1) * gap_extend + max over k < j of (A[k] - k * gap_extend).
+
+    Args:
+        seq_x (string): X sequence
+        seq_y (string): Y sequence
+        scoring_matrix (dict of dicts): residue scoring matrix
+        gap_open (int): score of the first position of a gap
+        gap_extend (int): score of every further position of a gap
+        global_flag (bool): True: global score False: local score
+    Returns:
+        (int): the score compute_affine_global_alignment or
+            compute_affine_local_alignment returns
+    """
+    (char_index, score_table) = dense_scoring_matrix(scoring_matrix, include_dash=False)
+    codes_y = encode_sequence(seq_y, char_index)
+    profiles = score_table[:, codes_y]
+    num_cols = len(seq_y) + 1
+    steps = np.arange(num_cols - 1, dtype=np.int64) * gap_extend
+    #
+    match_row = np.full(num_cols, AFFINE_NEG_INF if global_flag else 0, dtype=np.int64)
+    match_row[0] = 0
+    x_gap_row = np.full(num_cols, AFFINE_NEG_INF, dtype=np.int64)
+    y_gap_row = np.full(num_cols, AFFINE_NEG_INF, dtype=np.int64)
+    y_gap_row[1:] = steps + np.maximum.accumulate(np.maximum(match_row, x_gap_row)[:-1] + gap_open - steps)
+    best = 0
+    #
+    for char in seq_x:
+        prev_best = np.maximum(np.maximum(match_row, x_gap_row), y_gap_row)
+        new_match = np.full(num_cols, AFFINE_NEG_INF if global_flag else 0, dtype=np.int64)
+        if global_flag:
+            new_match[1:] = prev_best[:-1] + profiles[char_index[char]]
+        else:
+            new_match[1:] = np.maximum(prev_best[:-1], 0) + profiles[char_index[char]]
+            best = max(best, int(new_match.max()))
+        x_gap_row = np.maximum(np.maximum(match_row, y_gap_row) + gap_open, x_gap_row + gap_extend)
+        match_row = new_match
+        y_gap_row = np.full(num_cols, AFFINE_NEG_INF, dtype=np.int64)
+        y_gap_row[1:] = steps + np.maximum.accumulate(np.maximum(match_row, x_gap_row)[:-1] + gap_open - steps)
+    #
+    if global_flag:
+        return int(max(match_row[-1], x_gap_row[-1], y_gap_row[-1]))
+    return best
+
+##################################################################
+#   Banded global alignment
+#
+def compute_banded_alignment_matrix(seq_x, seq_y, scoring_matrix, diag_low, diag_high):
+    """
+    Function to compute the global alignment matrix only on the cells whose
+    diagonal j - i lies in [diag_low, diag_high]
+
+    The band must hold both (0, 0) and (len(X), len(Y)), i.e.
+    diag_low <= min(0, len(Y) - len(X)) and diag_high >= max(0, len(Y) - len(X)).
+
+    Args:
+        seq_x (string): sequence X
+        seq_y (string): sequence Y
+        scoring_matrix (dict of dicts): scoring matrix for alignment evaluation
+        diag_low (int): lowest diagonal in the band
+        diag_high (int): highest diagonal in the band
+    Return:
+        (band_rows, row_starts): row i holds the entries of columns
+            row_starts[i] .. row_starts[i] + len(band_rows[i]) - 1
+    """
+    neg_inf = float('-inf')
+    band_rows = []
+    row_starts = []
+    for idx_i in range(len(seq_x) + 1):
+        col_start = max(0, idx_i + diag_low)
+        col_end = min(len(seq_y), idx_i + diag_high)
+        row = []
+        if idx_i > 0:
+            prev = band_rows[idx_i - 1]
+            prev_start = row_starts[idx_i - 1]
+            scores = scoring_matrix[seq_x[idx_i - 1]]
+            gap_x = scores['-']
+        for idx_j in range(col_start, col_end + 1):
+            if idx_i == 0:
+                value = 0 if idx_j == 0 else row[-1] + scoring_matrix['-'][seq_y[idx_j - 1]]
+            else:
+                # entries outside the band count as -inf
+                up_idx = idx_j - prev_start
+                value = prev[up_idx] + gap_x if up_idx < len(prev) else neg_inf
+                if idx_j > 0:
+                    if up_idx - 1 >= 0:
+                        value = max(value, prev[up_idx - 1] + scores[seq_y[idx_j - 1]])
+                    if idx_j > col_start:
+                        value = max(value, row[-1] + scoring_matrix['-'][seq_y[idx_j - 1]])
+            row.append(value)
+        band_rows.append(row)
+        row_starts.append(col_start)
+    #
+    return (band_rows, row_starts)
+#
+def compute_banded_alignment(seq_x, seq_y, scoring_matrix, band_width = 8):
+    """
+    Function to compute a global pairwise alignment of similar sequences
+    filling only a band of diagonals around the main one
+
+    The band covers the diagonals from min(0, len(Y) - len(X)) - band_width
+    to max(0, len(Y) - len(X)) + band_width.  When the traceback touches an
+    edge of the band the best path may have been cut off by it, so the band
+    width is doubled and the alignment redone, until the path stays clear of
+    the edges or the band covers the whole matrix.  Time and memory are
+    O(band_width * len(X)) for the final band.  The result is the best
+    alignment inside that band; like any banding rule, a better path
+    that lies entirely outside the band without ever approaching its edge is
+    not looked for.
+
+    Args:
+        seq_x (string): X sequence
+        seq_y (string): Y sequence
+        scoring_matrix (dict of dicts): scoring matrix for alignment evaluation
+        band_width (int): initial number of extra diagonals on each side
+    Returns:
+        (score, align_x, align_y): global pairwise alignment of sequences X and Y
+    """
+    len_x = len(seq_x)
+    len_y = len(seq_y)
+    band_width = max(band_width, 1)
+    while True:
+        diag_low = min(0, len_y - len_x) - band_width
+        diag_high = max(0, len_y - len_x) + band_width
+        (band_rows, row_starts) = compute_banded_alignment_matrix(seq_x, seq_y, scoring_matrix,
+                                                                  diag_low, diag_high)
+        # an edge only matters where the matrix goes on past it
+        low_edge = diag_low if diag_low > -len_x else None
+        high_edge = diag_high if diag_high < len_y else None
+        #
+        pairs = []
+        touched = False
+        idx_i = len_x
+        idx_j = len_y
+        while idx_i > 0 or idx_j > 0:
+            if idx_j - idx_i in (low_edge, high_edge):
+                touched = True
+                break
+            here = band_rows[idx_i][idx_j - row_starts[idx_i]]
+            if idx_i > 0:
+                above = band_rows[idx_i - 1]
+                above_start = row_starts[idx_i - 1]
+            # same order of checks as compute_global_alignment
+            if (idx_i > 0 and idx_j > 0 and idx_j - 1 >= above_start and
+                    here == above[idx_j - 1 - above_start] + scoring_matrix[seq_x[idx_i - 1]][seq_y[idx_j - 1]]):
+                pairs.append((seq_x[idx_i - 1], seq_y[idx_j - 1]))
+                idx_i -= 1
+                idx_j -= 1
+            elif (idx_i > 0 and idx_j - above_start < len(above) and
+                  here == above[idx_j - above_start] + scoring_matrix[seq_x[idx_i - 1]]['-']):
+                pairs.append((seq_x[idx_i - 1], '-'))
+                idx_i -= 1
+            else:
+                pairs.append(('-', seq_y[idx_j - 1]))
+                idx_j -= 1
+        #
+        if not touched:
+            break
+        band_width *= 2
+    #
+    pairs.reverse()
+    align_x = ''.join([pair[0] for pair in pairs])
+    align_y = ''.join([pair[1] for pair in pairs])
+    return (band_rows[len_x][len_y - row_starts[len_x]], align_x, align_y)
+
+##################################################################
+#   One query against many sequences
+#
+class QueryProfile:
+    """
+    Class for a query sequence prepared once for aligning against many others
+    """
+
+    def __init__(self, query, scoring_matrix):
+        """
+        Encode the query and build its profile: the score of every alphabet
+        letter against every query position
+
+        Args:
+            query (str): query sequence
+            scoring_matrix (dict of dicts): scoring matrix
+        """
+        self._query = query
+        (self._char_index, self._score_table) = dense_scoring_matrix(scoring_matrix)
+        codes = encode_sequence(query, self._char_index)
+        self._profiles = self._score_table[:, codes]
+        self._gap_prefix = np.zeros(len(codes) + 1, dtype=np.int64)
+        np.cumsum(self._score_table[-1, codes], out=self._gap_prefix[1:])
+        self._gap_x_scores = self._score_table[:, -1]
+
+    def __repr__(self):
+        """
+        String representation of the profile
+        """
+        return "QueryProfile(" + repr(self._query) + ")"
+
+    def __len__(self):
+        """
+        Length of the query
+        """
+        return len(self._query)
+
+    def encode(self, sequence):
+        """
+        Encode a sequence with the profile's alphabet
+        """
+        return encode_sequence(sequence, self._char_index)
+
+    def alignment_score(self, sequence, global_flag = False):
+        """
+        Score a sequence (as X) against the query (as Y); same result as
+        compute_alignment_score(sequence, query, scoring_matrix, global_flag)
+        """
+        rows = iter_profile_rows(self.encode(sequence), self._profiles, self._gap_prefix,
+                                 self._gap_x_scores, global_flag)
+        return rows_alignment_score(rows, global_flag)
+#
+def _init_batch_worker(query, scoring_matrix):
+    """
+    Pool initializer: build the query profile once per worker
+    """
+    _BATCH_SHARED['profile'] = QueryProfile(query, scoring_matrix)
+#
+def _score_batch(batch):
+    """
+    Local score of every (index, id, sequence) in a batch against the query
+    """
+    profile = _BATCH_SHARED['profile']
+    return [(profile.alignment_score(sequence), -index, record_id) for (index, record_id, sequence) in batch]
+#
+def _keep_top(top_heap, scored, top_n):
+    """
+    Helper function to fold scored records into a min-heap of the top_n best
+    """
+    for item in scored:
+        if len(top_heap) < top_n:
+            heapq.heappush(top_heap, item)
+        elif item > top_heap[0]:
+            heapq.heapreplace(top_heap, item)
+#
+def top_local_alignment_scores(query, scoring_matrix, records, top_n = 10, max_workers = 1, batch_size = 64):
+    """
+    Function to find the database sequences with the highest local
+    alignment scores against one query
+
+    The query profile is built once (per worker).  Records are consumed
+    lazily in batches, with at most two batches per worker in flight, so a
+    database read with sequence_io.iter_fasta_records is never held in memory.
+
+    Note: with max_workers other than 1 on platforms that spawn worker
+    processes (macOS, Windows) call it from under an
+    if __name__ == '__main__':  guard.
+
+    Args:
+        query (str): query sequence, e.g. the consensus PAX domain
+        scoring_matrix (dict of dicts): scoring matrix
+        records (iterable): (id, sequence) pairs
+        top_n (int): number of results to keep
+        max_workers (int): 1 to score in-process, None for one worker per core
+        batch_size (int): records per task sent to a worker
+    Returns:
+        (list): (score, id) of the top_n best records, best first; equal
+            scores keep database order
+    """
+    top_heap = []
+    indexed = ((index, record[0], record[1]) for (index, record) in enumerate(records))
+    batches = iter(lambda: list(itertools.islice(indexed, batch_size)), [])
+    #
+    if max_workers == 1:
+        _init_batch_worker(query, scoring_matrix)
+        for batch in batches:
+            _keep_top(top_heap, _score_batch(batch), top_n)
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers, initializer=_init_batch_worker,
+                                                    initargs=(query, scoring_matrix)) as executor:
+            max_pending = 2 * (max_workers or os.cpu_count() or 1)
+            pending = set([])
+            for batch in batches:
+                pending.add(executor.submit(_score_batch, batch))
+                if len(pending) >= max_pending:
+                    (done, pending) = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done:
+                        _keep_top(top_heap, future.result(), top_n)
+            for future in concurrent.futures.as_completed(pending):
+                _keep_top(top_heap, future.result(), top_n)
+    #
+    top_heap.sort(reverse=True)
+    return [(score, record_id) for (score, _, record_id) in top_heap]
@@ -0,0 +1,238 @@
+"""
+Streaming sequence readers
+
+load_genome_file in genome-sequence-alignment.py reads a whole file and
+keeps its first line.  iter_fasta_records reads FASTA (or plain
+one-sequence-per-line) files a record at a time, and FastaIndex
+memory-maps a file so single records of a very large file can be read
+without loading the rest.  Both can hand back sequences already encoded
+for the alignment engine in sequence_alignment.
+
+"""
+import mmap
+import numbers
+import re
+import numpy as np
+
+# bytes that may appear inside a sequence and are not part of it; both
+# readers drop them wherever they are in a line
+_SPACE_BYTES = b' \t\r\n\x0b\x0c'
+
+# start of a header line: '>' after any whitespace other than a newline
+_HEADER_LINE = re.compile(b'^[ \t\r\x0b\x0c]*>', re.MULTILINE)
+
+##################################################################
+#   Helper functions
+#
+def byte_code_table(char_index):
+    """
+    Helper function to build a 256 entry lookup table from byte value to
+    character code, -1 for bytes outside the alphabet
+
+    Args:
+        char_index (dict): character -> code, from dense_scoring_matrix
+    Returns:
+        (array): intp lookup table
+    """
+    table = np.full(256, -1, dtype=np.intp)
+    for char in char_index:
+        table[ord(char)] = char_index[char]
+    return table
+#
+def encode_bytes(raw, code_table):
+    """
+    Helper function to encode the bytes of a sequence with a lookup table
+
+    Args:
+        raw (bytes): sequence bytes, whitespace already removed
+        code_table (array): table from byte_code_table
+    Returns:
+        (array): character codes
+    """
+    codes = code_table[np.frombuffer(raw, dtype=np.uint8)]
+    if len(codes) > 0 and codes.min() < 0:
+        bad = raw[int(np.argmin(codes))]
+        raise ValueError("character " + repr(chr(bad)) + " is not in the scoring alphabet")
+    return codes
+
+##################################################################
+#   Streaming reader
+#
+def iter_fasta_records(file_name, char_index = None):
+    """
+    Generator reading (id, sequence) records from a FASTA file one at a time
+
+    A record is a '>' header line (the id is its first word) followed by
+    any number of sequence lines.  A file without headers, like the
+    single-line files load_genome_file reads, gives one record per
+    non-empty line with the line number as id.  Whitespace is dropped
+    from sequences, inside lines as well as at their ends.
+
+    Args:
+        file_name (str): location of the file
+        char_index (dict): optional character -> code map; when given the
+            sequences come as code arrays instead of strings
+    Yields:
+        (record_id, sequence): the id and the joined sequence lines
+    """
+    code_table = None if char_index is None else byte_code_table(char_index)
+    #
+    def finish(record_id, chunks):
+        raw = b''.join(chunks)
+        if code_table is None:
+            return (record_id, raw.decode('ascii'))
+        return (record_id, encode_bytes(raw, code_table))
+    #
+    record_id = None
+    chunks = []
+    with open(file_name, 'rb') as data_file:
+        for (line_num, line) in enumerate(data_file):
+            line = line.strip()
+            if line.startswith(b'>'):
+                if record_id is not None:
+                    yield finish(record_id, chunks)
+                header = line[1:].split()
+                record_id = header[0].decode('ascii') if len(header) > 0 else str(line_num)
+                chunks = []
+            elif len(line) > 0:
+                line = line.translate(None, _SPACE_BYTES)
+                if record_id is None:
+                    yield finish(str(line_num), [line])
+                else:
+                    chunks.append(line)
+    if record_id is not None:
+        yield finish(record_id, chunks)
+
+
+class FastaIndex:
+    """
+    Class for random access to the records of a memory-mapped sequence file
+    """
+
+    def __init__(self, file_name):
+        """
+        Map the file and note where every record's sequence starts and ends;
+        the sequences themselves are only read when asked for
+
+        Args:
+            file_name (str): location of a FASTA or one-sequence-per-line file
+        """
+        self._file_name = file_name
+        self._file = open(file_name, 'rb')
+        self._map = None
+        self._ids = []
+        self._spans = []
+        # an empty file cannot be mapped
+        if len(self._file.read(1)) > 0:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._scan()
+        self._lookup = {}
+        for idx in range(len(self._ids)):
+            self._lookup.setdefault(self._ids[idx], idx)
+
+    def __repr__(self):
+        """
+        String representation of the index
+        """
+        return "FastaIndex(" + repr(self._file_name) + ", " + str(len(self._ids)) + " records)"
+
+    def __len__(self):
+        """
+        Number of records in the file
+        """
+        return len(self._ids)
+
+    def __iter__(self):
+        """
+        Iterate over (id, sequence) records lazily
+        """
+        for idx in range(len(self._ids)):
+            yield (self._ids[idx], self.sequence(idx))
+
+    def __enter__(self):
+        """
+        Use the index in a with statement
+        """
+        return self
+
+    def __exit__(self, *exc_info):
+        """
+        Close the index at the end of a with statement
+        """
+        self.close()
+
+    def _scan(self):
+        """
+        Find the records with the rules of iter_fasta_records: a line that
+        starts with '>' (after whitespace) opens a record, and every
+        non-empty line before the first one is a record of its own; ids
+        default to the line number
+        """
+        data = self._map
+        size = len(data)
+        header_starts = [match.start() for match in _HEADER_LINE.finditer(data)]
+        first_header = header_starts[0] if len(header_starts) > 0 else size
+        # the header-less lines before the first header
+        line_num = 0
+        pos = 0
+        while pos < first_header:
+            line_end = data.find(b'\n', pos, first_header)
+            if line_end == -1:
+                line_end = first_header
+            if len(data[pos:line_end].strip()) > 0:
+                self._ids.append(str(line_num))
+                self._spans.append((pos, line_end))
+            line_num += 1
+            pos = line_end + 1
+        # the line number is only worked out for headers without an id
+        counted_pos = first_header
+        for idx in range(len(header_starts)):
+            pos = header_starts[idx]
+            line_end = data.find(b'\n', pos)
+            if line_end == -1:
+                line_end = size
+            header = data[pos:line_end].strip()[1:].split()
+            if len(header) > 0:
+                self._ids.append(header[0].decode('ascii'))
+            else:
+                line_num += data[counted_pos:pos].count(b'\n')
+                counted_pos = pos
+                self._ids.append(str(line_num))
+            seq_end = header_starts[idx + 1] if idx + 1 < len(header_starts) else size
+            self._spans.append((min(line_end + 1, seq_end), seq_end))
+
+    def ids(self):
+        """
+        Get the list of record ids in file order
+        """
+        return list(self._ids)
+
+    def _raw(self, key):
+        """
+        Bytes of a record's sequence, by position (any integer, numpy ones
+        included) or id, without whitespace
+        """
+        idx = int(key) if isinstance(key, numbers.Integral) else self._lookup[key]
+        (start, end) = self._spans[idx]
+        return self._map[start:end].translate(None, _SPACE_BYTES)
+
+    def sequence(self, key):
+        """
+        Get a record's sequence as a string, by position or id
+        """
+        return self._raw(key).decode('ascii')
+
+    def encoded(self, key, char_index):
+        """
+        Get a record's sequence as an array of character codes, by position or id
+        """
+        return encode_bytes(self._raw(key), byte_code_table(char_index))
+
+    def close(self):
+        """
+        Release the mapping and the file
+        """
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
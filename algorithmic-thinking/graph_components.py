@@ -0,0 +1,208 @@
+"""
+Connected components of undirected graphs
+
+compute_resilience in network-analysis.py deletes the attacked nodes one at
+a time and reruns largest_cc_size after each, a full search of the graph
+per attack.  Here the attack is played backwards: starting from the graph
+without any of the attacked nodes, they are added back in reverse order
+and a union-find joins their components, so the size of the largest
+component is known after every step at the cost of one pass over the
+edges.
+
+iter_components replaces cc_visited, which scans a list of the remaining
+nodes for every visited node, with one search over a visited set, and
+hands the components out one at a time.
+
+Graphs are the dict of sets used throughout the module 2 code, i.e.
+node -> set of neighbors with every edge stored in both directions.
+"""
+from collections import deque
+
+class UnionFind:
+    """
+    Class for disjoint sets of nodes with union by size and path halving
+    """
+
+    def __init__(self, nodes = ()):
+        """
+        Create a union-find with every node of nodes in its own set
+        """
+        self._parent = {}
+        self._size = {}
+        self._largest = 0
+        for node in nodes:
+            self.add(node)
+
+    def __repr__(self):
+        """
+        String representation of the union-find
+        """
+        return "UnionFind(" + str(len(self._parent)) + " nodes, largest set " + str(self._largest) + ")"
+
+    def __len__(self):
+        """
+        Number of nodes
+        """
+        return len(self._parent)
+
+    def __iter__(self):
+        """
+        Iterate over the nodes in the order they were added
+        """
+        return iter(self._parent)
+
+    def __contains__(self, node):
+        """
+        Check whether a node has been added
+        """
+        return node in self._parent
+
+    def add(self, node):
+        """
+        Add a node as a set of its own, if it is not there yet
+        """
+        if node not in self._parent:
+            self._parent[node] = node
+            self._size[node] = 1
+            self._largest = max(self._largest, 1)
+
+    def find(self, node):
+        """
+        Get the representative node of the set holding node
+        """
+        parent = self._parent
+        while parent[node] != node:
+            # point every other node on the path at its grandparent
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    def union(self, node_a, node_b):
+        """
+        Merge the sets holding two nodes
+
+        Returns:
+            (int): size of the merged set
+        """
+        root_a = self.find(node_a)
+        root_b = self.find(node_b)
+        if root_a == root_b:
+            return self._size[root_a]
+        if self._size[root_a] < self._size[root_b]:
+            (root_a, root_b) = (root_b, root_a)
+        self._parent[root_b] = root_a
+        self._size[root_a] += self._size.pop(root_b)
+        self._largest = max(self._largest, self._size[root_a])
+        return self._size[root_a]
+
+    def set_size(self, node):
+        """
+        Get the number of nodes in the set holding node
+        """
+        return self._size[self.find(node)]
+
+    def largest(self):
+        """
+        Get the size of the largest set, 0 when there are no nodes
+        """
+        return self._largest
+
+######################################################################
+#   Components
+#
+def iter_components(ugraph):
+    """
+    Generator for the connected components of an undirected graph, in the
+    order cc_visited lists them, in O(n + m) time
+
+    Args:
+        ugraph (dict): Undirected graph
+    Yields:
+        (set): the nodes of one component
+    """
+    visited = set()
+    for start_node in ugraph:
+        if start_node in visited:
+            continue
+        component = {start_node}
+        queue = deque([start_node])
+        while len(queue) > 0:
+            current_node = queue.popleft()
+            for neighbor in ugraph[current_node]:
+                if neighbor not in component:
+                    component.add(neighbor)
+                    queue.append(neighbor)
+        visited.update(component)
+        yield component
+
+def largest_component_size(ugraph):
+    """
+    Function to return the number of nodes in the largest connected
+    component of an undirected graph, 0 for an empty graph
+    """
+    return max((len(component) for component in iter_components(ugraph)), default=0)
+
+def iter_edge_components(nodes, edges):
+    """
+    Generator for the connected components of a graph given as a stream of
+    edges, e.g. read from a file, without building its adjacency sets
+
+    Args:
+        nodes (iterable): every node, including those without edges
+        edges (iterable): (node, node) pairs; each edge is needed only once
+    Yields:
+        (set): the nodes of one component, ordered by their first node in nodes
+    """
+    components = UnionFind(nodes)
+    for (node_a, node_b) in edges:
+        components.union(node_a, node_b)
+    #
+    members = {}
+    for node in components:
+        members.setdefault(components.find(node), set()).add(node)
+    for component in members.values():
+        yield component
+
+######################################################################
+#   Resilience
+#
+def fast_compute_resilience(ugraph, attack_order):
+    """
+    Function to compute the resilience of a network to removal of nodes in
+    attack_order; same result as compute_resilience in network-analysis.py
+    in O((n + m) * alpha(n)) time instead of a search per attacked node.
+    Like compute_resilience it raises KeyError for a node that is not in
+    ugraph or is attacked twice
+
+    Args:
+        ugraph (dict): Undirected graph, not modified
+        attack_order (list): List of nodes that are attacked in each iteration
+    Returns:
+        network_max_cc (list): List of sizes of the largest connected
+            component before the first attack and after each attack
+    """
+    attacked = set()
+    for attack_node in attack_order:
+        if attack_node in attacked or attack_node not in ugraph:
+            raise KeyError(attack_node)
+        attacked.add(attack_node)
+    #
+    components = UnionFind()
+    # the graph left after the whole attack
+    for node in ugraph:
+        if node not in attacked:
+            components.add(node)
+            for neighbor in ugraph[node]:
+                if neighbor in components:
+                    components.union(node, neighbor)
+    #
+    network_max_cc = [components.largest()]
+    for attack_node in reversed(attack_order):
+        components.add(attack_node)
+        for neighbor in ugraph[attack_node]:
+            if neighbor in components:
+                components.union(attack_node, neighbor)
+        network_max_cc.append(components.largest())
+    #
+    network_max_cc.reverse()
+    return network_max_cc
@@ -0,0 +1,255 @@
+"""
+Generators for synthetic undirected graphs
+
+make_upa_graph in network-analysis.py rebuilds and sorts a cumulative
+probability table over all nodes for every new node, O(n^2 log n) in all.
+The UPATrial technique from dpa-graph.py keeps instead a list in which
+every node appears degree + 1 times, so a uniform choice from the list
+picks a node with the UPA probability (indeg(node) + 1) / (2 * edges + n)
+and each new node costs O(start_nodes).
+
+upa_edges runs the same process on plain lists of ints with the random
+numbers drawn from NumPy in batches, and returns edge arrays that
+csr_graph.CSRGraph.from_edges turns into a compact graph.
+
+random_undirected_graph flips a coin for each of the n(n - 1)/2 node
+pairs.  The ER generators here jump straight from one edge to the next:
+the number of pairs up to and including the next edge is geometric with
+parameter p, so a graph takes O(n + m) expected time.
+"""
+import math
+import random
+from array import array
+import numpy as np
+import csr_graph
+
+# random numbers taken from the NumPy generator at a time by upa_edges and er_edges
+DRAW_BATCH = 1 << 16
+
+class UPATrial:
+    """
+    Class for the trials of the undirected UPA algorithm
+
+    Maintains a list of node numbers in which every node appears its
+    degree plus one times, and picks the neighbors of a new node with
+    uniform choices from it.
+    """
+
+    def __init__(self, num_nodes, rng = None):
+        """
+        Initialize a UPATrial object corresponding to a complete graph
+        with num_nodes nodes, each of degree num_nodes - 1
+
+        Args:
+            num_nodes (int): number of nodes of the complete start graph
+            rng (random.Random): source of the choices, the random module
+                when None
+        """
+        self._num_nodes = num_nodes
+        self._rng = random if rng is None else rng
+        self._node_numbers = [node for node in range(num_nodes) for _ in range(num_nodes)]
+
+    def run_trial(self, num_nodes):
+        """
+        Conduct num_nodes trials for the next new node and update the list
+        so every node number still appears degree plus one times
+
+        Returns:
+            (set): the neighbors of the new node
+        """
+        new_node_neighbors = set()
+        for _ in range(num_nodes):
+            new_node_neighbors.add(self._rng.choice(self._node_numbers))
+        # the new node: degree len(new_node_neighbors), each neighbor one more
+        self._node_numbers.extend([self._num_nodes] * (len(new_node_neighbors) + 1))
+        self._node_numbers.extend(new_node_neighbors)
+        #
+        self._num_nodes += 1
+        return new_node_neighbors
+
+######################################################################
+#   Generators
+#
+def make_complete_ugraph(num_nodes):
+    """
+    Function to return a complete undirected graph with num_nodes nodes,
+    without self-loops
+    """
+    ugraph = {}
+    for node in range(num_nodes):
+        ugraph[node] = set(range(num_nodes))
+        ugraph[node].discard(node)
+    return ugraph
+
+def make_upa_graph(num_nodes, start_nodes, rng = None):
+    """
+    Function to implement the UPA algorithm with UPATrial: a complete graph
+    on start_nodes nodes, then num_nodes - start_nodes new nodes each joined
+    to start_nodes choices of node made with probability
+    (indeg(node) + 1) / (2 * edges + nodes); same distribution as
+    make_upa_graph in network-analysis.py in O(num_nodes * start_nodes)
+
+    Args:
+        num_nodes (int): number of nodes of the graph
+        start_nodes (int): size of the complete start graph and number of
+            choices per new node
+        rng (random.Random): source of the choices, the random module when None
+    Returns:
+        upa_graph (dict): undirected graph
+    """
+    upa_graph = make_complete_ugraph(start_nodes)
+    trial = UPATrial(start_nodes, rng)
+    for node_idx in range(start_nodes, num_nodes):
+        neighbors = trial.run_trial(start_nodes)
+        upa_graph[node_idx] = neighbors
+        for neighbor in neighbors:
+            upa_graph[neighbor].add(node_idx)
+    return upa_graph
+
+def upa_edges(num_nodes, start_nodes, seed = None):
+    """
+    Function to generate the edges of a UPA graph with batched NumPy draws
+
+    The node number list is the one UPATrial keeps; the uniform choices
+    come DRAW_BATCH at a time from numpy default_rng(seed), so the graph
+    is reproducible for a given seed but differs from make_upa_graph's.
+
+    Args:
+        num_nodes (int): number of nodes of the graph
+        start_nodes (int): size of the complete start graph and number of
+            choices per new node
+        seed (int): seed of the NumPy generator
+    Returns:
+        (edges_a, edges_b): int32 arrays with one entry per edge
+    """
+    rng = np.random.default_rng(seed)
+    edges_a = array('i')
+    edges_b = array('i')
+    for node in range(start_nodes):
+        for other in range(node + 1, start_nodes):
+            edges_a.append(node)
+            edges_b.append(other)
+    #
+    node_numbers = [node for node in range(start_nodes) for _ in range(start_nodes)]
+    draws = []
+    next_draw = 0
+    for node_idx in range(start_nodes, num_nodes):
+        if next_draw + start_nodes > len(draws):
+            draws = rng.random(max(DRAW_BATCH, start_nodes)).tolist()
+            next_draw = 0
+        length = len(node_numbers)
+        neighbors = set()
+        for draw in draws[next_draw:next_draw + start_nodes]:
+            neighbors.add(node_numbers[int(draw * length)])
+        next_draw += start_nodes
+        #
+        node_numbers.extend([node_idx] * (len(neighbors) + 1))
+        node_numbers.extend(neighbors)
+        edges_a.extend([node_idx] * len(neighbors))
+        edges_b.extend(neighbors)
+    #
+    return (np.frombuffer(edges_a, dtype=np.int32), np.frombuffer(edges_b, dtype=np.int32))
+
+def make_upa_csr(num_nodes, start_nodes, seed = None):
+    """
+    Function to generate a UPA graph straight into a csr_graph.CSRGraph
+    """
+    (edges_a, edges_b) = upa_edges(num_nodes, start_nodes, seed)
+    return csr_graph.CSRGraph.from_edges(num_nodes, edges_a, edges_b)
+
+def iter_er_edges(num_nodes, probability, rng = None):
+    """
+    Generator for the edges of an Erdos-Renyi graph G(n, p), skipping the
+    non-edges with geometric jumps over the pairs (v, w), w < v, in order
+
+    Args:
+        num_nodes (int): number of nodes
+        probability (float): likelihood of 2 nodes being connected
+        rng (random.Random): source of the jumps, the random module when None
+    Yields:
+        (node_v, node_w): one pair per edge, node_w < node_v
+    """
+    rng = random if rng is None else rng
+    if probability <= 0.0:
+        return
+    if probability >= 1.0:
+        for node_v in range(1, num_nodes):
+            for node_w in range(node_v):
+                yield (node_v, node_w)
+        return
+    #
+    log_q = math.log(1.0 - probability)
+    node_v = 1
+    node_w = -1
+    while node_v < num_nodes:
+        # 1 - random() is in (0, 1], so the log is finite
+        node_w += 1 + int(math.log(1.0 - rng.random()) / log_q)
+        while node_w >= node_v and node_v < num_nodes:
+            node_w -= node_v
+            node_v += 1
+        if node_v < num_nodes:
+            yield (node_v, node_w)
+
+def er_edges(num_nodes, probability, seed = None):
+    """
+    Function to generate the edges of an Erdos-Renyi graph G(n, p) with
+    batches of NumPy geometric jumps over the numbered node pairs
+
+    Pair k is (v, w) with k = v * (v - 1) / 2 + w and w < v.  The graphs
+    are reproducible for a given seed but differ from those of iter_er_edges.
+
+    Args:
+        num_nodes (int): number of nodes
+        probability (float): likelihood of 2 nodes being connected
+        seed (int): seed of the NumPy generator
+    Returns:
+        (edges_v, edges_w): int32 arrays with one entry per edge
+    """
+    rng = np.random.default_rng(seed)
+    num_pairs = num_nodes * (num_nodes - 1) // 2
+    if probability <= 0.0 or num_pairs == 0:
+        pairs = np.empty(0, dtype=np.int64)
+    elif probability >= 1.0:
+        pairs = np.arange(num_pairs, dtype=np.int64)
+    else:
+        batches = []
+        last_pair = -1
+        while last_pair < num_pairs:
+            batch = last_pair + np.cumsum(rng.geometric(probability, DRAW_BATCH))
+            batches.append(batch[batch < num_pairs])
+            last_pair = int(batch[-1])
+        pairs = np.concatenate(batches)
+    # invert k = v * (v - 1) / 2 + w, correcting the float square root
+    node_v = ((1 + np.sqrt(1 + 8 * pairs.astype(np.float64))) // 2).astype(np.int64)
+    node_v[node_v * (node_v - 1) // 2 > pairs] -= 1
+    node_v[(node_v + 1) * node_v // 2 <= pairs] += 1
+    node_w = pairs - node_v * (node_v - 1) // 2
+    return (node_v.astype(np.int32), node_w.astype(np.int32))
+
+def random_undirected_graph(num_nodes, probability, rng = None):
+    """
+    Function to generate an Erdos-Renyi undirected graph with the
+    distribution of random_undirected_graph in network-analysis.py in
+    O(n + m) expected time
+
+    Args:
+        num_nodes (int): number of nodes
+        probability (float): likelihood of 2 nodes being connected
+        rng (random.Random): source of the jumps, the random module when None
+    Returns:
+        random_graph (dict): undirected graph
+    """
+    random_graph = {}
+    for node_idx in range(num_nodes):
+        random_graph[node_idx] = set()
+    for (node_v, node_w) in iter_er_edges(num_nodes, probability, rng):
+        random_graph[node_v].add(node_w)
+        random_graph[node_w].add(node_v)
+    return random_graph
+
+def make_er_csr(num_nodes, probability, seed = None):
+    """
+    Function to generate an Erdos-Renyi graph straight into a csr_graph.CSRGraph
+    """
+    (edges_v, edges_w) = er_edges(num_nodes, probability, seed)
+    return csr_graph.CSRGraph.from_edges(num_nodes, edges_v, edges_w)
@@ -17,6 +17,11 @@ from collections import deque
 # Desktop imports
 import matplotlib.pyplot as plt
 
+# linear-time components and union-find resilience
+import graph_components
+# UPATrial based UPA and geometric-skip ER generation
+import graph_generators
+
 ############################################
 # Provided code
 
@@ -219,19 +224,8 @@ def cc_visited(ugraph):
     Returns:
         c_components (list): List of all sets that are connected to a node
     """
-    remain_nodes = list(ugraph.keys())
-    #
-    c_components = list()
-    #
-    while len(remain_nodes) > 0:
-        node = remain_nodes[0]
-        visited = bfs_visited(ugraph, node)
-        c_components.append(visited)
-        for visit in visited:
-            if visit in remain_nodes:
-                remain_nodes.remove(visit)
-    #
-    return c_components
+    # one search over a visited set instead of list.remove for every node
+    return list(graph_components.iter_components(ugraph))
 
 def largest_cc_size(ugraph):
     """
@@ -242,15 +236,8 @@ def largest_cc_size(ugraph):
     Returns:
         max_cc_size (int): Count of nodes in largest set of connected components
     """
-    max_cc_size = 0
-    #
-    conn_components = cc_visited(ugraph)
-    #
-    for cc_nodes in conn_components:
-        if len(cc_nodes) > max_cc_size:
-            max_cc_size = len(cc_nodes)
-    #
-    return max_cc_size
+    # the components are generated one at a time, never all kept
+    return graph_components.largest_component_size(ugraph)
 
 def compute_in_degrees(ugraph):
     """
@@ -548,20 +535,20 @@ num_nodes = 1239
 er_probability = 0.004
 num_starter = 3
 #
-er_graf = random_undirected_graph(num_nodes, er_probability)
+er_graf = graph_generators.random_undirected_graph(num_nodes, er_probability)
 print("Max CC : ", largest_cc_size(er_graf))
 print("Edges in ER graph : ", total_in_degrees(er_graf))
 #
-upa_graf = make_upa_graph(num_nodes, num_starter)
+upa_graf = graph_generators.make_upa_graph(num_nodes, num_starter)
 print("Max CC : ", largest_cc_size(upa_graf))
 print("Edges in UPA graph : ", total_in_degrees(upa_graf))
 
 net_attack = random_order(net_graf)
-net_resilience = compute_resilience(net_graf, net_attack)
+net_resilience = graph_components.fast_compute_resilience(net_graf, net_attack)
 er_attack = random_order(er_graf)
-er_resilience = compute_resilience(er_graf, er_attack)
+er_resilience = graph_components.fast_compute_resilience(er_graf, er_attack)
 upa_attack = random_order(upa_graf)
-upa_resilience = compute_resilience(upa_graf, upa_attack)
+upa_resilience = graph_components.fast_compute_resilience(upa_graf, upa_attack)
 #
 #print(net_resilience)
 #print(er_resilience)
@@ -578,9 +565,9 @@ print("upa_targets :", upa_targets)
 upa_fast_targets = fast_targeted_order(upa_graf)
 print("upa_fast_targets : ", upa_fast_targets)
 
-#net_tgt_resilience = compute_resilience(net_graf, net_targets)
-#er_tgt_resilience = compute_resilience(er_graf, er_targets)
-#upa_tgt_resilience = compute_resilience(upa_graf, upa_targets)
+#net_tgt_resilience = graph_components.fast_compute_resilience(net_graf, net_targets)
+#er_tgt_resilience = graph_components.fast_compute_resilience(er_graf, er_targets)
+#upa_tgt_resilience = graph_components.fast_compute_resilience(upa_graf, upa_targets)
 
 #plot_ugraph_compare_targeted(net_tgt_resilience, er_tgt_resilience, upa_tgt_resilience)
 
@@ -17,6 +17,9 @@ from collections import deque
 # Desktop imports
 import matplotlib.pyplot as plt
 
+# UPATrial based UPA generation
+import graph_generators
+
 ############################################
 # Provided code
 
@@ -292,7 +295,7 @@ x_axis = []
 start_nodes = 5
 for num_nodes in range(10, 1000, 10):
     x_axis.append(num_nodes)
-    test_graph = make_upa_graph(num_nodes, start_nodes)
+    test_graph = graph_generators.make_upa_graph(num_nodes, start_nodes)
     #
     start_time = time.time()
     tgt_nodes = targeted_order(test_graph)
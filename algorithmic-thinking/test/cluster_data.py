@@ -0,0 +1,32 @@
+"""
+Synthetic county tables for the clustering tests
+
+Kept with the tests so the engines are tested without the benchmark
+suite; alg_benchmark builds its input tables the same way.
+"""
+import math
+import random
+import alg_cluster
+
+def synthetic_data_table(num_counties, seed = 0):
+    """
+    Build a data table shaped like the cancer data: centers over the
+    1000 x 634 map image, log-uniform populations and small risks
+
+    Args:
+        num_counties (int): number of rows
+        seed (int): random seed
+    Returns:
+        (list): [fips, horiz, vert, pop, risk] rows with unique FIPS codes
+    """
+    rand = random.Random(seed)
+    return [["S" + str(idx), rand.uniform(0.0, 1000.0), rand.uniform(0.0, 634.0),
+             int(math.exp(rand.uniform(math.log(1000), math.log(10000000)))), rand.uniform(1e-6, 2e-4)]
+            for idx in range(num_counties)]
+
+def singleton_clusters(data_table):
+    """
+    One Cluster per row of a data table
+    """
+    return [alg_cluster.Cluster(set([line[0]]), line[1], line[2], line[3], line[4])
+            for line in data_table]
@@ -0,0 +1,45 @@
+"""
+Shared setup for the algorithmic-thinking tests
+
+The engines live next to the course scripts, whose file names have dashes
+and whose module level code loads data files and plots, so they cannot be
+imported.  load_script runs only their imports and definitions, which
+gives the tests the original functions to compare the engines against.
+"""
+import ast
+import os
+import sys
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+for module_dir in (BASE_DIR, os.path.join(BASE_DIR, 'NATA'), os.path.join(BASE_DIR, 'dynamic-programming')):
+    if module_dir not in sys.path:
+        sys.path.insert(0, module_dir)
+
+_SCRIPTS = {}
+
+def _load_script(relative_name):
+    """
+    Helper function to run the imports, functions and classes of a script
+    and return them as a dict
+    """
+    if relative_name not in _SCRIPTS:
+        file_name = os.path.join(BASE_DIR, relative_name)
+        with open(file_name) as script_file:
+            tree = ast.parse(script_file.read(), file_name)
+        kept = (ast.FunctionDef, ast.ClassDef, ast.Import, ast.ImportFrom)
+        tree.body = [node for node in tree.body
+                     if isinstance(node, kept) and 'matplotlib' not in ast.dump(node)]
+        namespace = {'__name__': 'script_' + os.path.basename(file_name)}
+        exec(compile(tree, file_name, 'exec'), namespace)
+        _SCRIPTS[relative_name] = namespace
+    return _SCRIPTS[relative_name]
+
+@pytest.fixture(scope='session')
+def load_script():
+    """
+    Fixture giving the loader of script definitions, e.g.
+    load_script('network-analysis.py')['compute_resilience']
+    """
+    return _load_script
@@ -0,0 +1,106 @@
+"""
+Tests for the affine gap (Gotoh) alignments
+"""
+import itertools
+import random
+import pytest
+import sequence_alignment
+
+def residue_matrix(rand, alphabet, with_dash):
+    """
+    Random residue scores; the '-' entries, which the affine engine ignores,
+    only when with_dash is set
+    """
+    chars = alphabet + ('-' if with_dash else '')
+    return dict((row_char, dict((col_char, rand.randint(-4, 6)) for col_char in chars)) for row_char in chars)
+
+def all_alignments(seq_x, seq_y):
+    """
+    Every global alignment of two short sequences, as (align_x, align_y)
+    """
+    if not seq_x or not seq_y:
+        yield (seq_x + '-' * len(seq_y), '-' * len(seq_x) + seq_y)
+        return
+    for (rest_x, rest_y) in all_alignments(seq_x[:-1], seq_y[:-1]):
+        yield (rest_x + seq_x[-1], rest_y + seq_y[-1])
+    for (rest_x, rest_y) in all_alignments(seq_x[:-1], seq_y):
+        yield (rest_x + seq_x[-1], rest_y + '-')
+    for (rest_x, rest_y) in all_alignments(seq_x, seq_y[:-1]):
+        yield (rest_x + '-', rest_y + seq_y[-1])
+
+def brute_force_score(seq_x, seq_y, scoring_matrix, gap_open, gap_extend, global_flag):
+    """
+    Best score over every alignment of X and Y or, for local alignments,
+    of every pair of substrings, with 0 for the empty local alignment
+    """
+    if global_flag:
+        pairs = [(seq_x, seq_y)]
+    else:
+        pairs = [(seq_x[start_x:end_x], seq_y[start_y:end_y])
+                 for (start_x, end_x) in itertools.combinations(range(len(seq_x) + 1), 2)
+                 for (start_y, end_y) in itertools.combinations(range(len(seq_y) + 1), 2)]
+    scores = [sequence_alignment.affine_alignment_score(align_x, align_y, scoring_matrix, gap_open, gap_extend)
+              for (sub_x, sub_y) in pairs for (align_x, align_y) in all_alignments(sub_x, sub_y)]
+    return max(scores) if global_flag else max(scores + [0])
+
+def full_alignment(seq_x, seq_y, scoring_matrix, gap_open, gap_extend, global_flag):
+    directions = sequence_alignment.compute_affine_alignment_directions(seq_x, seq_y, scoring_matrix,
+                                                                        gap_open, gap_extend, global_flag)
+    if global_flag:
+        return sequence_alignment.compute_affine_global_alignment(seq_x, seq_y, directions)
+    return sequence_alignment.compute_affine_local_alignment(seq_x, seq_y, directions)
+
+
+@pytest.mark.parametrize('global_flag', [True, False])
+@pytest.mark.parametrize('seed', range(4))
+def test_matrices_find_the_best_alignment(seed, global_flag):
+    rand = random.Random(seed)
+    scoring_matrix = residue_matrix(rand, 'ACG', seed % 2 == 0)
+    for _ in range(4):
+        seq_x = ''.join([rand.choice('ACG') for _ in range(rand.randint(1, 4))])
+        seq_y = ''.join([rand.choice('ACG') for _ in range(rand.randint(1, 4))])
+        gap_open = rand.randint(-6, -1)
+        gap_extend = rand.randint(gap_open, 0)
+        (score, align_x, align_y) = full_alignment(seq_x, seq_y, scoring_matrix, gap_open, gap_extend, global_flag)
+        assert score == brute_force_score(seq_x, seq_y, scoring_matrix, gap_open, gap_extend, global_flag)
+        assert sequence_alignment.affine_alignment_score(align_x, align_y, scoring_matrix,
+                                                         gap_open, gap_extend) == score
+        assert align_x.replace('-', '') in seq_x and align_y.replace('-', '') in seq_y
+
+@pytest.mark.parametrize('with_dash', [True, False])
+@pytest.mark.parametrize('global_flag', [True, False])
+@pytest.mark.parametrize('seed', range(5))
+def test_score_only_matches_the_matrices(seed, global_flag, with_dash):
+    rand = random.Random(50 + seed)
+    alphabet = 'ACGT'
+    scoring_matrix = residue_matrix(rand, alphabet, with_dash)
+    for _ in range(5):
+        seq_x = ''.join([rand.choice(alphabet) for _ in range(rand.randint(0, 25))])
+        seq_y = ''.join([rand.choice(alphabet) for _ in range(rand.randint(0, 25))])
+        gap_open = rand.randint(-8, -1)
+        gap_extend = rand.randint(gap_open, 0)
+        expected = full_alignment(seq_x, seq_y, scoring_matrix, gap_open, gap_extend, global_flag)[0]
+        assert sequence_alignment.compute_affine_alignment_score(seq_x, seq_y, scoring_matrix, gap_open,
+                                                                 gap_extend, global_flag) == expected
+
+def test_residue_only_matrix_is_accepted():
+    scoring_matrix = dict((row_char, dict((col_char, 2 if row_char == col_char else -1) for col_char in 'ACGT'))
+                          for row_char in 'ACGT')
+    assert full_alignment('ACGT', 'AGT', scoring_matrix, -3, -1, True) == (3, 'ACGT', 'A-GT')
+    assert sequence_alignment.compute_affine_alignment_score('ACGT', 'AGT', scoring_matrix, -3, -1, True) == 3
+    assert sequence_alignment.compute_affine_alignment_score('ACGT', 'AGT', scoring_matrix, -3, -1, False) == \
+        full_alignment('ACGT', 'AGT', scoring_matrix, -3, -1, False)[0]
+
+def test_one_long_gap_beats_two_short_ones():
+    scoring_matrix = dict((row_char, dict((col_char, 5 if row_char == col_char else -5) for col_char in 'AT'))
+                          for row_char in 'AT')
+    (score, align_x, align_y) = full_alignment('AAATTT', 'AT', scoring_matrix, -6, -1, True)
+    assert (score, align_x, align_y) == (1, 'AAATTT', 'A----T')
+
+def test_empty_sequences():
+    scoring_matrix = {'A': {'A': 1}}
+    assert full_alignment('', '', scoring_matrix, -2, -1, True) == (0, '', '')
+    assert full_alignment('AAA', '', scoring_matrix, -2, -1, True) == (-4, 'AAA', '---')
+    assert full_alignment('', 'A', scoring_matrix, -2, -1, False) == (0, '', '')
+    assert sequence_alignment.compute_affine_alignment_score('', 'AA', scoring_matrix, -2, -1, True) == -3
+    assert sequence_alignment.compute_affine_alignment_score('AA', '', scoring_matrix, -2, -1, False) == 0
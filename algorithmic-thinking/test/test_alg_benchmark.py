@@ -0,0 +1,67 @@
+"""
+Tests for the clustering benchmark harness
+"""
+import json
+import pytest
+import alg_benchmark
+import cluster_data
+import alg_project3_solution as soln
+
+def _report(times):
+    return {'cases': {'slow_closest_pair': {'sizes': dict((size, {'wall_time': wall, 'peak_memory': 1000})
+                                                         for (size, wall) in times.items())}}}
+
+
+def test_scaling_exponent_recovers_a_power_law():
+    sizes = [100, 200, 400, 800]
+    assert alg_benchmark.scaling_exponent(sizes, [3e-9 * size ** 2 for size in sizes]) == pytest.approx(2.0)
+    assert alg_benchmark.scaling_exponent(sizes, [0.5 * size for size in sizes]) == pytest.approx(1.0)
+
+def test_scaling_exponent_needs_two_timed_sizes():
+    assert alg_benchmark.scaling_exponent([100], [1.0]) is None
+    assert alg_benchmark.scaling_exponent([100, 200], [0.0, 1.0]) is None
+    assert alg_benchmark.scaling_exponent([], []) is None
+
+def test_compare_results_flags_only_real_regressions():
+    baseline = _report({'111': 1.0, '290': 2.0})
+    current = _report({'111': 1.2, '290': 2.6, '896': 9.0})
+    regressions = alg_benchmark.compare_results(baseline, current)
+    assert len(regressions) == 1
+    assert regressions[0].startswith('slow_closest_pair n=290 wall_time')
+    assert alg_benchmark.compare_results(baseline, current, tolerance=1.5) == []
+    assert alg_benchmark.compare_results({'cases': {}}, current) == []
+
+def test_synthetic_tables_match_the_test_helpers():
+    assert alg_benchmark.synthetic_data_table(25, 4) == cluster_data.synthetic_data_table(25, 4)
+
+def test_benchmarked_functions_agree_with_the_course_code():
+    data_table = alg_benchmark.synthetic_data_table(40, 3)
+    (cluster_list,) = alg_benchmark.BENCHMARK_CASES['fast_closest_pair'][1](data_table)
+    assert soln.fast_closest_pair(cluster_list)[0] == pytest.approx(soln.slow_closest_pair(cluster_list)[0])
+    (cluster_list, data_table) = alg_benchmark.BENCHMARK_CASES['cluster_error'][1](data_table)
+    assert alg_benchmark.BENCHMARK_CASES['cluster_error'][0](cluster_list, data_table) == \
+        pytest.approx(sum([cluster.cluster_error(data_table) for cluster in cluster_list]))
+
+def test_run_benchmarks_respects_max_size():
+    report = alg_benchmark.run_benchmarks(sizes=[12, 24], case_names=['kmeans_clustering', 'slow_closest_pair'],
+                                          repeat=1, seed=4)
+    assert sorted(report['cases']) == ['kmeans_clustering', 'slow_closest_pair']
+    assert sorted(report['cases']['kmeans_clustering']['sizes']) == ['12', '24']
+    assert report['meta']['sources'] == {'12': 'synthetic', '24': 'synthetic'}
+    json.dumps(report)
+
+def test_main_writes_a_report_and_checks_a_baseline(tmp_path, capsys):
+    output = str(tmp_path / 'report.json')
+    assert alg_benchmark.main(['--sizes', '12', '--cases', 'closest_pair_strip', '--repeat', '1',
+                               '--output', output]) == 0
+    with open(output) as report_file:
+        report = json.load(report_file)
+    # a baseline far faster than anything measurable makes every size a regression
+    for size in report['cases']['closest_pair_strip']['sizes'].values():
+        size['wall_time'] = 1e-12
+    baseline = str(tmp_path / 'baseline.json')
+    with open(baseline, 'w') as baseline_file:
+        json.dump(report, baseline_file)
+    assert alg_benchmark.main(['--sizes', '12', '--cases', 'closest_pair_strip', '--repeat', '1',
+                               '--baseline', baseline]) == 1
+    assert 'REGRESSION' in capsys.readouterr().out
@@ -0,0 +1,102 @@
+"""
+Tests for the ClusterGrid closest pair engine against slow_closest_pair
+"""
+import math
+import random
+import time
+import pytest
+import cluster_data
+import alg_closest_pair
+import alg_cluster
+import alg_project3_solution as soln
+
+def _brute_nearest(points, horiz, vert, exclude=None):
+    candidates = [(math.hypot(horiz - point[0], vert - point[1]), key)
+                  for (key, point) in points.items() if key != exclude]
+    return min(candidates) if candidates else (float('inf'), None)
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_grid_closest_pair_matches_slow_closest_pair(seed):
+    rand = random.Random(seed)
+    cluster_list = cluster_data.singleton_clusters(cluster_data.synthetic_data_table(rand.randint(2, 150), seed))
+    rand.shuffle(cluster_list)
+    (dist, idx_u, idx_v) = alg_closest_pair.grid_closest_pair(cluster_list)
+    assert dist == pytest.approx(soln.slow_closest_pair(cluster_list)[0])
+    assert idx_u < idx_v
+    assert cluster_list[idx_u].distance(cluster_list[idx_v]) == pytest.approx(dist)
+
+def test_clustered_and_collinear_points():
+    rand = random.Random(3)
+    # a tight clump far from the rest forces the fallback to the full grid
+    positions = [(rand.uniform(0, 1), 0.0) for _ in range(20)] + [(1000.0, 1000.0)]
+    cluster_list = [alg_cluster.Cluster(set([str(idx)]), horiz, vert, 1, 0.0)
+                    for (idx, (horiz, vert)) in enumerate(positions)]
+    assert alg_closest_pair.grid_closest_pair(cluster_list)[0] == \
+        pytest.approx(soln.slow_closest_pair(cluster_list)[0])
+    pair = [alg_cluster.Cluster(set(['a']), 0.0, 0.0, 1, 0.0), alg_cluster.Cluster(set(['b']), 500.0, 0.0, 1, 0.0)]
+    assert alg_closest_pair.grid_closest_pair(pair) == (500.0, 0, 1)
+
+def _clump_with_outlier(num_points, seed):
+    rand = random.Random(seed)
+    cluster_list = [alg_cluster.Cluster(set([str(idx)]), rand.uniform(0, 1), rand.uniform(0, 1), 1, 0.0)
+                    for idx in range(num_points)]
+    cluster_list.append(alg_cluster.Cluster(set(['far']), 1.0e6, 1.0e6, 1, 0.0))
+    return cluster_list
+
+def test_clump_with_a_far_outlier_shrinks_the_cells():
+    # the bounding box puts the whole clump in one cell, which used to scan all pairs
+    cluster_list = _clump_with_outlier(20000, 5)
+    start = time.time()
+    (dist, idx_u, idx_v) = alg_closest_pair.grid_closest_pair(cluster_list)
+    assert time.time() - start < 10.0
+    expected = soln.fast_closest_pair(sorted(cluster_list, key = lambda cluster: cluster.horiz_center()))
+    assert dist == pytest.approx(expected[0])
+    assert cluster_list[idx_u].distance(cluster_list[idx_v]) == pytest.approx(dist)
+
+def test_crowded_cells_fall_back_to_fast_closest_pair(monkeypatch):
+    cluster_list = _clump_with_outlier(300, 6)
+    monkeypatch.setattr(alg_closest_pair, 'MAX_REFINEMENTS', 0)
+    (dist, idx_u, idx_v) = alg_closest_pair.grid_closest_pair(cluster_list)
+    assert dist == pytest.approx(soln.slow_closest_pair(cluster_list)[0])
+    assert idx_u < idx_v
+    assert cluster_list[idx_u].distance(cluster_list[idx_v]) == pytest.approx(dist)
+
+def test_duplicate_centers_are_at_distance_zero():
+    cluster_list = [alg_cluster.Cluster(set([str(idx)]), float(idx % 3), 1.0, 1, 0.0) for idx in range(7)]
+    assert alg_closest_pair.grid_closest_pair(cluster_list)[0] == 0.0
+
+def test_fewer_than_two_clusters():
+    assert alg_closest_pair.grid_closest_pair([]) == (float('inf'), -1, -1)
+    single = [alg_cluster.Cluster(set(['1']), 2.0, 3.0, 1, 0.0)]
+    assert alg_closest_pair.grid_closest_pair(single) == (float('inf'), -1, -1)
+
+def test_nearest_follows_inserts_moves_and_removes():
+    rand = random.Random(11)
+    grid = alg_closest_pair.ClusterGrid(7.5)
+    points = {}
+    for step in range(300):
+        key = rand.randrange(40)
+        action = rand.random()
+        if key in points and action < 0.3:
+            grid.remove(key)
+            del points[key]
+        elif key in points and action < 0.6:
+            points[key] = (rand.uniform(-50, 50), rand.uniform(-50, 50))
+            grid.move(key, points[key][0], points[key][1])
+        else:
+            points[key] = (rand.uniform(-50, 50), rand.uniform(-50, 50))
+            grid.insert(key, points[key][0], points[key][1])
+        (horiz, vert) = (rand.uniform(-80, 80), rand.uniform(-80, 80))
+        assert grid.nearest(horiz, vert) == pytest.approx(_brute_nearest(points, horiz, vert))
+        if points:
+            some_key = rand.choice(sorted(points))
+            assert grid.nearest_to_key(some_key) == \
+                pytest.approx(_brute_nearest(points, points[some_key][0], points[some_key][1], some_key))
+    assert len(grid) == len(points)
+
+def test_empty_grid():
+    grid = alg_closest_pair.ClusterGrid(1.0)
+    assert grid.nearest(0.0, 0.0) == (float('inf'), None)
+    assert grid.closest_pair() == (float('inf'), None, None)
+    assert alg_closest_pair.suggest_cell_size([], []) == 1.0
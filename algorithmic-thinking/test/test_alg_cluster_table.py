@@ -0,0 +1,71 @@
+"""
+Tests for the columnar ClusterTable against the Cluster object functions
+"""
+import random
+import pytest
+import cluster_data
+import alg_cluster_table
+import alg_hierarchical
+import alg_project3_solution as soln
+
+def _partition(cluster_list):
+    return set([frozenset(cluster.fips_codes()) for cluster in cluster_list])
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_closest_pair_matches_slow_closest_pair(seed):
+    cluster_list = cluster_data.singleton_clusters(cluster_data.synthetic_data_table(3 + 7 * seed, seed))
+    table = alg_cluster_table.table_from_cluster_list(cluster_list)
+    (dist, idx_u, idx_v) = alg_cluster_table.table_closest_pair(table)
+    expected = soln.slow_closest_pair(cluster_list)
+    assert dist == pytest.approx(expected[0])
+    assert cluster_list[idx_u].distance(cluster_list[idx_v]) == pytest.approx(expected[0])
+
+def test_closest_pair_of_a_single_cluster():
+    table = alg_cluster_table.table_from_data_table(cluster_data.synthetic_data_table(1, 0))
+    assert alg_cluster_table.table_closest_pair(table) == (float('inf'), -1, -1)
+
+@pytest.mark.parametrize('seed', range(5))
+def test_hierarchical_matches_heap_clustering(seed):
+    rand = random.Random(seed)
+    data_table = cluster_data.synthetic_data_table(rand.randint(2, 60), seed)
+    num_clusters = rand.randint(1, len(data_table))
+    table = alg_cluster_table.table_from_data_table(data_table)
+    result = alg_cluster_table.table_hierarchical_clustering(table, num_clusters).to_cluster_list()
+    expected = alg_hierarchical.heap_hierarchical_clustering(cluster_data.singleton_clusters(data_table),
+                                                             num_clusters)
+    assert _partition(result) == _partition(expected)
+    assert table.num_clusters() == len(data_table)
+
+@pytest.mark.parametrize('seed', range(5))
+def test_kmeans_matches_kmeans_clustering(seed):
+    rand = random.Random(100 + seed)
+    cluster_list = cluster_data.singleton_clusters(cluster_data.synthetic_data_table(rand.randint(5, 80), seed))
+    num_clusters = rand.randint(1, 10)
+    table = alg_cluster_table.table_from_cluster_list(cluster_list)
+    result = alg_cluster_table.table_kmeans_clustering(table, num_clusters, 4).to_cluster_list()
+    expected = [cluster for cluster in soln.kmeans_clustering(cluster_list, num_clusters, 4)
+                if cluster.total_population() > 0]
+    assert sorted([sorted(cluster.fips_codes()) for cluster in result]) == \
+        sorted([sorted(cluster.fips_codes()) for cluster in expected])
+
+def test_fips_codes_by_cluster_matches_fips_codes():
+    table = alg_cluster_table.table_from_data_table(cluster_data.synthetic_data_table(40, 7))
+    table = alg_cluster_table.table_hierarchical_clustering(table, 6)
+    by_cluster = table.fips_codes_by_cluster()
+    assert list(by_cluster) == table.cluster_ids().tolist()
+    for idx in table.cluster_ids().tolist():
+        assert by_cluster[idx] == table.fips_codes(idx)
+
+def test_round_trip_through_cluster_list():
+    cluster_list = soln.kmeans_clustering(
+        cluster_data.singleton_clusters(cluster_data.synthetic_data_table(30, 8)), 5, 2)
+    result = alg_cluster_table.table_from_cluster_list(cluster_list).to_cluster_list()
+    assert [cluster.fips_codes() for cluster in result] == [cluster.fips_codes() for cluster in cluster_list]
+    assert [cluster.total_population() for cluster in result] == \
+        [cluster.total_population() for cluster in cluster_list]
+
+def test_empty_table():
+    table = alg_cluster_table.table_from_cluster_list([])
+    assert table.to_cluster_list() == []
+    assert table.fips_codes_by_cluster() == {}
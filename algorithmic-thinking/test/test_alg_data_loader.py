@@ -0,0 +1,72 @@
+"""
+Tests for the cached cancer data loader
+"""
+import os
+import random
+import pytest
+import alg_data_loader
+
+def write_csv(file_name, rows):
+    with open(file_name, 'w') as data_file:
+        for row in rows:
+            data_file.write(','.join([str(value) for value in row]) + '\n')
+
+def course_data_table(file_name):
+    """
+    The parsing the course scripts did: split the text into lines and the
+    lines at commas
+    """
+    with open(file_name) as data_file:
+        data_lines = data_file.read().split('\n')
+    table = []
+    for line in data_lines:
+        if line:
+            tokens = line.split(',')
+            table.append([tokens[0], float(tokens[1]), float(tokens[2]), int(tokens[3]), float(tokens[4])])
+    return table
+
+def random_rows(seed, num_rows):
+    rand = random.Random(seed)
+    return [['%05d' % rand.randrange(100000), rand.uniform(0, 1000), rand.uniform(0, 600),
+             rand.randint(1, 10 ** 7), rand.uniform(1e-6, 1e-4)] for _ in range(num_rows)]
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_cached_and_uncached_loads_match_the_course_parser(tmp_path, seed):
+    file_name = str(tmp_path / 'cancer.csv')
+    write_csv(file_name, random_rows(seed, 40 * seed + 1))
+    expected = course_data_table(file_name)
+    assert alg_data_loader.load_data_table(file_name, use_cache=False) == expected
+    assert not os.path.exists(alg_data_loader.cache_file_name(file_name))
+    # the first cached load writes the cache, the second reads it
+    assert alg_data_loader.load_data_table(file_name) == expected
+    assert os.path.exists(alg_data_loader.cache_file_name(file_name))
+    assert alg_data_loader.load_data_table(file_name) == expected
+
+def test_edited_csv_is_parsed_again(tmp_path):
+    file_name = str(tmp_path / 'cancer.csv')
+    write_csv(file_name, random_rows(5, 10))
+    alg_data_loader.load_data_table(file_name)
+    write_csv(file_name, random_rows(6, 12))
+    stat = os.stat(file_name)
+    os.utime(file_name, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert alg_data_loader.load_data_table(file_name) == course_data_table(file_name)
+    assert len(alg_data_loader.load_cancer_records(file_name)) == 12
+
+def test_blank_lines_and_empty_files(tmp_path):
+    file_name = str(tmp_path / 'cancer.csv')
+    with open(file_name, 'w') as data_file:
+        data_file.write('01001,1.5,2.5,100,0.00001\n\n01003,3.5,4.5,200,0.00002\n\n')
+    assert alg_data_loader.load_data_table(file_name) == course_data_table(file_name)
+    empty_name = str(tmp_path / 'empty.csv')
+    write_csv(empty_name, [])
+    assert alg_data_loader.load_data_table(empty_name) == []
+    assert alg_data_loader.load_data_table(empty_name) == []
+
+def test_clusters_are_singletons(tmp_path):
+    file_name = str(tmp_path / 'cancer.csv')
+    rows = random_rows(8, 5)
+    write_csv(file_name, rows)
+    clusters = alg_data_loader.load_cancer_clusters(file_name)
+    assert [cluster.fips_codes() for cluster in clusters] == [set([row[0]]) for row in rows]
+    assert [cluster.total_population() for cluster in clusters] == [row[3] for row in rows]
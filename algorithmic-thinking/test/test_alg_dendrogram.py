@@ -0,0 +1,56 @@
+"""
+Tests for the Dendrogram merge history against heap_hierarchical_clustering
+"""
+import pytest
+import cluster_data
+import alg_hierarchical
+import alg_project3_solution as soln
+
+def _summary(cluster_list):
+    return [(cluster.fips_codes(), cluster.total_population(), round(cluster.horiz_center(), 9),
+             round(cluster.vert_center(), 9), round(cluster.averaged_risk(), 12)) for cluster in cluster_list]
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_cut_matches_heap_clustering_at_every_count(seed):
+    cluster_list = cluster_data.singleton_clusters(cluster_data.synthetic_data_table(12 + 9 * seed, seed))
+    dendrogram = alg_hierarchical.Dendrogram(cluster_list)
+    for num_clusters in range(1, len(cluster_list) + 1):
+        expected = alg_hierarchical.heap_hierarchical_clustering(cluster_list, num_clusters)
+        assert _summary(dendrogram.cut(num_clusters)) == _summary(expected)
+
+def test_distortion_matches_the_curve():
+    data_table = cluster_data.synthetic_data_table(25, 6)
+    cluster_list = cluster_data.singleton_clusters(data_table)
+    dendrogram = alg_hierarchical.Dendrogram(cluster_list)
+    counts = range(1, 26)
+    curve = alg_hierarchical.hierarchical_distortion_curve(cluster_list, counts)
+    assert [dendrogram.distortion(num_clusters) for num_clusters in counts] == \
+        pytest.approx([curve[num_clusters] for num_clusters in counts])
+
+def test_merges_track_cluster_sizes():
+    start = soln.kmeans_clustering(cluster_data.singleton_clusters(cluster_data.synthetic_data_table(40, 2)), 7, 2)
+    dendrogram = alg_hierarchical.Dendrogram(start)
+    merges = dendrogram.merges()
+    assert dendrogram.num_leaves() == 7
+    assert len(merges) == 6
+    assert merges[-1][3] == 40
+    sizes = dict([(idx, len(start[idx].fips_codes())) for idx in range(7)])
+    for (idx_u, idx_v, _, size) in merges:
+        sizes[idx_u] += sizes.pop(idx_v)
+        assert size == sizes[idx_u]
+
+def test_counts_outside_the_range_are_clamped():
+    cluster_list = cluster_data.singleton_clusters(cluster_data.synthetic_data_table(5, 3))
+    dendrogram = alg_hierarchical.Dendrogram(cluster_list)
+    assert _summary(dendrogram.cut(50)) == _summary(cluster_list)
+    assert len(dendrogram.cut(0)) == 1
+    assert dendrogram.distortion(5) == 0.0
+
+def test_single_and_empty_inputs():
+    single = alg_hierarchical.Dendrogram(cluster_data.singleton_clusters(cluster_data.synthetic_data_table(1, 0)))
+    assert single.merges() == []
+    assert len(single.cut(1)) == 1
+    empty = alg_hierarchical.Dendrogram([])
+    assert empty.cut(1) == []
+    assert empty.distortion(1) == 0.0
@@ -0,0 +1,61 @@
+"""
+Tests for the distortion computed during clustering against cluster_error
+"""
+import random
+import pytest
+import cluster_data
+import alg_cluster
+import alg_hierarchical
+import alg_kmeans
+import alg_project3_solution as soln
+
+def total_cluster_error(cluster_list, data_table):
+    """
+    Distortion the slow way: cluster_error of every cluster, without the index
+    """
+    return sum([cluster.cluster_error(data_table) for cluster in cluster_list])
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_curve_matches_cluster_error(seed):
+    data_table = cluster_data.synthetic_data_table(random.Random(seed).randint(5, 45), seed)
+    cluster_list = cluster_data.singleton_clusters(data_table)
+    counts = range(1, len(data_table) + 1, 3)
+    curve = alg_hierarchical.hierarchical_distortion_curve(cluster_list, counts)
+    assert sorted(curve) == sorted(counts)
+    for num_clusters in counts:
+        clusters = alg_hierarchical.heap_hierarchical_clustering(cluster_list, num_clusters)
+        assert curve[num_clusters] == pytest.approx(total_cluster_error(clusters, data_table), rel=1e-9, abs=1e-6)
+
+def test_curve_from_merged_clusters_needs_the_data_table():
+    data_table = cluster_data.synthetic_data_table(30, 9)
+    start = soln.kmeans_clustering(cluster_data.singleton_clusters(data_table), 8, 2)
+    curve = alg_hierarchical.hierarchical_distortion_curve(start, [8, 4, 1], data_table)
+    assert curve[8] == pytest.approx(total_cluster_error(start, data_table))
+    for num_clusters in (4, 1):
+        clusters = alg_hierarchical.heap_hierarchical_clustering(start, num_clusters)
+        assert curve[num_clusters] == pytest.approx(total_cluster_error(clusters, data_table))
+
+def test_curve_skips_counts_above_the_start():
+    cluster_list = cluster_data.singleton_clusters(cluster_data.synthetic_data_table(6, 1))
+    assert alg_hierarchical.hierarchical_distortion_curve(cluster_list, [10, 6]) == {6: 0.0}
+
+@pytest.mark.parametrize('seed', range(3))
+def test_kmeans_distortion_matches_cluster_error(seed):
+    data_table = cluster_data.synthetic_data_table(50, seed)
+    cluster_list = cluster_data.singleton_clusters(data_table)
+    (fips, horiz, vert, pop, risk) = alg_kmeans.cluster_arrays(cluster_list)
+    (assignment, center_horiz, center_vert, _, _) = alg_kmeans.kmeans_arrays(horiz, vert, pop, risk, 6, 3)
+    expected = total_cluster_error(alg_kmeans.numpy_kmeans_clustering(cluster_list, 6, 3), data_table)
+    result = alg_kmeans.kmeans_distortion(assignment, center_horiz, center_vert, horiz, vert, pop)
+    assert result == pytest.approx(expected)
+
+def test_indexed_cluster_error_matches_unindexed():
+    data_table = cluster_data.synthetic_data_table(20, 4)
+    fips_to_line = alg_cluster.fips_index(data_table)
+    assert [data_table[fips_to_line[line[0]]] for line in data_table] == data_table
+    cluster = alg_hierarchical.heap_hierarchical_clustering(cluster_data.singleton_clusters(data_table), 1)[0]
+    assert cluster.cluster_error(data_table, fips_to_line) == cluster.cluster_error(data_table)
+
+def test_fips_index_of_an_empty_table():
+    assert alg_cluster.fips_index([]) == {}
@@ -0,0 +1,58 @@
+"""
+Tests for the heap-driven hierarchical clustering in alg_hierarchical
+"""
+import random
+import pytest
+import cluster_data
+import alg_hierarchical
+import alg_project3_solution as soln
+
+def slow_hierarchical(cluster_list, num_clusters):
+    """
+    The course algorithm: merge the exact closest pair (slow_closest_pair)
+    until num_clusters remain
+    """
+    clusters = [cluster.copy() for cluster in cluster_list]
+    while len(clusters) > num_clusters:
+        (_, idx_u, idx_v) = soln.slow_closest_pair(clusters)
+        (cluster_u, cluster_v) = (clusters[idx_u], clusters[idx_v])
+        clusters.remove(cluster_u)
+        clusters.remove(cluster_v)
+        clusters.append(cluster_u.merge_clusters(cluster_v))
+    return clusters
+
+def assert_same_clusters(result, expected):
+    assert [cluster.fips_codes() for cluster in result] == [cluster.fips_codes() for cluster in expected]
+    for (cluster, other) in zip(result, expected):
+        assert cluster.horiz_center() == pytest.approx(other.horiz_center())
+        assert cluster.vert_center() == pytest.approx(other.vert_center())
+        assert cluster.total_population() == other.total_population()
+        assert cluster.averaged_risk() == pytest.approx(other.averaged_risk())
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_matches_slow_closest_pair_clustering(seed):
+    rand = random.Random(seed)
+    num_counties = rand.randint(2, 40)
+    cluster_list = cluster_data.singleton_clusters(cluster_data.synthetic_data_table(num_counties, seed))
+    num_clusters = rand.randint(1, num_counties)
+    assert_same_clusters(alg_hierarchical.heap_hierarchical_clustering(cluster_list, num_clusters),
+                         slow_hierarchical(cluster_list, num_clusters))
+
+def test_single_cluster_holds_every_county():
+    data_table = cluster_data.synthetic_data_table(25, 3)
+    result = alg_hierarchical.heap_hierarchical_clustering(cluster_data.singleton_clusters(data_table), 1)
+    assert len(result) == 1
+    assert result[0].fips_codes() == set([line[0] for line in data_table])
+    assert result[0].total_population() == sum([line[3] for line in data_table])
+
+def test_input_is_not_mutated():
+    cluster_list = cluster_data.singleton_clusters(cluster_data.synthetic_data_table(15, 4))
+    before = [(cluster.fips_codes().copy(), cluster.horiz_center()) for cluster in cluster_list]
+    alg_hierarchical.heap_hierarchical_clustering(cluster_list, 3)
+    assert [(cluster.fips_codes(), cluster.horiz_center()) for cluster in cluster_list] == before
+
+def test_empty_and_already_small_lists():
+    assert alg_hierarchical.heap_hierarchical_clustering([], 3) == []
+    cluster_list = cluster_data.singleton_clusters(cluster_data.synthetic_data_table(4, 5))
+    assert_same_clusters(alg_hierarchical.heap_hierarchical_clustering(cluster_list, 9), cluster_list)
@@ -0,0 +1,56 @@
+"""
+Tests for the NumPy k-means in alg_kmeans against kmeans_clustering
+"""
+import random
+import numpy as np
+import pytest
+import cluster_data
+import alg_kmeans
+import alg_project3_solution as soln
+
+def _random_clusters(seed, num_counties):
+    return cluster_data.singleton_clusters(cluster_data.synthetic_data_table(num_counties, seed))
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_numpy_kmeans_matches_kmeans_clustering(seed):
+    rand = random.Random(seed)
+    cluster_list = _random_clusters(seed, rand.randint(5, 120))
+    num_clusters = rand.randint(1, min(12, len(cluster_list)))
+    num_iterations = rand.randint(1, 6)
+    expected = soln.kmeans_clustering(cluster_list, num_clusters, num_iterations)
+    result = alg_kmeans.numpy_kmeans_clustering(cluster_list, num_clusters, num_iterations)
+    #
+    assert [cluster.fips_codes() for cluster in result] == [cluster.fips_codes() for cluster in expected]
+    for (cluster, other) in zip(result, expected):
+        assert cluster.total_population() == other.total_population()
+        assert cluster.horiz_center() == pytest.approx(other.horiz_center())
+        assert cluster.vert_center() == pytest.approx(other.vert_center())
+        assert cluster.averaged_risk() == pytest.approx(other.averaged_risk())
+
+def test_one_cluster_is_the_weighted_mean():
+    cluster_list = _random_clusters(11, 30)
+    (fips, horiz, vert, pop, risk) = alg_kmeans.cluster_arrays(cluster_list)
+    result = alg_kmeans.numpy_kmeans_clustering(cluster_list, 1, 3)
+    assert len(result) == 1
+    assert result[0].horiz_center() == pytest.approx(np.sum(pop * horiz) / np.sum(pop))
+    assert result[0].total_population() == int(np.sum(pop))
+
+def test_assignment_ties_go_to_the_lowest_center():
+    horiz = np.array([0.0, 2.0])
+    vert = np.array([0.0, 0.0])
+    assignment = alg_kmeans.assign_to_centers(horiz, vert, np.array([1.0, 1.0, -1.0]), np.array([0.0, 0.0, 0.0]))
+    assert assignment.tolist() == [0, 0]
+
+def test_empty_cluster_sits_at_the_origin():
+    assignment = np.array([0, 0])
+    ones = np.ones(2)
+    (center_horiz, center_vert, total_pop, avg_risk) = alg_kmeans.weighted_centers(assignment, 2, ones, ones,
+                                                                                   ones, ones)
+    assert (center_horiz[1], center_vert[1], total_pop[1], avg_risk[1]) == (0.0, 0.0, 0.0, 0.0)
+
+def test_input_clusters_are_not_mutated():
+    cluster_list = _random_clusters(2, 20)
+    before = [(cluster.fips_codes().copy(), cluster.total_population()) for cluster in cluster_list]
+    alg_kmeans.numpy_kmeans_clustering(cluster_list, 4, 3)
+    assert [(cluster.fips_codes(), cluster.total_population()) for cluster in cluster_list] == before
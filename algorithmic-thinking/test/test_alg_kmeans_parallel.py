@@ -0,0 +1,65 @@
+"""
+Tests for the seeded k-means sweep in alg_kmeans_parallel
+"""
+import numpy as np
+import pytest
+import cluster_data
+import alg_kmeans
+import alg_kmeans_parallel
+import alg_project3_solution as soln
+
+DATA_TABLE = cluster_data.synthetic_data_table(90, 21)
+CLUSTER_LIST = cluster_data.singleton_clusters(DATA_TABLE)
+
+def _fips_lists(cluster_list):
+    return [sorted(cluster.fips_codes()) for cluster in cluster_list]
+
+
+def test_first_init_matches_kmeans_clustering():
+    sweep = alg_kmeans_parallel.parallel_kmeans_sweep(CLUSTER_LIST, [1, 4, 9], 3, num_restarts=5,
+                                                      init_method='first', max_workers=1)
+    assert sorted(sweep) == [1, 4, 9]
+    for num_clusters in sweep:
+        (distortion, clusters) = sweep[num_clusters]
+        expected = soln.kmeans_clustering(CLUSTER_LIST, num_clusters, 3)
+        assert _fips_lists(clusters) == _fips_lists(expected)
+        assert distortion == pytest.approx(sum([cluster.cluster_error(DATA_TABLE) for cluster in expected]))
+
+def test_results_do_not_depend_on_the_pool_size():
+    in_process = alg_kmeans_parallel.parallel_kmeans_sweep(CLUSTER_LIST, [3, 6], 4, num_restarts=3,
+                                                           seed=5, max_workers=1)
+    pooled = alg_kmeans_parallel.parallel_kmeans_sweep(CLUSTER_LIST, [3, 6], 4, num_restarts=3,
+                                                       seed=5, max_workers=2)
+    for num_clusters in (3, 6):
+        assert pooled[num_clusters][0] == in_process[num_clusters][0]
+        assert _fips_lists(pooled[num_clusters][1]) == _fips_lists(in_process[num_clusters][1])
+
+@pytest.mark.parametrize('init_method', ['random', 'kmeans++'])
+def test_restarts_never_raise_the_distortion(init_method):
+    once = alg_kmeans_parallel.parallel_kmeans_sweep(CLUSTER_LIST, [5], 3, num_restarts=1,
+                                                     init_method=init_method, seed=2, max_workers=1)
+    # the first restart of the longer run uses the same seed as the single run
+    several = alg_kmeans_parallel.parallel_kmeans_sweep(CLUSTER_LIST, [5], 3, num_restarts=4,
+                                                        init_method=init_method, seed=2, max_workers=1)
+    assert several[5][0] <= once[5][0] or np.isclose(several[5][0], once[5][0])
+
+@pytest.mark.parametrize('init_method', ['first', 'random', 'kmeans++'])
+def test_initial_centers_are_data_points(init_method):
+    (_, horiz, vert, pop, _) = alg_kmeans.cluster_arrays(CLUSTER_LIST)
+    (center_horiz, center_vert) = alg_kmeans_parallel.initial_centers(horiz, vert, pop, 7, init_method,
+                                                                      np.random.default_rng(0))
+    points = set(zip(horiz.tolist(), vert.tolist()))
+    assert len(center_horiz) == 7
+    assert set(zip(center_horiz.tolist(), center_vert.tolist())) <= points
+
+def test_kmeans_plus_plus_with_one_point_per_center():
+    horiz = np.array([1.0, 1.0, 4.0])
+    vert = np.array([2.0, 2.0, 0.0])
+    (center_horiz, _) = alg_kmeans_parallel.kmeans_plus_plus_centers(horiz, vert, np.ones(3), 3,
+                                                                     np.random.default_rng(1))
+    assert sorted(center_horiz.tolist())[-1] == 4.0
+
+def test_unknown_init_method():
+    with pytest.raises(ValueError):
+        alg_kmeans_parallel.initial_centers(np.zeros(2), np.zeros(2), np.ones(2), 1, 'spread',
+                                            np.random.default_rng(0))
@@ -0,0 +1,78 @@
+"""
+Tests for streaming k-means against the in-memory kmeans_arrays
+"""
+import random
+import numpy as np
+import pytest
+import cluster_data
+import alg_kmeans
+import alg_kmeans_stream
+import alg_project3_solution as soln
+
+def _columns(data_table):
+    return tuple(np.array([line[col] for line in data_table], dtype=np.float64) for col in range(1, 5))
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_exact_passes_match_kmeans_arrays(seed):
+    rand = random.Random(seed)
+    data_table = cluster_data.synthetic_data_table(rand.randint(10, 200), seed)
+    num_clusters = rand.randint(1, 9)
+    num_iterations = rand.randint(1, 5)
+    batch_size = rand.randint(1, 64)
+    (center_horiz, center_vert, total_pop, avg_risk, distortion) = alg_kmeans_stream.streaming_kmeans(
+        lambda: alg_kmeans_stream.iter_batches(data_table, batch_size), num_clusters, num_iterations)
+    #
+    (horiz, vert, pop, risk) = _columns(data_table)
+    (assignment, exp_horiz, exp_vert, exp_pop, exp_risk) = alg_kmeans.kmeans_arrays(horiz, vert, pop, risk,
+                                                                                     num_clusters, num_iterations)
+    assert center_horiz == pytest.approx(exp_horiz)
+    assert center_vert == pytest.approx(exp_vert)
+    assert total_pop == pytest.approx(exp_pop)
+    assert avg_risk == pytest.approx(exp_risk)
+    assert distortion == pytest.approx(alg_kmeans.kmeans_distortion(assignment, exp_horiz, exp_vert,
+                                                                     horiz, vert, pop))
+
+def test_centers_match_kmeans_clustering():
+    data_table = cluster_data.synthetic_data_table(80, 12)
+    result = alg_kmeans_stream.streaming_kmeans(lambda: alg_kmeans_stream.iter_batches(data_table, 7), 5, 3)
+    expected = soln.kmeans_clustering(cluster_data.singleton_clusters(data_table), 5, 3)
+    assert result[0] == pytest.approx([cluster.horiz_center() for cluster in expected])
+    assert result[2] == pytest.approx([cluster.total_population() for cluster in expected])
+
+def test_minibatch_passes_keep_weighted_means():
+    data_table = cluster_data.synthetic_data_table(60, 1)
+    (horiz, vert, pop, _) = _columns(data_table)
+    model = alg_kmeans_stream.StreamingKMeans(1)
+    for batch in alg_kmeans_stream.iter_batches(data_table, 9):
+        model.partial_fit(*batch)
+    assert model.centers()[0][0] == pytest.approx(np.sum(pop * horiz) / np.sum(pop))
+    assert model.centers()[1][0] == pytest.approx(np.sum(pop * vert) / np.sum(pop))
+
+def test_minibatch_then_exact_assigns_every_point():
+    data_table = cluster_data.synthetic_data_table(150, 4)
+    source = lambda: alg_kmeans_stream.iter_batches(data_table, 25)
+    warm = alg_kmeans_stream.streaming_kmeans(source, 6, 3, num_minibatch_passes=2)
+    assert np.sum(warm[2]) == pytest.approx(sum([line[3] for line in data_table]))
+    assert warm[4] >= 0.0
+
+def test_iterations_below_one_are_rejected():
+    data_table = cluster_data.synthetic_data_table(10, 0)
+    with pytest.raises(ValueError):
+        alg_kmeans_stream.streaming_kmeans(lambda: alg_kmeans_stream.iter_batches(data_table, 4), 2, 0)
+
+def test_iter_batches_splits_and_keeps_order():
+    data_table = cluster_data.synthetic_data_table(11, 2)
+    batches = list(alg_kmeans_stream.iter_batches(iter(data_table), 4))
+    assert [len(batch[0]) for batch in batches] == [4, 4, 3]
+    assert np.concatenate([batch[2] for batch in batches]).tolist() == [float(line[3]) for line in data_table]
+    assert list(alg_kmeans_stream.iter_batches([], 4)) == []
+
+def test_file_batches_match_the_table(tmp_path):
+    data_table = cluster_data.synthetic_data_table(9, 5)
+    file_name = str(tmp_path / 'cancer.csv')
+    with open(file_name, 'w') as data_file:
+        for line in data_table:
+            data_file.write(','.join([str(value) for value in line]) + '\n')
+    batches = list(alg_kmeans_stream.iter_file_batches(file_name, 5))
+    assert np.concatenate([batch[0] for batch in batches]).tolist() == [line[1] for line in data_table]
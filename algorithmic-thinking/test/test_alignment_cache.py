@@ -0,0 +1,78 @@
+"""
+Tests for the alignment result cache
+"""
+import os
+import random
+import sequence_alignment
+from alignment_cache import AlignmentCache, alignment_key
+
+GSA = 'dynamic-programming/genome-sequence-alignment.py'
+
+class CountingAligner:
+    """
+    Global alignment that counts its calls
+    """
+
+    def __init__(self):
+        self.__name__ = 'compute_global_alignment_linear'
+        self.calls = 0
+
+    def __call__(self, seq_x, seq_y, scoring_matrix):
+        self.calls += 1
+        return sequence_alignment.compute_global_alignment_linear(seq_x, seq_y, scoring_matrix)
+
+def _pairs(seed, count):
+    rand = random.Random(seed)
+    return [(''.join([rand.choice('ACGT') for _ in range(rand.randint(0, 12))]),
+             ''.join([rand.choice('ACGT') for _ in range(rand.randint(0, 12))])) for _ in range(count)]
+
+
+def test_cached_results_match_the_course_alignment(load_script):
+    gsa = load_script(GSA)
+    scoring_matrix = gsa['build_scoring_matrix'](set('ACGT'), 10, 4, -6)
+    cache = AlignmentCache()
+    aligner = CountingAligner()
+    for (seq_x, seq_y) in _pairs(1, 8) * 2:
+        dp_table = gsa['compute_alignment_matrix'](seq_x, seq_y, scoring_matrix, True)
+        assert cache.cached(aligner, seq_x, seq_y, scoring_matrix) == \
+            gsa['compute_global_alignment'](seq_x, seq_y, scoring_matrix, dp_table)
+    assert aligner.calls == len(set(_pairs(1, 8)))
+
+def test_least_recently_used_results_are_dropped():
+    cache = AlignmentCache(max_entries=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert (cache.get('a'), cache.get('b'), cache.get('c')) == (1, None, 3)
+    assert len(cache) == 2
+
+def test_results_survive_on_disk(tmp_path, load_script):
+    scoring_matrix = load_script(GSA)['build_scoring_matrix'](set('ACGT'), 5, -2, -3)
+    cache_dir = str(tmp_path / 'cache')
+    first = AlignmentCache(cache_dir, max_entries=1)
+    aligner = CountingAligner()
+    expected = [first.cached(aligner, seq_x, seq_y, scoring_matrix) for (seq_x, seq_y) in _pairs(2, 4)]
+    # a fresh cache, as in the next run, reads every result back from disk
+    second = AlignmentCache(cache_dir)
+    assert [second.cached(aligner, seq_x, seq_y, scoring_matrix) for (seq_x, seq_y) in _pairs(2, 4)] == expected
+    assert aligner.calls == len(set(_pairs(2, 4)))
+    assert not [name for name in os.listdir(cache_dir) if name.endswith('.tmp')]
+
+def test_clear_drops_memory_and_disk(tmp_path):
+    cache = AlignmentCache(str(tmp_path / 'cache'))
+    cache.put('k', (1, 'A', 'A'))
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.get('k') is None
+    AlignmentCache(str(tmp_path / 'missing')).clear()
+
+def test_keys_cover_every_input():
+    scoring_matrix = {'A': {'A': 1, '-': -1}, '-': {'A': -1, '-': 0}}
+    other_matrix = {'A': {'A': 2, '-': -1}, '-': {'A': -1, '-': 0}}
+    keys = set([alignment_key('f', 'A', 'AA', scoring_matrix, ()), alignment_key('g', 'A', 'AA', scoring_matrix, ()),
+                alignment_key('f', 'AA', 'A', scoring_matrix, ()), alignment_key('f', 'A', 'AA', other_matrix, ()),
+                alignment_key('f', 'A', 'AA', scoring_matrix, (True,))])
+    assert len(keys) == 5
+    reordered = {'-': {'-': 0, 'A': -1}, 'A': {'-': -1, 'A': 1}}
+    assert alignment_key('f', '', '', scoring_matrix, ()) == alignment_key('f', '', '', reordered, ())
@@ -0,0 +1,62 @@
+"""
+Tests for the vectorized alignment rows over integer-encoded sequences
+"""
+import random
+import numpy as np
+import pytest
+import sequence_alignment
+
+GSA = 'dynamic-programming/genome-sequence-alignment.py'
+
+def asymmetric_matrix(rand, alphabet):
+    """
+    A scoring matrix with different scores for (a, b) and (b, a) and for the
+    up and left moves, so swapped indices would show
+    """
+    chars = alphabet + '-'
+    return dict((row_char, dict((col_char, rand.randint(-7, -1) if '-' in row_char + col_char
+                                 else rand.randint(-3, 9)) for col_char in chars)) for row_char in chars)
+
+
+@pytest.mark.parametrize('global_flag', [True, False])
+@pytest.mark.parametrize('seed', range(5))
+def test_matrix_matches_compute_alignment_matrix(load_script, seed, global_flag):
+    gsa = load_script(GSA)
+    rand = random.Random(seed)
+    alphabet = 'ACGT'[:rand.randint(1, 4)]
+    scoring_matrix = asymmetric_matrix(rand, alphabet)
+    for _ in range(4):
+        seq_x = ''.join([rand.choice(alphabet) for _ in range(rand.randint(0, 20))])
+        seq_y = ''.join([rand.choice(alphabet) for _ in range(rand.randint(0, 20))])
+        expected = gsa['compute_alignment_matrix'](seq_x, seq_y, scoring_matrix, global_flag)
+        assert sequence_alignment.compute_alignment_matrix_numpy(seq_x, seq_y, scoring_matrix,
+                                                                 global_flag) == expected
+        assert sequence_alignment.compute_alignment_score_numpy(seq_x, seq_y, scoring_matrix, global_flag) == \
+            sequence_alignment.compute_alignment_score(seq_x, seq_y, scoring_matrix, global_flag)
+
+def test_numpy_matrix_feeds_the_tracebacks(load_script):
+    gsa = load_script(GSA)
+    scoring_matrix = gsa['build_scoring_matrix'](set('ACGT'), 10, 2, -4)
+    (seq_x, seq_y) = ('GATTACAGG', 'GCATGCTTA')
+    for (global_flag, traceback) in ((True, 'compute_global_alignment'), (False, 'compute_local_alignment')):
+        dp_table = sequence_alignment.compute_alignment_matrix_numpy(seq_x, seq_y, scoring_matrix, global_flag)
+        assert gsa[traceback](seq_x, seq_y, scoring_matrix, dp_table) == \
+            gsa[traceback](seq_x, seq_y, scoring_matrix,
+                           gsa['compute_alignment_matrix'](seq_x, seq_y, scoring_matrix, global_flag))
+
+def test_empty_sequences(load_script):
+    gsa = load_script(GSA)
+    scoring_matrix = gsa['build_scoring_matrix'](set('AC'), 3, -1, -2)
+    for (seq_x, seq_y) in (('', ''), ('', 'CA'), ('AAC', '')):
+        for global_flag in (True, False):
+            assert sequence_alignment.compute_alignment_matrix_numpy(seq_x, seq_y, scoring_matrix, global_flag) == \
+                gsa['compute_alignment_matrix'](seq_x, seq_y, scoring_matrix, global_flag)
+
+def test_dense_table_and_codes():
+    scoring_matrix = {'-': {'-': 0, 'B': -2, 'A': -1}, 'A': {'-': -3, 'A': 4, 'B': 1},
+                      'B': {'-': -4, 'A': 2, 'B': 5}}
+    (char_index, score_table) = sequence_alignment.dense_scoring_matrix(scoring_matrix)
+    assert char_index == {'A': 0, 'B': 1, '-': 2}
+    assert score_table.tolist() == [[4, 1, -3], [2, 5, -4], [-1, -2, 0]]
+    assert sequence_alignment.encode_sequence('BAB', char_index).tolist() == [1, 0, 1]
+    assert sequence_alignment.encode_sequence('', char_index).dtype == np.intp
@@ -0,0 +1,65 @@
+"""
+Tests for the score-only alignment and the null distribution built on it
+"""
+import random
+import pytest
+import sequence_alignment
+
+GSA = 'dynamic-programming/genome-sequence-alignment.py'
+
+def matrix_score(gsa, seq_x, seq_y, scoring_matrix, global_flag):
+    """
+    Score read off the full alignment matrix: bottom right or largest entry
+    """
+    dp_table = gsa['compute_alignment_matrix'](seq_x, seq_y, scoring_matrix, global_flag)
+    if global_flag:
+        return dp_table[-1][-1]
+    return max([max(row) for row in dp_table])
+
+
+@pytest.mark.parametrize('global_flag', [True, False])
+@pytest.mark.parametrize('seed', range(5))
+def test_matches_the_alignment_matrix(load_script, seed, global_flag):
+    gsa = load_script(GSA)
+    rand = random.Random(seed)
+    alphabet = 'ACDEFGHIKL'[:rand.randint(2, 10)]
+    scoring_matrix = gsa['build_scoring_matrix'](set(alphabet), rand.randint(1, 10), rand.randint(-5, 3),
+                                                 rand.randint(-8, 0))
+    for _ in range(6):
+        seq_x = ''.join([rand.choice(alphabet) for _ in range(rand.randint(0, 25))])
+        seq_y = ''.join([rand.choice(alphabet) for _ in range(rand.randint(0, 25))])
+        assert sequence_alignment.compute_alignment_score(seq_x, seq_y, scoring_matrix, global_flag) == \
+            matrix_score(gsa, seq_x, seq_y, scoring_matrix, global_flag)
+
+def test_local_score_is_the_traceback_score(load_script):
+    gsa = load_script(GSA)
+    rand = random.Random(7)
+    scoring_matrix = gsa['build_scoring_matrix'](set('ACGT'), 5, -3, -4)
+    for _ in range(10):
+        seq_x = ''.join([rand.choice('ACGT') for _ in range(rand.randint(1, 20))])
+        seq_y = ''.join([rand.choice('ACGT') for _ in range(rand.randint(1, 20))])
+        dp_table = gsa['compute_alignment_matrix'](seq_x, seq_y, scoring_matrix, False)
+        expected = gsa['compute_local_alignment'](seq_x, seq_y, scoring_matrix, dp_table)[0]
+        assert sequence_alignment.compute_alignment_score(seq_x, seq_y, scoring_matrix, False) == expected
+
+def test_empty_sequences_score_zero_locally(load_script):
+    scoring_matrix = load_script(GSA)['build_scoring_matrix'](set('AC'), 2, -1, -2)
+    assert sequence_alignment.compute_alignment_score('', '', scoring_matrix, True) == 0
+    assert sequence_alignment.compute_alignment_score('ACCA', '', scoring_matrix, True) == -8
+    assert sequence_alignment.compute_alignment_score('', 'AC', scoring_matrix, False) == 0
+
+def test_null_distribution_matches_matrix_trials(load_script):
+    gsa = load_script(GSA)
+    scoring_matrix = gsa['build_scoring_matrix'](set('ACGT'), 6, -2, -3)
+    (seq_x, seq_y) = ('ACGTTGCAAGT', 'TTGACGCATG')
+    random.seed(13)
+    result = gsa['generate_null_distribution'](seq_x, seq_y, scoring_matrix, 40)
+    # the same shuffles, scored from the full local alignment matrix
+    random.seed(13)
+    expected = {}
+    for _ in range(40):
+        list_seq_y = list(seq_y)
+        random.shuffle(list_seq_y)
+        score = matrix_score(gsa, seq_x, ''.join(list_seq_y), scoring_matrix, False)
+        expected[score] = expected.get(score, 0) + 1
+    assert result == expected
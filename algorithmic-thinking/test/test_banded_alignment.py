@@ -0,0 +1,80 @@
+"""
+Tests for the banded global alignment against compute_global_alignment
+"""
+import random
+import pytest
+import sequence_alignment
+
+GSA = 'dynamic-programming/genome-sequence-alignment.py'
+
+def mutate(rand, sequence, alphabet, num_edits):
+    """
+    Apply random substitutions, insertions and deletions to a sequence
+    """
+    chars = list(sequence)
+    for _ in range(num_edits):
+        pos = rand.randrange(len(chars) + 1)
+        edit = rand.randrange(3)
+        if edit == 0 and pos < len(chars):
+            chars[pos] = rand.choice(alphabet)
+        elif edit == 1:
+            chars.insert(pos, rand.choice(alphabet))
+        elif pos < len(chars):
+            del chars[pos]
+    return ''.join(chars)
+
+def alignment_sum(align_x, align_y, scoring_matrix):
+    return sum([scoring_matrix[char_x][char_y] for (char_x, char_y) in zip(align_x, align_y)])
+
+def course_alignment(gsa, seq_x, seq_y, scoring_matrix):
+    dp_table = gsa['compute_alignment_matrix'](seq_x, seq_y, scoring_matrix, True)
+    return gsa['compute_global_alignment'](seq_x, seq_y, scoring_matrix, dp_table)
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_full_band_is_compute_global_alignment(load_script, seed):
+    gsa = load_script(GSA)
+    rand = random.Random(seed)
+    scoring_matrix = gsa['build_scoring_matrix'](set('ACGT'), rand.randint(2, 10), rand.randint(-4, 1),
+                                                 rand.randint(-6, -1))
+    seq_x = ''.join([rand.choice('ACGT') for _ in range(rand.randint(0, 30))])
+    seq_y = ''.join([rand.choice('ACGT') for _ in range(rand.randint(0, 30))])
+    assert sequence_alignment.compute_banded_alignment(seq_x, seq_y, scoring_matrix, band_width=31) == \
+        course_alignment(gsa, seq_x, seq_y, scoring_matrix)
+
+@pytest.mark.parametrize('seed', range(6))
+def test_similar_sequences_get_the_optimal_score(load_script, seed):
+    gsa = load_script(GSA)
+    rand = random.Random(100 + seed)
+    scoring_matrix = gsa['build_scoring_matrix'](set('ACDEFGHIKLMNPQRSTVWY'), 6, -2, -4)
+    seq_x = ''.join([rand.choice('ACDEFGHIKLMNPQRSTVWY') for _ in range(rand.randint(40, 120))])
+    seq_y = mutate(rand, seq_x, 'ACDEFGHIKLMNPQRSTVWY', rand.randint(0, 12))
+    (score, align_x, align_y) = sequence_alignment.compute_banded_alignment(seq_x, seq_y, scoring_matrix,
+                                                                            band_width=2)
+    assert score == course_alignment(gsa, seq_x, seq_y, scoring_matrix)[0]
+    assert (align_x.replace('-', ''), align_y.replace('-', '')) == (seq_x, seq_y)
+    assert alignment_sum(align_x, align_y, scoring_matrix) == score
+
+def test_band_grows_past_a_long_gap(load_script):
+    gsa = load_script(GSA)
+    scoring_matrix = gsa['build_scoring_matrix'](set('ACGT'), 5, -3, -1)
+    seq_x = 'ACGTACGGTCAT' * 3
+    seq_y = seq_x[:6] + 'T' * 20 + seq_x[6:]
+    result = sequence_alignment.compute_banded_alignment(seq_x, seq_y, scoring_matrix, band_width=1)
+    assert result[0] == course_alignment(gsa, seq_x, seq_y, scoring_matrix)[0]
+
+def test_banded_matrix_is_the_full_matrix_inside_a_wide_band(load_script):
+    gsa = load_script(GSA)
+    scoring_matrix = gsa['build_scoring_matrix'](set('AC'), 3, -1, -2)
+    (seq_x, seq_y) = ('ACCAC', 'CACA')
+    (band_rows, row_starts) = sequence_alignment.compute_banded_alignment_matrix(seq_x, seq_y, scoring_matrix,
+                                                                                -5, 4)
+    assert row_starts == [0] * 6
+    assert band_rows == gsa['compute_alignment_matrix'](seq_x, seq_y, scoring_matrix, True)
+
+@pytest.mark.parametrize('seq_x, seq_y', [('', ''), ('ACG', ''), ('', 'GT'), ('A', 'A')])
+def test_empty_sequences(load_script, seq_x, seq_y):
+    gsa = load_script(GSA)
+    scoring_matrix = gsa['build_scoring_matrix'](set('ACGT'), 4, -1, -2)
+    assert sequence_alignment.compute_banded_alignment(seq_x, seq_y, scoring_matrix, band_width=0) == \
+        course_alignment(gsa, seq_x, seq_y, scoring_matrix)
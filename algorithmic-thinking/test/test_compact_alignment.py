@@ -0,0 +1,55 @@
+"""
+Tests for the direction byte alignment against the course tracebacks
+"""
+import random
+import pytest
+import sequence_alignment
+
+GSA = 'dynamic-programming/genome-sequence-alignment.py'
+
+def course_alignment(gsa, seq_x, seq_y, scoring_matrix, global_flag):
+    dp_table = gsa['compute_alignment_matrix'](seq_x, seq_y, scoring_matrix, global_flag)
+    if global_flag:
+        return gsa['compute_global_alignment'](seq_x, seq_y, scoring_matrix, dp_table)
+    return gsa['compute_local_alignment'](seq_x, seq_y, scoring_matrix, dp_table)
+
+
+@pytest.mark.parametrize('global_flag', [True, False])
+@pytest.mark.parametrize('seed', range(6))
+def test_matches_the_course_tracebacks(load_script, seed, global_flag):
+    gsa = load_script(GSA)
+    rand = random.Random(seed)
+    # few letters and small scores give many ties, which test the move order
+    alphabet = 'ACGT'[:rand.randint(2, 4)]
+    scoring_matrix = gsa['build_scoring_matrix'](set(alphabet), rand.randint(1, 4), rand.randint(-2, 1),
+                                                 rand.randint(-3, 0))
+    for _ in range(6):
+        seq_x = ''.join([rand.choice(alphabet) for _ in range(rand.randint(0, 18))])
+        seq_y = ''.join([rand.choice(alphabet) for _ in range(rand.randint(0, 18))])
+        assert sequence_alignment.compute_compact_alignment(seq_x, seq_y, scoring_matrix, global_flag) == \
+            course_alignment(gsa, seq_x, seq_y, scoring_matrix, global_flag)
+
+def test_directions_follow_the_move_order(load_script):
+    scoring_matrix = load_script(GSA)['build_scoring_matrix'](set('AC'), 2, -1, -1)
+    (directions, score, row, col) = sequence_alignment.compute_alignment_directions('A', 'CA', scoring_matrix,
+                                                                                    True)
+    # cell (1, 1) scores -1 through the diagonal against -2 up or left
+    assert directions.tolist() == [[sequence_alignment.DIR_DIAG, sequence_alignment.DIR_DIAG]]
+    assert (score, row, col) == (1, 1, 2)
+    assert sequence_alignment.traceback_directions('A', 'CA', directions, row, col, True) == ('-A', 'CA')
+
+def test_local_alignment_stops_at_zero_cells(load_script):
+    scoring_matrix = load_script(GSA)['build_scoring_matrix'](set('ACGT'), 5, -4, -4)
+    (directions, score, row, col) = sequence_alignment.compute_alignment_directions('TTGACC', 'AAGACA',
+                                                                                    scoring_matrix, False)
+    assert (directions == sequence_alignment.DIR_STOP).any()
+    assert sequence_alignment.compute_compact_alignment('TTGACC', 'AAGACA', scoring_matrix, False) == \
+        (score, 'GAC', 'GAC')
+
+@pytest.mark.parametrize('seq_x, seq_y', [('', ''), ('ACG', ''), ('', 'CA')])
+@pytest.mark.parametrize('global_flag', [True, False])
+def test_empty_sequences(load_script, seq_x, seq_y, global_flag):
+    gsa = load_script(GSA)
+    scoring_matrix = gsa['build_scoring_matrix'](set('ACGT'), 3, -1, -2)
+    assert sequence_alignment.compute_compact_alignment(seq_x, seq_y, scoring_matrix, global_flag) == \
+        course_alignment(gsa, seq_x, seq_y, scoring_matrix, global_flag)
@@ -0,0 +1,86 @@
+"""
+Tests for CSRGraph against the dict of sets functions of Module 2
+"""
+import random
+import numpy as np
+import pytest
+import csr_graph
+
+def random_ugraph(seed, num_nodes, probability):
+    rand = random.Random(seed)
+    ugraph = dict((node, set()) for node in range(num_nodes))
+    for node_a in range(num_nodes):
+        for node_b in range(node_a):
+            if rand.random() < probability:
+                ugraph[node_a].add(node_b)
+                ugraph[node_b].add(node_a)
+    return ugraph
+
+@pytest.fixture(scope='module')
+def network(load_script):
+    return load_script('network-analysis.py')
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_queries_match_the_dict_functions(network, seed):
+    ugraph = random_ugraph(seed, 1 + 7 * seed, 0.1)
+    graph = csr_graph.CSRGraph.from_dict(ugraph)
+    assert graph.to_dict() == ugraph
+    assert graph.num_edges() == sum([len(ugraph[node]) for node in ugraph]) // 2
+    assert graph.in_degree_distribution() == network['in_degree_distribution'](ugraph)
+    assert graph.largest_cc_size() == network['largest_cc_size'](ugraph)
+    for node in ugraph:
+        assert graph.bfs_visited(node) == network['bfs_visited'](ugraph, node)
+    assert graph.targeted_order() == network['targeted_order'](ugraph)
+
+@pytest.mark.parametrize('seed', range(4))
+def test_deleting_nodes_matches_delete_node(network, seed):
+    rand = random.Random(seed)
+    ugraph = random_ugraph(seed, 30, 0.12)
+    graph = csr_graph.CSRGraph.from_dict(ugraph)
+    snapshot = graph.copy()
+    for node in rand.sample(range(30), 12):
+        network['delete_node'](ugraph, node)
+        graph.delete_node(node)
+        assert graph.to_dict() == ugraph
+        assert graph.largest_cc_size() == network['largest_cc_size'](ugraph)
+        assert graph.degrees()[node] == 0
+        assert node not in graph
+    assert len(graph) == 18
+    assert graph.targeted_order() == network['targeted_order'](ugraph)
+    labels = graph.component_labels()
+    for component in network['cc_visited'](ugraph):
+        assert set(labels[sorted(component)].tolist()) == set([min(component)])
+    # the copy taken before the deletions is untouched
+    assert len(snapshot) == 30
+
+def test_deleting_twice_raises(network):
+    graph = csr_graph.CSRGraph.from_dict({0: {1}, 1: {0}})
+    graph.delete_node(0)
+    with pytest.raises(KeyError):
+        graph.delete_node(0)
+    assert graph.neighbors(1).tolist() == []
+
+def test_builders_agree():
+    ugraph = random_ugraph(9, 20, 0.2)
+    edges = [(node_a, node_b) for node_a in ugraph for node_b in ugraph[node_a] if node_b < node_a]
+    random.Random(1).shuffle(edges)
+    from_edges = csr_graph.CSRGraph.from_edges(20, [edge[0] for edge in edges], [edge[1] for edge in edges])
+    assert from_edges.to_dict() == ugraph
+    with pytest.raises(ValueError):
+        csr_graph.CSRGraph.from_dict({0: {2}, 2: {0}})
+
+def test_load_matches_load_graph(tmp_path, network):
+    ugraph = random_ugraph(3, 15, 0.25)
+    file_name = str(tmp_path / 'graph.txt')
+    with open(file_name, 'w') as graph_file:
+        for node in ugraph:
+            graph_file.write(' '.join([str(item) for item in [node] + sorted(ugraph[node])]) + ' \n')
+    assert csr_graph.CSRGraph.load(file_name).to_dict() == network['load_graph'](file_name)
+
+def test_empty_graph():
+    graph = csr_graph.CSRGraph.from_dict({})
+    assert (len(graph), graph.num_edges(), graph.largest_cc_size()) == (0, 0, 0)
+    assert graph.targeted_order() == []
+    assert graph.in_degree_distribution() == {}
+    assert np.array_equal(graph.component_labels(), np.empty(0, dtype=np.int64))
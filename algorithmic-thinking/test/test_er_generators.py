@@ -0,0 +1,62 @@
+"""
+Tests for the geometric-skip Erdos-Renyi generators
+"""
+import random
+import numpy as np
+import pytest
+import graph_generators
+
+def pair_count(num_nodes):
+    return num_nodes * (num_nodes - 1) // 2
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_edges_are_distinct_ordered_pairs(seed):
+    rand = random.Random(seed)
+    (num_nodes, probability) = (rand.randint(2, 60), rand.choice([0.01, 0.2, 0.7]))
+    edges = list(graph_generators.iter_er_edges(num_nodes, probability, random.Random(seed)))
+    assert edges == sorted(edges)
+    assert all([0 <= node_w < node_v < num_nodes for (node_v, node_w) in edges])
+    (edges_v, edges_w) = graph_generators.er_edges(num_nodes, probability, seed)
+    pairs = list(zip(edges_v.tolist(), edges_w.tolist()))
+    assert pairs == sorted(set(pairs))
+    assert all([0 <= node_w < node_v < num_nodes for (node_v, node_w) in pairs])
+
+def test_every_pair_is_numbered_once():
+    # with p = 1 every pair index comes back, through the square root inversion
+    (edges_v, edges_w) = graph_generators.er_edges(3, 1.0, 0)
+    assert list(zip(edges_v.tolist(), edges_w.tolist())) == [(1, 0), (2, 0), (2, 1)]
+    (edges_v, edges_w) = graph_generators.er_edges(2000, 1.0, 0)
+    assert len(edges_v) == pair_count(2000)
+    assert np.all(edges_w < edges_v)
+
+@pytest.mark.parametrize('num_nodes', [0, 1, 2, 9])
+def test_probability_zero_and_one(load_script, num_nodes):
+    network = load_script('network-analysis.py')
+    for generate in (lambda prob: graph_generators.random_undirected_graph(num_nodes, prob, random.Random(1)),
+                     lambda prob: graph_generators.make_er_csr(num_nodes, prob, 1).to_dict()):
+        assert generate(0.0) == network['random_undirected_graph'](num_nodes, 0.0)
+        assert generate(1.0) == network['random_undirected_graph'](num_nodes, 1.0)
+
+def test_seeds_reproduce_the_graph():
+    assert graph_generators.random_undirected_graph(50, 0.1, random.Random(4)) == \
+        graph_generators.random_undirected_graph(50, 0.1, random.Random(4))
+    first = graph_generators.er_edges(50, 0.1, 4)
+    second = graph_generators.er_edges(50, 0.1, 4)
+    assert np.array_equal(first[0], second[0]) and np.array_equal(first[1], second[1])
+
+def test_edge_density_matches_the_coin_flip_generator(load_script):
+    network = load_script('network-analysis.py')
+    (num_nodes, probability) = (40, 0.15)
+    random.seed(7)
+    coin_flips = [sum([len(neighbors) for neighbors in
+                       network['random_undirected_graph'](num_nodes, probability).values()]) // 2
+                  for _ in range(200)]
+    skips = [sum([len(neighbors) for neighbors in
+                  graph_generators.random_undirected_graph(num_nodes, probability, random.Random(seed)).values()]) // 2
+             for seed in range(200)]
+    arrays = [len(graph_generators.er_edges(num_nodes, probability, seed)[0]) for seed in range(200)]
+    expected = probability * pair_count(num_nodes)
+    # 200 graphs: the means have a standard error of about 0.6 edges
+    for sizes in (coin_flips, skips, arrays):
+        assert np.mean(sizes) == pytest.approx(expected, abs=3.0)
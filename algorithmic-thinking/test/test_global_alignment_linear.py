@@ -0,0 +1,62 @@
+"""
+Tests for the linear-memory global alignment against the full matrix traceback
+"""
+import random
+import pytest
+import sequence_alignment
+
+GSA = 'dynamic-programming/genome-sequence-alignment.py'
+
+def random_scoring_matrix(rand, alphabet):
+    chars = list(alphabet) + ['-']
+    matrix = dict((row_char, {}) for row_char in chars)
+    for row_char in chars:
+        for col_char in chars:
+            if '-' in (row_char, col_char):
+                matrix[row_char][col_char] = rand.randint(-6, -1)
+            else:
+                matrix[row_char][col_char] = rand.randint(-4, 8)
+    return matrix
+
+def random_sequence(rand, alphabet, max_len):
+    return ''.join([rand.choice(alphabet) for _ in range(rand.randint(0, max_len))])
+
+
+@pytest.mark.parametrize('block_cells', [4, 64, sequence_alignment.BLOCK_CELLS])
+@pytest.mark.parametrize('seed', range(6))
+def test_matches_compute_global_alignment(load_script, monkeypatch, seed, block_cells):
+    gsa = load_script(GSA)
+    # small blocks force the divide and conquer split on short sequences
+    monkeypatch.setattr(sequence_alignment, 'BLOCK_CELLS', block_cells)
+    rand = random.Random(seed)
+    alphabet = 'ACGT' if seed % 2 else 'AC'
+    scoring_matrix = random_scoring_matrix(rand, alphabet)
+    for _ in range(5):
+        seq_x = random_sequence(rand, alphabet, 30)
+        seq_y = random_sequence(rand, alphabet, 30)
+        dp_table = gsa['compute_alignment_matrix'](seq_x, seq_y, scoring_matrix, True)
+        expected = gsa['compute_global_alignment'](seq_x, seq_y, scoring_matrix, dp_table)
+        assert sequence_alignment.compute_global_alignment_linear(seq_x, seq_y, scoring_matrix) == expected
+
+@pytest.mark.parametrize('seq_x, seq_y', [('', ''), ('ACG', ''), ('', 'TTA'), ('A', 'A')])
+def test_empty_and_single_character_sequences(load_script, seq_x, seq_y):
+    gsa = load_script(GSA)
+    scoring_matrix = gsa['build_scoring_matrix'](set('ACGT'), 10, 4, -6)
+    dp_table = gsa['compute_alignment_matrix'](seq_x, seq_y, scoring_matrix, True)
+    assert sequence_alignment.compute_global_alignment_linear(seq_x, seq_y, scoring_matrix) == \
+        gsa['compute_global_alignment'](seq_x, seq_y, scoring_matrix, dp_table)
+
+@pytest.mark.parametrize('seed', range(4))
+def test_ties_split_like_the_full_traceback(load_script, monkeypatch, seed):
+    gsa = load_script(GSA)
+    monkeypatch.setattr(sequence_alignment, 'BLOCK_CELLS', 1)
+    rand = random.Random(100 + seed)
+    # scores from a tiny range make most cells a tie between moves
+    scoring_matrix = dict((row_char, dict((col_char, rand.randint(-1, 1) if '-' not in (row_char, col_char) else
+                                           rand.randint(-1, 0)) for col_char in 'AC-')) for row_char in 'AC-')
+    for _ in range(20):
+        seq_x = random_sequence(rand, 'AC', 25)
+        seq_y = random_sequence(rand, 'AC', 25)
+        dp_table = gsa['compute_alignment_matrix'](seq_x, seq_y, scoring_matrix, True)
+        assert sequence_alignment.compute_global_alignment_linear(seq_x, seq_y, scoring_matrix) == \
+            gsa['compute_global_alignment'](seq_x, seq_y, scoring_matrix, dp_table)
@@ -0,0 +1,61 @@
+"""
+Tests for the linear-time components against the bfs-visited.py originals
+"""
+import random
+import pytest
+import graph_components
+
+def random_graph(seed, num_nodes, num_edges):
+    """
+    Undirected graph with shuffled node keys, some isolated nodes and
+    repeated edges
+    """
+    rand = random.Random(seed)
+    nodes = list(range(num_nodes))
+    rand.shuffle(nodes)
+    ugraph = dict((node, set()) for node in nodes)
+    edges = []
+    for _ in range(num_edges):
+        (node_a, node_b) = (rand.randrange(num_nodes), rand.randrange(num_nodes))
+        if node_a != node_b:
+            ugraph[node_a].add(node_b)
+            ugraph[node_b].add(node_a)
+            edges.append((node_a, node_b))
+    return (ugraph, edges)
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_components_match_cc_visited(load_script, seed):
+    bfs = load_script('bfs-visited.py')
+    (ugraph, _) = random_graph(seed, 5 + 6 * seed, 4 * seed)
+    assert list(graph_components.iter_components(ugraph)) == bfs['cc_visited'](ugraph)
+    assert graph_components.largest_component_size(ugraph) == bfs['largest_cc_size'](ugraph)
+
+@pytest.mark.parametrize('seed', range(5))
+def test_edge_stream_gives_the_same_components(load_script, seed):
+    (ugraph, edges) = random_graph(100 + seed, 40, 30)
+    # duplicate edges and edges in both directions
+    edges = edges + [(node_b, node_a) for (node_a, node_b) in edges[::3]]
+    expected = load_script('bfs-visited.py')['cc_visited'](ugraph)
+    assert list(graph_components.iter_edge_components(list(ugraph), iter(edges))) == expected
+
+def test_union_find_tracks_sizes():
+    components = graph_components.UnionFind(range(6))
+    assert (len(components), components.largest()) == (6, 1)
+    assert components.union(0, 1) == 2
+    assert components.union(2, 3) == 2
+    assert components.union(1, 3) == 4
+    assert components.union(0, 2) == 4
+    assert components.find(3) == components.find(0)
+    assert (components.set_size(2), components.set_size(5), components.largest()) == (4, 1, 4)
+    components.add(5)
+    components.add('x')
+    assert 'x' in components and 7 not in components
+    assert list(components) == [0, 1, 2, 3, 4, 5, 'x']
+
+def test_empty_and_single_node_graphs():
+    assert list(graph_components.iter_components({})) == []
+    assert graph_components.largest_component_size({}) == 0
+    assert list(graph_components.iter_components({7: set()})) == [{7}]
+    assert list(graph_components.iter_edge_components([], [])) == []
+    assert graph_components.UnionFind().largest() == 0
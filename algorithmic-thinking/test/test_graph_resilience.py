@@ -0,0 +1,52 @@
+"""
+Tests for the union-find resilience against compute_resilience
+"""
+import copy
+import random
+import pytest
+import graph_components
+
+def coin_flip_graph(rand, num_nodes, probability):
+    ugraph = dict((node, set()) for node in range(num_nodes))
+    for node_a in range(num_nodes):
+        for node_b in range(node_a + 1, num_nodes):
+            if rand.random() < probability:
+                ugraph[node_a].add(node_b)
+                ugraph[node_b].add(node_a)
+    return ugraph
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_matches_both_course_versions(load_script, seed):
+    network = load_script('network-analysis.py')
+    bfs = load_script('bfs-visited.py')
+    rand = random.Random(seed)
+    ugraph = coin_flip_graph(rand, rand.randint(1, 40), rand.choice([0.02, 0.08, 0.3]))
+    attack_order = rand.sample(sorted(ugraph), rand.randint(0, len(ugraph)))
+    before = copy.deepcopy(ugraph)
+    result = graph_components.fast_compute_resilience(ugraph, attack_order)
+    assert ugraph == before
+    assert result == network['compute_resilience'](ugraph, attack_order)
+    # the bfs-visited.py version edits the neighbour sets it is given
+    assert result == bfs['compute_resilience'](copy.deepcopy(ugraph), attack_order)
+
+def test_targeted_order_attack(load_script):
+    network = load_script('network-analysis.py')
+    ugraph = coin_flip_graph(random.Random(4), 30, 0.15)
+    attack_order = network['targeted_order'](copy.deepcopy(ugraph))
+    assert graph_components.fast_compute_resilience(ugraph, attack_order) == \
+        network['compute_resilience'](ugraph, attack_order)
+
+@pytest.mark.parametrize('attack_order', [[1, 1], [4], [0, 2, 0]])
+def test_bad_attack_orders_raise_like_compute_resilience(load_script, attack_order):
+    ugraph = {0: {1}, 1: {0, 2}, 2: {1}, 3: set()}
+    with pytest.raises(KeyError):
+        load_script('network-analysis.py')['compute_resilience'](ugraph, attack_order)
+    with pytest.raises(KeyError):
+        graph_components.fast_compute_resilience(ugraph, attack_order)
+
+def test_empty_graph_and_attack():
+    assert graph_components.fast_compute_resilience({}, []) == [0]
+    ugraph = {0: {1}, 1: {0}, 2: set()}
+    assert graph_components.fast_compute_resilience(ugraph, []) == [2]
+    assert graph_components.fast_compute_resilience(ugraph, [1, 0, 2]) == [2, 1, 1, 0]
@@ -0,0 +1,49 @@
+"""
+Tests for the process-pool null distribution
+"""
+import numpy as np
+import pytest
+import sequence_alignment
+
+GSA = 'dynamic-programming/genome-sequence-alignment.py'
+SEQ_X = 'MKTAYIAKQRQISFVKSH'
+SEQ_Y = 'MKAYIAQRQLSFAKH'
+
+@pytest.fixture
+def pam_like(load_script):
+    return load_script(GSA)['build_scoring_matrix'](set(SEQ_X + SEQ_Y), 5, -2, -4)
+
+
+def test_blocks_replay_with_the_course_matrix(load_script, monkeypatch, pam_like):
+    gsa = load_script(GSA)
+    monkeypatch.setattr(sequence_alignment, 'NULL_BLOCK_TRIALS', 7)
+    result = sequence_alignment.parallel_null_distribution(SEQ_X, SEQ_Y, pam_like, 30, seed=3, max_workers=1)
+    # the same shuffles: one numpy stream per block of 7, 7, 7, 7 and 2 trials
+    (char_index, _) = sequence_alignment.dense_scoring_matrix(pam_like)
+    chars = dict((code, char) for (char, code) in char_index.items())
+    codes_y = sequence_alignment.encode_sequence(SEQ_Y, char_index)
+    expected = {}
+    for (num_trials, seed_seq) in zip([7, 7, 7, 7, 2], np.random.SeedSequence(3).spawn(5)):
+        rng = np.random.default_rng(seed_seq)
+        for _ in range(num_trials):
+            shuffled = ''.join([chars[code] for code in rng.permutation(codes_y).tolist()])
+            dp_table = gsa['compute_alignment_matrix'](SEQ_X, shuffled, pam_like, False)
+            score = max([max(row) for row in dp_table])
+            expected[score] = expected.get(score, 0) + 1
+    assert result == expected
+
+def test_pool_size_does_not_change_the_result(pam_like):
+    in_process = sequence_alignment.parallel_null_distribution(SEQ_X, SEQ_Y, pam_like, 120, seed=9,
+                                                               max_workers=1)
+    pooled = sequence_alignment.parallel_null_distribution(SEQ_X, SEQ_Y, pam_like, 120, seed=9, max_workers=2)
+    assert pooled == in_process
+    assert sum(pooled.values()) == 120
+
+def test_seeds_give_different_shuffles(pam_like):
+    first = sequence_alignment.parallel_null_distribution(SEQ_X, SEQ_Y, pam_like, 60, seed=1, max_workers=1)
+    second = sequence_alignment.parallel_null_distribution(SEQ_X, SEQ_Y, pam_like, 60, seed=2, max_workers=1)
+    assert first != second
+
+def test_no_trials_and_empty_sequences(pam_like):
+    assert sequence_alignment.parallel_null_distribution(SEQ_X, SEQ_Y, pam_like, 0, max_workers=1) == {}
+    assert sequence_alignment.parallel_null_distribution('', SEQ_Y, pam_like, 5, max_workers=1) == {0: 5}
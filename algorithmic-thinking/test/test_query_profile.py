@@ -0,0 +1,55 @@
+"""
+Tests for scoring one query against many sequences
+"""
+import random
+import pytest
+import sequence_alignment
+
+GSA = 'dynamic-programming/genome-sequence-alignment.py'
+AMINO = 'ACDEFGHIKLMNPQRSTVWY'
+
+@pytest.fixture(scope='module')
+def protein_matrix(load_script):
+    return load_script(GSA)['build_scoring_matrix'](set(AMINO), 7, -1, -3)
+
+def database(seed, num_records, max_len = 40):
+    rand = random.Random(seed)
+    return [('seq' + str(idx), ''.join([rand.choice(AMINO) for _ in range(rand.randint(0, max_len))]))
+            for idx in range(num_records)]
+
+
+@pytest.mark.parametrize('global_flag', [True, False])
+def test_profile_scores_match_compute_alignment_score(protein_matrix, global_flag):
+    profile = sequence_alignment.QueryProfile('HSGVNQLGGVFVNGRPLPD', protein_matrix)
+    for (_, sequence) in database(4, 15):
+        assert profile.alignment_score(sequence, global_flag) == \
+            sequence_alignment.compute_alignment_score(sequence, 'HSGVNQLGGVFVNGRPLPD', protein_matrix, global_flag)
+
+@pytest.mark.parametrize('seed', range(3))
+def test_top_scores_match_sorting_every_score(protein_matrix, seed):
+    records = database(seed, 60)
+    query = records[0][1] or 'GVNQ'
+    ranked = sorted([(sequence_alignment.compute_alignment_score(sequence, query, protein_matrix, False), -idx,
+                      record_id) for (idx, (record_id, sequence)) in enumerate(records)], reverse=True)
+    expected = [(score, record_id) for (score, _, record_id) in ranked[:7]]
+    assert sequence_alignment.top_local_alignment_scores(query, protein_matrix, iter(records), top_n=7,
+                                                         batch_size=5) == expected
+
+def test_ties_keep_database_order(protein_matrix):
+    records = [('first', 'AAAA'), ('second', 'CCCC'), ('third', 'AAAA'), ('fourth', 'AAAA')]
+    result = sequence_alignment.top_local_alignment_scores('AAAA', protein_matrix, records, top_n=2, batch_size=1)
+    assert [record_id for (_, record_id) in result] == ['first', 'third']
+
+def test_pool_matches_in_process(protein_matrix):
+    records = database(9, 80)
+    in_process = sequence_alignment.top_local_alignment_scores('KLMNPQ', protein_matrix, records, top_n=5)
+    pooled = sequence_alignment.top_local_alignment_scores('KLMNPQ', protein_matrix, records, top_n=5,
+                                                           max_workers=2, batch_size=8)
+    assert pooled == in_process
+
+def test_empty_query_and_database(protein_matrix):
+    assert sequence_alignment.top_local_alignment_scores('ACD', protein_matrix, [], top_n=3) == []
+    profile = sequence_alignment.QueryProfile('', protein_matrix)
+    assert len(profile) == 0
+    assert profile.alignment_score('ACD') == 0
+    assert profile.alignment_score('ACD', True) == -9
@@ -0,0 +1,94 @@
+"""
+Tests for the streaming and memory-mapped sequence readers
+"""
+import random
+import numpy as np
+import pytest
+import sequence_alignment
+import sequence_io
+
+GSA = 'dynamic-programming/genome-sequence-alignment.py'
+
+FILES = {
+    'fasta': '>seq1 human\nACGT\nTTGA\n>seq2\nGGCA\n',
+    'plain': 'ACGTAC\n\nTTGGA\n',
+    'plain_no_newline': 'ACGTAC',
+    'leading_plain_lines': 'AC\n>h\nGG\n',
+    'empty_headers': '>\nAC\n>\nGG\n>x\nTT\n>\n',
+    'blank_lines_first': '\n\n>a\nAC\n\n>b\n',
+    'indented_header': 'CC\n  >a desc\nAC\nGT\n',
+    'crlf': '>a\r\nAC\r\nGT\r\n>\r\nTT\r\n',
+    'empty': '',
+    'only_space': ' \n\n',
+    'inner_spaces': 'AC G\n>a\nAC GT\n T\tT \n',
+}
+
+def write_file(tmp_path, name, text):
+    file_name = str(tmp_path / (name + '.txt'))
+    with open(file_name, 'wb') as data_file:
+        data_file.write(text.encode('ascii'))
+    return file_name
+
+def random_fasta(rand):
+    lines = []
+    for idx in range(rand.randint(0, 6)):
+        kind = rand.randrange(4)
+        if kind == 0:
+            lines.append('>' + ('id' + str(idx) + ' note' if rand.random() < 0.7 else ''))
+        elif kind == 1:
+            lines.append('')
+        else:
+            lines.append(''.join([rand.choice('ACGT') for _ in range(rand.randint(1, 12))]))
+    return '\n'.join(lines) + ('\n' if rand.random() < 0.5 else '')
+
+
+@pytest.mark.parametrize('name', sorted(FILES))
+def test_index_and_iterator_agree(tmp_path, name):
+    file_name = write_file(tmp_path, name, FILES[name])
+    with sequence_io.FastaIndex(file_name) as index:
+        assert list(index) == list(sequence_io.iter_fasta_records(file_name))
+
+def test_ids_follow_the_iterator_rules(tmp_path):
+    file_name = write_file(tmp_path, 'mixed', FILES['leading_plain_lines'])
+    assert list(sequence_io.iter_fasta_records(file_name)) == [('0', 'AC'), ('h', 'GG')]
+    file_name = write_file(tmp_path, 'empty_headers', FILES['empty_headers'])
+    with sequence_io.FastaIndex(file_name) as index:
+        assert index.ids() == ['0', '2', 'x', '6']
+        assert index.sequence('x') == 'TT'
+
+@pytest.mark.parametrize('seed', range(20))
+def test_readers_agree_on_random_files(tmp_path, seed):
+    file_name = write_file(tmp_path, 'random', random_fasta(random.Random(seed)))
+    with sequence_io.FastaIndex(file_name) as index:
+        assert list(index) == list(sequence_io.iter_fasta_records(file_name))
+
+def test_plain_file_first_record_is_load_genome_file(tmp_path, load_script):
+    file_name = write_file(tmp_path, 'genome', 'MQNSHSGVNQLGG\n')
+    assert [record[1] for record in sequence_io.iter_fasta_records(file_name)] == \
+        [load_script(GSA)['load_genome_file'](file_name)]
+
+def test_encoded_records_match_encode_sequence(tmp_path, load_script):
+    scoring_matrix = load_script(GSA)['build_scoring_matrix'](set('ACGT'), 5, -1, -2)
+    (char_index, _) = sequence_alignment.dense_scoring_matrix(scoring_matrix)
+    file_name = write_file(tmp_path, 'fasta', FILES['fasta'])
+    records = list(sequence_io.iter_fasta_records(file_name, char_index))
+    assert [record[1].tolist() for record in records] == \
+        [sequence_alignment.encode_sequence(text, char_index).tolist() for text in ('ACGTTTGA', 'GGCA')]
+    with sequence_io.FastaIndex(file_name) as index:
+        assert np.array_equal(index.encoded('seq2', char_index), records[1][1])
+
+def test_characters_outside_the_alphabet(tmp_path):
+    file_name = write_file(tmp_path, 'bad', '>a\nACXG\n')
+    with pytest.raises(ValueError):
+        list(sequence_io.iter_fasta_records(file_name, {'A': 0, 'C': 1, 'G': 2}))
+
+def test_spaces_inside_lines_are_dropped(tmp_path):
+    file_name = write_file(tmp_path, 'inner_spaces', FILES['inner_spaces'])
+    assert list(sequence_io.iter_fasta_records(file_name)) == [('0', 'ACG'), ('a', 'ACGTTT')]
+    with sequence_io.FastaIndex(file_name) as index:
+        assert index.sequence('a') == 'ACGTTT'
+
+def test_numpy_integer_positions(tmp_path):
+    file_name = write_file(tmp_path, 'fasta', FILES['fasta'])
+    with sequence_io.FastaIndex(file_name) as index:
+        assert index.sequence(np.int64(1)) == index.sequence(1) == 'GGCA'
@@ -0,0 +1,91 @@
+"""
+Tests for the UPATrial based UPA generators
+"""
+import collections
+import random
+import numpy as np
+import pytest
+import graph_generators
+
+NETWORK_ANALYSIS = 'network-analysis.py'
+
+def top_decile_degree(ugraph):
+    """
+    Mean degree of the tenth of the nodes with the highest degrees
+    """
+    degrees = sorted([len(neighbors) for neighbors in ugraph.values()], reverse=True)
+    return np.mean(degrees[:len(degrees) // 10])
+
+def assert_upa_graph(ugraph, num_nodes, start_nodes):
+    """
+    Symmetric, loop free, complete on the start nodes, and every later node
+    joined to between 1 and start_nodes earlier nodes
+    """
+    assert sorted(ugraph) == list(range(num_nodes))
+    for node in ugraph:
+        assert node not in ugraph[node]
+        for neighbor in ugraph[node]:
+            assert node in ugraph[neighbor]
+    for node in range(start_nodes):
+        assert set(range(start_nodes)) - ugraph[node] == set([node])
+    for node in range(start_nodes, num_nodes):
+        earlier = [neighbor for neighbor in ugraph[node] if neighbor < node]
+        assert 1 <= len(earlier) <= start_nodes
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_dict_graphs_are_upa_graphs(seed):
+    rand = random.Random(seed)
+    (num_nodes, start_nodes) = (rand.randint(5, 80), rand.randint(1, 5))
+    ugraph = graph_generators.make_upa_graph(num_nodes, start_nodes, random.Random(seed))
+    assert_upa_graph(ugraph, num_nodes, start_nodes)
+    assert ugraph == graph_generators.make_upa_graph(num_nodes, start_nodes, random.Random(seed))
+
+@pytest.mark.parametrize('seed', range(5))
+def test_edge_arrays_are_upa_graphs(seed):
+    (edges_a, edges_b) = graph_generators.upa_edges(60, 4, seed)
+    assert edges_a.dtype == np.int32
+    assert len(set(zip(edges_a.tolist(), edges_b.tolist()))) == len(edges_a)
+    graph = graph_generators.make_upa_csr(60, 4, seed)
+    assert_upa_graph(graph.to_dict(), 60, 4)
+    again = graph_generators.upa_edges(60, 4, seed)
+    assert np.array_equal(again[0], edges_a) and np.array_equal(again[1], edges_b)
+
+def test_trial_list_follows_the_degrees():
+    trial = graph_generators.UPATrial(4, random.Random(2))
+    ugraph = graph_generators.make_complete_ugraph(4)
+    for node in range(4, 40):
+        ugraph[node] = trial.run_trial(4)
+        for neighbor in ugraph[node]:
+            ugraph[neighbor].add(node)
+    # every node is drawn with probability (degree + 1) / (2 * edges + nodes)
+    counts = collections.Counter(trial._node_numbers)
+    assert counts == collections.Counter(dict((node, len(ugraph[node]) + 1) for node in ugraph))
+
+def test_both_generators_give_the_same_mean_size():
+    dict_sizes = [sum([len(neighbors) for neighbors in
+                       graph_generators.make_upa_graph(40, 5, random.Random(seed)).values()]) // 2
+                  for seed in range(150)]
+    array_sizes = [len(graph_generators.upa_edges(40, 5, seed)[0]) for seed in range(150)]
+    assert np.mean(array_sizes) == pytest.approx(np.mean(dict_sizes), rel=0.03)
+
+def test_hubs_match_the_course_upa_graph(load_script):
+    # preferential attachment grows hubs; uniform attachment gives a top
+    # decile about a quarter smaller, far outside the tolerance
+    course_upa = load_script(NETWORK_ANALYSIS)['make_upa_graph']
+    expected = []
+    for seed in range(40):
+        random.seed(seed)
+        expected.append(top_decile_degree(course_upa(300, 3)))
+    dict_hubs = [top_decile_degree(graph_generators.make_upa_graph(300, 3, random.Random(seed)))
+                 for seed in range(40)]
+    array_hubs = [top_decile_degree(graph_generators.make_upa_csr(300, 3, seed).to_dict()) for seed in range(40)]
+    assert np.mean(dict_hubs) == pytest.approx(np.mean(expected), rel=0.05)
+    assert np.mean(array_hubs) == pytest.approx(np.mean(expected), rel=0.05)
+
+def test_start_graph_only():
+    assert graph_generators.make_upa_graph(3, 3, random.Random(0)) == graph_generators.make_complete_ugraph(3)
+    assert graph_generators.make_complete_ugraph(1) == {0: set()}
+    (edges_a, _) = graph_generators.upa_edges(3, 3, 0)
+    assert len(edges_a) == 3
+    assert graph_generators.make_upa_csr(0, 0, 0).num_nodes() == 0